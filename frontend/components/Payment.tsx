@@ -26,6 +26,10 @@ const Payment: React.FC<PaymentProps> = ({ trip, selectedSeats, onBack, onSucces
   const [saveCardModal, setSaveCardModal] = useState(false);
   const [shouldSaveCard, setShouldSaveCard] = useState(false);
   const [cardValidationErrors, setCardValidationErrors] = useState<{[key: string]: string}>({});
+  const [trabajoPdf, setTrabajoPdf] = useState<string | null>(null);
+  const [estadoPdf, setEstadoPdf] = useState<api.EstadoTrabajoPdf | null>(null);
+  const [errorPdf, setErrorPdf] = useState(false);
+  const [boletosCreados, setBoletosCreados] = useState<number[]>([]);
 
   // Saved Card State
   const savedCards = user?.paymentMethods || [];
@@ -34,6 +38,36 @@ const Payment: React.FC<PaymentProps> = ({ trip, selectedSeats, onBack, onSucces
 
   const totalPrice = selectedSeats.length * trip.price;
 
+  // Consultar los PDFs que se generan en segundo plano después del pago
+  useEffect(() => {
+    if (!trabajoPdf) return;
+    let cancelado = false;
+    let intentos = 0;
+    const consultar = async () => {
+      const estado = await api.getEstadoTrabajoPdf(trabajoPdf);
+      if (cancelado) return;
+      intentos += 1;
+      // Sin acceso al trabajo (401/404) o sin terminar a tiempo: se ofrecen las descargas directas
+      if (!estado) {
+        setErrorPdf(true);
+        return;
+      }
+      setEstadoPdf(estado);
+      if (estado.estado === 'pendiente') {
+        if (intentos < 20) {
+          timer = setTimeout(consultar, 1500);
+        } else {
+          setErrorPdf(true);
+        }
+      }
+    };
+    let timer = setTimeout(consultar, 500);
+    return () => {
+      cancelado = true;
+      clearTimeout(timer);
+    };
+  }, [trabajoPdf]);
+
   useEffect(() => {
     // If user has saved cards, default to using the first one
     if (savedCards.length > 0) {
@@ -232,6 +266,15 @@ const Payment: React.FC<PaymentProps> = ({ trip, selectedSeats, onBack, onSucces
         return;
       }
 
+      setBoletosCreados(
+        (result.data?.boletos || [])
+          .map((b: any) => b?.id_boleto)
+          .filter((id: any) => id !== undefined && id !== null)
+      );
+      if (result.data?.trabajo_pdf) {
+        setTrabajoPdf(result.data.trabajo_pdf);
+      }
+
       let nuevoBalance = result.data?.saldo_restante;
 
       // Si el backend no devolvió saldo, consultar la persona para mantener consistencia
@@ -306,6 +349,41 @@ const Payment: React.FC<PaymentProps> = ({ trip, selectedSeats, onBack, onSucces
                <span className="font-semibold text-gray-300">Ticket ID:</span> {createdTicket.id}
              </div>
           </div>
+
+          {(trabajoPdf || boletosCreados.length > 0) && (
+            <div className="bg-[#2a2e2a] rounded-xl p-4 mb-6 text-left border border-gray-700">
+              <p className="text-xs text-gray-500 uppercase font-bold mb-2">Boletos en PDF</p>
+              {!trabajoPdf || errorPdf ? (
+                boletosCreados.map((idBoleto) => (
+                  <a
+                    key={idBoleto}
+                    href={api.getUrlPdfBoleto(idBoleto)}
+                    target="_blank"
+                    rel="noreferrer"
+                    className="block text-sm text-[#2ecc71] hover:underline"
+                  >
+                    Descargar boleto #{idBoleto}
+                  </a>
+                ))
+              ) : !estadoPdf || estadoPdf.estado === 'pendiente' ? (
+                <div className="flex items-center gap-2 text-sm text-gray-400">
+                  <Loader2 className="h-4 w-4 animate-spin" /> Generando boletos...
+                </div>
+              ) : (
+                Object.entries(estadoPdf.descargas).map(([idBoleto, url]) => (
+                  <a
+                    key={idBoleto}
+                    href={url}
+                    target="_blank"
+                    rel="noreferrer"
+                    className="block text-sm text-[#2ecc71] hover:underline"
+                  >
+                    Descargar boleto #{idBoleto}
+                  </a>
+                ))
+              )}
+            </div>
+          )}
           
           <button onClick={handleFinish} className="w-full bg-[#2ecc71] hover:bg-[#27ae60] text-white font-bold py-3 rounded-xl transition-colors shadow-lg shadow-green-500/20">
             Volver al Inicio
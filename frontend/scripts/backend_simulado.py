@@ -0,0 +1,602 @@
+"""Backend simulado para pruebas de carga del frontend.
+
+Sirve los contratos del backend Java que usa el frontend (/api/<entidad>/lista,
+/lista/<id>, guardar, actualizar, eliminar, ordenar, buscar, /api/auth/login y
+/api/boleto/comprar) a partir de backend/data/*.json, sin Java ni MongoDB.
+Los datos viven en memoria: las escrituras se pierden al detenerlo.
+
+--escala N crea N copias de cada colección. La copia i desplaza los ids de
+todas las entidades anidadas por igual, así que un boleto de la copia i apunta
+a la persona y al turno de la copia i; los correos, identificaciones y placas
+llevan el sufijo de la copia y los turnos salen i días después. Con los 38
+boletos de backend/data, --escala 26000 da alrededor de un millón de filas.
+Cada registro se guarda ya serializado para que un millón de filas quepa en
+memoria; las listas se arman una vez por escritura.
+
+Uso (desde frontend/):
+    python scripts/backend_simulado.py [--puerto 8099] [--escala 1]
+        [--colecciones turno,boleto] [--latencia 20] [--variacion 5]
+    API_URL=http://127.0.0.1:8099 gunicorn -w 4 "src.app:create_app()"
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+FRONTEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATOS = os.path.join(FRONTEND, "..", "backend", "data")
+
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "tu_contrasenia_secreta")
+
+PLURALES = {"bus": "buses"}
+
+# Clave con la que responde /buscar en cada API del backend (no siempre es el plural)
+CLAVES_BUSQUEDA = {"bus": "boletos", "cooperativa": "boletos", "boleto": "boletos", "escala": "escalas"}
+
+# Atributos que el frontend busca en cada petición; se indexan al cargar
+INDICES = {
+    "boleto": ("turno.id_turno", "persona.id_persona"),
+    "persona": ("correo", "cuenta.id_cuenta"),
+    "cuenta": ("correo",),
+}
+
+# Campos únicos que se marcan con el número de copia al escalar
+_UNICOS = ("correo", "correo_empresarial", "numero_identificacion", "placa", "ruc")
+
+
+def _json(valor):
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _token(correo, rol):
+    """JWT HS256 como el de Auth_api (sub, roles, iat, exp); el frontend solo lo guarda en la sesión"""
+    def b64(datos):
+        return base64.urlsafe_b64encode(datos).rstrip(b"=")
+
+    ahora = int(time.time())
+    partes = b64(_json({"alg": "HS256"})) + b"." + b64(
+        _json({"roles": [rol], "sub": correo, "iat": ahora, "exp": ahora + 3600})
+    )
+    firma = hmac.new(SECRET_KEY.encode(), partes, hashlib.sha256).digest()
+    return (partes + b"." + b64(firma)).decode()
+
+
+def _valor(registro, atributo):
+    """Valor de un atributo con puntos (p. ej. "turno.id_turno"); las claves no distinguen mayúsculas"""
+    for parte in atributo.split("."):
+        if not isinstance(registro, dict):
+            return None
+        if parte in registro:
+            registro = registro[parte]
+        else:
+            registro = next((v for k, v in registro.items() if k.lower() == parte.lower()), None)
+    return registro
+
+
+def _orden(valor):
+    # None al final; números antes que textos para que sort() no mezcle tipos
+    if valor is None:
+        return (2, "")
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return (0, valor)
+    return (1, str(valor).lower())
+
+
+def _clave_orden(clave):
+    # Claves de índice en minúsculas: números por valor, luego textos y "none" al final
+    if clave == "none":
+        return (2, 0, "")
+    try:
+        return (0, float(clave), "")
+    except ValueError:
+        return (1, 0, clave)
+
+
+class Coleccion:
+    """Registros de una entidad, guardados como JSON por id.
+
+    Los índices de búsqueda (valor en minúsculas → ids) se construyen la
+    primera vez que se busca por un atributo, o al cargar para los de
+    INDICES, y se mantienen con cada escritura. La lista y los ordenamientos
+    se arman al pedirse y se descartan al escribir.
+    """
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.plural = PLURALES.get(nombre, nombre + "s")
+        self.clave_id = f"id_{nombre}"
+        self.registros = {}
+        self._lock = threading.Lock()
+        self._lista = None
+        self._indices = {atributo: {} for atributo in INDICES.get(nombre, ())}
+        self._ordenados = {}
+
+    def _indexar(self, id_registro, valores, agregar=True):
+        for atributo, indice in self._indices.items():
+            clave = str(valores(atributo)).lower()
+            if agregar:
+                indice.setdefault(clave, []).append(id_registro)
+            elif id_registro in indice.get(clave, ()):
+                indice[clave].remove(id_registro)
+
+    def _poner(self, id_registro, contenido, valores):
+        anterior = self.registros.get(id_registro)
+        if anterior is not None and self._indices:
+            anterior = json.loads(anterior)
+            self._indexar(id_registro, lambda atributo: _valor(anterior, atributo), agregar=False)
+        self.registros[id_registro] = contenido
+        self._indexar(id_registro, valores)
+
+    def cargar(self, registros):
+        for registro in registros:
+            self._poner(registro[self.clave_id], _json(registro), lambda atributo: _valor(registro, atributo))
+
+    def cargar_copia(self, plantillas, i):
+        for plantilla in plantillas:
+            self._poner(plantilla.valor(self.clave_id, i), plantilla.copia(i),
+                        lambda atributo: plantilla.valor(atributo, i))
+
+    def lista(self):
+        lista = self._lista
+        if lista is None:
+            with self._lock:
+                lista = self._lista = b",".join(self.registros.values())
+        return lista
+
+    def obtener(self, id_registro):
+        contenido = self.registros.get(id_registro)
+        return json.loads(contenido) if contenido is not None else None
+
+    def guardar(self, registro):
+        with self._lock:
+            registro[self.clave_id] = max(self.registros, default=0) + 1
+            self._poner(registro[self.clave_id], _json(registro), lambda atributo: _valor(registro, atributo))
+            self._lista = None
+            self._ordenados = {}
+        return registro
+
+    def reemplazar(self, registro):
+        with self._lock:
+            self._poner(registro[self.clave_id], _json(registro), lambda atributo: _valor(registro, atributo))
+            self._lista = None
+            self._ordenados = {}
+
+    def eliminar(self, id_registro):
+        with self._lock:
+            contenido = self.registros.pop(id_registro, None)
+            if contenido is not None:
+                registro = json.loads(contenido)
+                self._indexar(id_registro, lambda atributo: _valor(registro, atributo), agregar=False)
+            self._lista = None
+            self._ordenados = {}
+        return contenido is not None
+
+    def _indice(self, atributo):
+        with self._lock:
+            indice = self._indices.get(atributo)
+            if indice is None:
+                indice = self._indices[atributo] = {}
+                for id_registro, contenido in self.registros.items():
+                    valor = _valor(json.loads(contenido), atributo)
+                    indice.setdefault(str(valor).lower(), []).append(id_registro)
+            return indice
+
+    def buscar(self, atributo, criterio):
+        """Como binarySearch del backend: contiene, sin mayúsculas, ordenado por el atributo"""
+        criterio = criterio.lower()
+        indice = self._indice(atributo)
+        with self._lock:
+            claves = sorted((clave for clave in indice if criterio in clave), key=_clave_orden)
+            return [self.registros[i] for clave in claves for i in indice[clave]]
+
+    def ordenar(self, atributo, ascendente):
+        clave = (atributo, ascendente)
+        with self._lock:
+            ordenados = self._ordenados.get(clave)
+            if ordenados is None:
+                registros = sorted(self.registros.values(),
+                                   key=lambda contenido: _orden(_valor(json.loads(contenido), atributo)),
+                                   reverse=not ascendente)
+                ordenados = self._ordenados[clave] = b",".join(registros)
+            return ordenados
+
+
+_HUECO = re.compile(r'"\\u0000(\d+)\\u0000"')
+
+
+class _Plantilla:
+    """Registro base serializado una sola vez, con huecos para lo que cambia en cada copia.
+
+    Al escalar, la copia i desplaza los ids de las entidades escaladas, añade
+    el sufijo de la copia a los campos únicos y mueve los turnos i días. Armar
+    una copia es unir textos, sin recorrer ni serializar el registro.
+    """
+
+    def __init__(self, registro, desplazamientos):
+        self.huecos = []
+        self._atributos = {}
+        self.marcado = self._marcar(registro, desplazamientos)
+        self.partes = _HUECO.split(_json(self.marcado).decode("utf-8"))
+
+    def _hueco(self, tipo, valor, extra=None):
+        self.huecos.append((tipo, valor, extra))
+        return f"\x00{len(self.huecos) - 1}\x00"
+
+    def _marcar(self, valor, desplazamientos):
+        if isinstance(valor, list):
+            return [self._marcar(v, desplazamientos) for v in valor]
+        if not isinstance(valor, dict):
+            return valor
+        marcado = {k: self._marcar(v, desplazamientos) for k, v in valor.items()}
+        clave_id = next((k for k in marcado if k in desplazamientos), None)
+        if clave_id is None or not isinstance(marcado[clave_id], int):
+            return marcado
+        marcado[clave_id] = self._hueco("id", marcado[clave_id], desplazamientos[clave_id])
+        for campo in _UNICOS:
+            if isinstance(marcado.get(campo), str) and marcado[campo]:
+                marcado[campo] = self._hueco("unico", marcado[campo])
+        if clave_id == "id_turno" and isinstance(marcado.get("fecha_salida"), str):
+            try:
+                fecha = datetime.strptime(marcado["fecha_salida"], "%d/%m/%Y").date()
+                marcado["fecha_salida"] = self._hueco("fecha", fecha)
+            except ValueError:
+                pass
+        return marcado
+
+    def _llenar(self, numero, i):
+        tipo, valor, extra = self.huecos[numero]
+        if tipo == "id":
+            return valor + i * extra
+        if tipo == "fecha":
+            fecha = date.fromordinal(valor.toordinal() + i)
+            return f"{fecha.day:02d}/{fecha.month:02d}/{fecha.year}"
+        usuario, arroba, dominio = valor.partition("@")
+        return f"{usuario}+{i}@{dominio}" if arroba else f"{valor}-{i}"
+
+    def copia(self, i):
+        partes = self.partes[:]
+        for j in range(1, len(partes), 2):
+            valor = self._llenar(int(partes[j]), i)
+            partes[j] = str(valor) if isinstance(valor, int) else json.dumps(valor, ensure_ascii=False)
+        return "".join(partes).encode("utf-8")
+
+    def valor(self, atributo, i):
+        valor = self._atributos.get(atributo)
+        if valor is None:
+            valor = self._atributos[atributo] = _valor(self.marcado, atributo)
+        if isinstance(valor, str) and valor.startswith("\x00"):
+            return self._llenar(int(valor.strip("\x00")), i)
+        return valor
+
+
+def _ids_maximos(valor, maximos):
+    if isinstance(valor, list):
+        for v in valor:
+            _ids_maximos(v, maximos)
+    elif isinstance(valor, dict):
+        for k, v in valor.items():
+            if k.startswith("id_") and isinstance(v, int):
+                maximos[k] = max(maximos.get(k, 0), v)
+            else:
+                _ids_maximos(v, maximos)
+
+
+def cargar_datos(directorio=DATOS, escala=1, colecciones=None):
+    """{entidad: Coleccion} con los JSON del directorio, escalados `escala` veces"""
+    crudos = {}
+    for archivo in sorted(os.listdir(directorio)):
+        if archivo.endswith(".json"):
+            with open(os.path.join(directorio, archivo), encoding="utf-8") as f:
+                crudos[archivo[:-5].lower()] = json.load(f)
+    escaladas = set(colecciones or crudos)
+    maximos = {}
+    _ids_maximos(list(crudos.values()), maximos)
+    # Solo se desplazan los ids de las colecciones escaladas, así las demás siguen resolviendo
+    desplazamientos = {f"id_{n}": maximos[f"id_{n}"] for n in escaladas if f"id_{n}" in maximos}
+    datos = {}
+    for nombre, registros in crudos.items():
+        coleccion = datos[nombre] = Coleccion(nombre)
+        coleccion.cargar(registros)
+        if nombre in escaladas and escala > 1:
+            plantillas = [_Plantilla(registro, desplazamientos) for registro in registros]
+            for i in range(1, escala):
+                coleccion.cargar_copia(plantillas, i)
+    return datos
+
+
+class BackendSimulado(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, direccion, datos, latencia=0.0, variacion=0.0):
+        super().__init__(direccion, Manejador)
+        self.datos = datos
+        self.latencia = latencia
+        self.variacion = variacion
+
+
+def _lista(datos, entidad):
+    coleccion = datos[entidad]
+    return 200, (b'{"msg":"Lista de ' + coleccion.plural.encode() + b'","'
+                 + coleccion.plural.encode() + b'":[' + coleccion.lista() + b"]}")
+
+
+def _obtener(datos, entidad, id_registro):
+    registro = datos[entidad].obtener(int(id_registro))
+    if registro is None:
+        return 404, {"msg": f"{entidad.capitalize()} no encontrado"}
+    return 200, {"msg": f"{entidad.capitalize()} encontrado", entidad: registro}
+
+
+def _resolver(datos, registro):
+    """Referencias {"x": {"id_x": n}} o "x_id": n → el registro completo, como al guardar en el backend"""
+    for clave in list(registro):
+        nombre = clave[:-3] if clave.endswith("_id") else clave
+        if nombre not in datos or nombre == clave and not isinstance(registro[clave], dict):
+            continue
+        id_ref = registro[clave].get(f"id_{nombre}") if isinstance(registro[clave], dict) else registro[clave]
+        try:
+            completo = datos[nombre].obtener(int(id_ref))
+        except (TypeError, ValueError):
+            continue
+        if completo is not None:
+            registro.pop(clave)
+            registro[nombre] = completo
+    return registro
+
+
+def _guardar(datos, entidad, cuerpo):
+    registro = _resolver(datos, dict(cuerpo))
+    if entidad == "persona" and "contrasenia" in registro and "cuenta" not in registro:
+        # El registro de personas crea también su cuenta, para poder iniciar sesión con ella
+        registro["cuenta"] = datos["cuenta"].guardar({
+            "correo": registro.get("correo"),
+            "contrasenia": registro.pop("contrasenia"),
+            "estado_cuenta": registro.pop("estado_cuenta", "Activo"),
+            "tipo_cuenta": registro.pop("tipo_cuenta", "Cliente"),
+        })
+    registro = datos[entidad].guardar(registro)
+    return 200, {"msg": f"{entidad.capitalize()} guardado exitosamente", entidad: registro}
+
+
+def _actualizar(datos, entidad, cuerpo):
+    coleccion = datos[entidad]
+    try:
+        existente = coleccion.obtener(int(cuerpo.get(coleccion.clave_id)))
+    except (TypeError, ValueError):
+        existente = None
+    if existente is None:
+        return 404, {"msg": f"{entidad.capitalize()} no encontrado"}
+    existente.update(_resolver(datos, dict(cuerpo)))
+    coleccion.reemplazar(existente)
+    return 200, {"msg": f"{entidad.capitalize()} actualizado", entidad: existente}
+
+
+def _eliminar(datos, entidad, id_registro):
+    if datos[entidad].eliminar(int(id_registro)):
+        return 200, {"msg": f"{entidad.capitalize()} eliminado"}
+    return 400, {"msg": f"Error al eliminar {entidad}"}
+
+
+def _ordenar(datos, entidad, atributo, orden):
+    coleccion = datos[entidad]
+    cuerpo = coleccion.ordenar(atributo, orden.lower() == "asc")
+    return 200, (b'{"mensaje":"Lista ordenada correctamente","' + coleccion.plural.encode() + b'":['
+                 + cuerpo + b"]}")
+
+
+def _buscar(datos, entidad, atributo, criterio):
+    clave = CLAVES_BUSQUEDA.get(entidad, "cuentas")
+    encontrados = datos[entidad].buscar(atributo, unquote(criterio))
+    return 200, b'{"mensaje":"B\xc3\xbasqueda realizada","' + clave.encode() + b'":[' + b",".join(encontrados) + b"]}"
+
+
+def _login(datos, cuerpo):
+    correo = (cuerpo.get("correo") or "").strip().lower()
+    contrasenia = (cuerpo.get("contrasenia") or "").strip()
+    if not correo or not contrasenia:
+        return 400, {"mensaje": "correo y contrasenia requeridos"}
+    for contenido in datos["cuenta"].buscar("correo", correo):
+        cuenta = json.loads(contenido)
+        if (cuenta.get("correo") or "").lower() != correo:
+            continue
+        if cuenta.get("contrasenia") != contrasenia:
+            return 401, {"mensaje": "Credenciales inválidas", "failedAttempts": 1}
+        token = _token(cuenta["correo"], cuenta.get("tipo_cuenta"))
+        personas = (json.loads(p) for p in datos["persona"].buscar("cuenta.id_cuenta", str(cuenta["id_cuenta"])))
+        persona = next((p for p in personas if p["cuenta"]["id_cuenta"] == cuenta["id_cuenta"]), {})
+        return 200, {"token": token, "user": cuenta, "tipo_tarifa": persona.get("tipo_tarifa", "General")}
+    return 404, {"mensaje": "Cuenta no encontrada"}
+
+
+def _mejor_descuento(datos, persona):
+    base, promocional = None, None
+    for contenido in datos["descuento"].registros.values():
+        descuento = json.loads(contenido)
+        if descuento.get("estado_descuento") != "Activo":
+            continue
+        if descuento.get("tipo_descuento") == persona.get("tipo_tarifa"):
+            base = descuento
+        elif descuento.get("tipo_descuento") == "Promocional":
+            if promocional is None or descuento.get("porcentaje", 0) > promocional.get("porcentaje", 0):
+                promocional = descuento
+    return base or promocional
+
+
+def _guardar_boletos(datos, cuerpo):
+    """POST /api/boleto/guardar con "asientos": un boleto por asiento y el saldo descontado"""
+    try:
+        persona = datos["persona"].obtener(int(cuerpo["persona"]["id_persona"]))
+        turno = datos["turno"].obtener(int(cuerpo["turno"]["id_turno"]))
+        asientos = cuerpo["asientos"]
+        precio_original = float(cuerpo["precio_unitario"])
+    except (KeyError, TypeError, ValueError):
+        return 400, {"msg": "Debe especificar persona, turno, asientos y precio_unitario"}
+    if persona is None or turno is None:
+        return 400, {"msg": "Persona o turno no encontrados"}
+    if len(asientos) != len(set(asientos)):
+        return 400, {"msg": "No se permiten asientos duplicados"}
+    descuento = _mejor_descuento(datos, persona)
+    precio = precio_original * (1 - descuento["porcentaje"] / 100) if descuento else precio_original
+    total = precio * len(asientos)
+    if persona.get("saldo_disponible", 0) < total:
+        return 400, {"msg": "Saldo insuficiente para comprar los boletos"}
+    capacidad = _valor(turno, "horario.ruta.bus.capacidad_pasajeros") or 0
+    invalido = next((a for a in asientos if not 1 <= a <= capacidad), None)
+    if invalido is not None:
+        return 400, {"msg": f"Número de asiento inválido: {invalido}"}
+    persona["saldo_disponible"] -= total
+    datos["persona"].reemplazar(persona)
+    boletos = []
+    for asiento in asientos:
+        boleto = {
+            "fecha_compra": datetime.now().strftime("%d/%m/%Y"),
+            "numero_asiento": asiento,
+            "cantidad_boleto": 1,
+            "precio_final": precio,
+            "estado_boleto": "Vendido",
+            "persona": persona,
+            "turno": turno,
+        }
+        if descuento:
+            boleto["descuento"] = descuento
+        boletos.append(datos["boleto"].guardar(boleto))
+    respuesta = {
+        "msg": "Boletos guardados exitosamente",
+        "boletos": boletos,
+        "total": total,
+        "saldo_restante": persona["saldo_disponible"],
+    }
+    if descuento:
+        respuesta.update(descuento_aplicado=descuento, precio_original=precio_original * len(asientos),
+                         ahorro=precio_original * len(asientos) - total)
+    return 200, respuesta
+
+
+def _comprar(datos, cuerpo):
+    try:
+        persona = datos["persona"].obtener(int(cuerpo["persona"]["id_persona"]))
+        numero_asiento = int(cuerpo["numero_asiento"])
+        precio = float(cuerpo["precio_final"])
+    except (KeyError, TypeError, ValueError) as e:
+        return 500, {"msg": f"Error: {e}"}
+    if persona is None:
+        return 404, {"msg": "Persona no encontrada"}
+    if persona.get("saldo_disponible", 0) < precio:
+        return 400, {"msg": "Saldo insuficiente"}
+    persona["saldo_disponible"] -= precio
+    datos["persona"].reemplazar(persona)
+    boleto = datos["boleto"].guardar({
+        "fecha_compra": datetime.now().strftime("%d/%m/%Y"),
+        "numero_asiento": numero_asiento,
+        "cantidad_boleto": 1,
+        "precio_final": precio,
+        "estado_boleto": cuerpo.get("estado_boleto", "Pagado"),
+        "persona": persona,
+    })
+    return 201, {"msg": "Boleto comprado exitosamente", "boleto": boleto}
+
+
+# (método, patrón, vista); las vistas con "cuerpo" reciben el JSON de la petición
+RUTAS = (
+    ("POST", r"/api/auth/login", lambda d, cuerpo: _login(d, cuerpo)),
+    ("POST", r"/api/boleto/guardar", lambda d, cuerpo: _guardar_boletos(d, cuerpo)),
+    ("POST", r"/api/boleto/comprar", lambda d, cuerpo: _comprar(d, cuerpo)),
+    ("GET", r"/api/(?P<entidad>\w+)/lista", lambda d, entidad: _lista(d, entidad)),
+    ("GET", r"/api/(?P<entidad>\w+)/lista/(?P<id_registro>\d+)", _obtener),
+    ("POST", r"/api/(?P<entidad>\w+)/guardar", lambda d, cuerpo, entidad: _guardar(d, entidad, cuerpo)),
+    ("PUT", r"/api/(?P<entidad>\w+)/actualizar", lambda d, cuerpo, entidad: _actualizar(d, entidad, cuerpo)),
+    ("DELETE", r"/api/(?P<entidad>\w+)/eliminar/(?P<id_registro>\d+)", _eliminar),
+    ("GET", r"/api/(?P<entidad>\w+)/ordenar/(?P<atributo>[^/]+)/(?P<orden>asc|desc)", _ordenar),
+    ("GET", r"/api/(?P<entidad>\w+)/buscar/(?P<atributo>[^/]+)/(?P<criterio>[^/]+)", _buscar),
+)
+_RUTAS = [(metodo, re.compile(patron + "$"), vista) for metodo, patron, vista in RUTAS]
+
+
+class Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo salen en escrituras separadas; sin esto cada respuesta espera el ACK retardado
+    disable_nagle_algorithm = True
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _responder(self, estado, cuerpo):
+        if not isinstance(cuerpo, bytes):
+            cuerpo = _json(cuerpo)
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _atender(self):
+        servidor = self.server
+        largo = int(self.headers.get("Content-Length") or 0)
+        crudo = self.rfile.read(largo) if largo else b""
+        if servidor.latencia:
+            time.sleep(max(0.0, random.uniform(servidor.latencia - servidor.variacion,
+                                               servidor.latencia + servidor.variacion)) / 1000)
+        ruta = self.path.split("?", 1)[0]
+        for metodo, patron, vista in _RUTAS:
+            coincidencia = patron.match(ruta) if metodo == self.command else None
+            if coincidencia is None:
+                continue
+            argumentos = coincidencia.groupdict()
+            if "entidad" in argumentos and argumentos["entidad"] not in servidor.datos:
+                break
+            try:
+                if self.command in ("POST", "PUT"):
+                    argumentos["cuerpo"] = json.loads(crudo or b"{}")
+                return self._responder(*vista(servidor.datos, **argumentos))
+            except Exception as e:
+                return self._responder(500, {"msg": f"Error: {e}"})
+        self._responder(404, {"msg": f"Ruta no soportada por el backend simulado: {self.command} {ruta}"})
+
+    do_GET = do_POST = do_PUT = do_DELETE = _atender
+
+
+def iniciar(puerto=8099, escala=1, colecciones=None, latencia=0.0, variacion=0.0, anfitrion="127.0.0.1"):
+    """Carga los datos y atiende en un hilo aparte; devuelve el servidor (servidor.shutdown() lo detiene)"""
+    servidor = BackendSimulado((anfitrion, puerto), cargar_datos(escala=escala, colecciones=colecciones),
+                               latencia, variacion)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--puerto", type=int, default=8099)
+    parser.add_argument("--anfitrion", default="127.0.0.1")
+    parser.add_argument("--escala", type=int, default=1, help="copias de cada colección")
+    parser.add_argument("--colecciones", help="colecciones a escalar separadas por comas (por defecto todas)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="ms añadidos a cada respuesta")
+    parser.add_argument("--variacion", type=float, default=0.0, help="ms de variación aleatoria de la latencia")
+    args = parser.parse_args()
+
+    colecciones = args.colecciones.split(",") if args.colecciones else None
+    inicio = time.perf_counter()
+    datos = cargar_datos(escala=args.escala, colecciones=colecciones)
+    print(f"{sum(len(c.registros) for c in datos.values())} registros cargados en "
+          f"{time.perf_counter() - inicio:.1f} s: "
+          + ", ".join(f"{n}={len(c.registros)}" for n, c in datos.items()), file=sys.stderr)
+    servidor = BackendSimulado((args.anfitrion, args.puerto), datos, args.latencia, args.variacion)
+    print(f"Backend simulado en http://{args.anfitrion}:{args.puerto}", file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
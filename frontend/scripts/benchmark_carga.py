@@ -0,0 +1,358 @@
+"""Prueba de carga de los recorridos de compra del frontend.
+
+Cada usuario virtual inicia sesión con su propia cuenta y repite el recorrido
+completo de compra mientras dure la prueba:
+
+    inicio (/index.html) → rutas_opciones (/api/rutas/opciones)
+    → buscar_cooperativas → buses_disponibles
+    → asientos → metodos_pago (/api/metodos-pago/usuario)
+    → procesar_pago → pdf (/generar_pdf_boleto/<id>)
+
+Si un paso falla, el recorrido se corta y vuelve a empezar. Por paso se
+informan p50/p95/p99, media, máximo y peticiones por segundo, y el resultado
+se guarda en JSON para comparar entre commits (--comparar).
+
+Si no se indican --api ni --frontend, levanta scripts/backend_simulado.py y
+`flask run` en procesos aparte. Con --api contra otro backend, tenga en cuenta
+que las compras se guardan y que el saldo de cada usuario se recarga con
+/api/persona/actualizar: use solo datos desechables.
+
+Uso (desde frontend/):
+    python scripts/benchmark_carga.py [--usuarios 10] [--duracion 30]
+        [--escala 100] [--latencia 5] [--salida carga.json] [--comparar anterior.json]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import requests
+
+FRONTEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASOS = (
+    "inicio",
+    "rutas_opciones",
+    "buscar_cooperativas",
+    "buses_disponibles",
+    "asientos",
+    "metodos_pago",
+    "procesar_pago",
+    "pdf",
+)
+
+# Saldo que se deja a cada usuario para que las compras no fallen por saldo
+SALDO = 1e9
+
+# Asiento libre en la página de selección (seleccion_boleto/asientos_disponibles.html)
+_ASIENTO_LIBRE = re.compile(r'data-asiento="(\d+)"\s+data-estado="disponible"')
+
+
+class PasoFallido(Exception):
+    pass
+
+
+def _commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=FRONTEND, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        cambios = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=FRONTEND, capture_output=True, text=True
+        ).stdout.strip()
+        return commit + ("-modificado" if cambios else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def _esperar(url, limite):
+    """Espera a que la URL responda (el backend simulado tarda en cargar con --escala grande)"""
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        try:
+            if requests.get(url, timeout=5).status_code < 500:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} no respondió en {limite} s")
+
+
+def _percentil(ordenados, p):
+    # Rango más cercano, sobre la lista ya ordenada
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+class Muestras:
+    """Latencias por paso, registradas desde los hilos de los usuarios"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tiempos = defaultdict(list)
+        self.errores = defaultdict(Counter)
+        self.recorridos = Counter()
+        self.medir = False
+
+    def anotar(self, paso, ms, error=None):
+        if not self.medir:
+            return
+        with self._lock:
+            self.tiempos[paso].append(ms)
+            if error is not None:
+                self.errores[paso][error[:120]] += 1
+
+    def recorrido(self, completo):
+        if self.medir:
+            with self._lock:
+                self.recorridos["completados" if completo else "fallidos"] += 1
+
+    def resumen(self, duracion):
+        pasos = {}
+        for paso in PASOS:
+            tiempos = sorted(self.tiempos.get(paso, ()))
+            if not tiempos:
+                continue
+            pasos[paso] = {
+                "peticiones": len(tiempos),
+                "errores": sum(self.errores[paso].values()),
+                "por_segundo": round(len(tiempos) / duracion, 2),
+                "p50_ms": round(_percentil(tiempos, 50), 1),
+                "p95_ms": round(_percentil(tiempos, 95), 1),
+                "p99_ms": round(_percentil(tiempos, 99), 1),
+                "media_ms": round(sum(tiempos) / len(tiempos), 1),
+                "max_ms": round(tiempos[-1], 1),
+            }
+        return {
+            "pasos": pasos,
+            "recorridos": {
+                "completados": self.recorridos["completados"],
+                "fallidos": self.recorridos["fallidos"],
+                "por_segundo": round(self.recorridos["completados"] / duracion, 2),
+            },
+            "errores": {paso: dict(errores.most_common(5)) for paso, errores in self.errores.items()},
+        }
+
+
+class Usuario:
+    """Un usuario virtual con su sesión (cookies) del frontend"""
+
+    def __init__(self, frontend, muestras, asientos):
+        self.frontend = frontend
+        self.muestras = muestras
+        self.asientos = asientos
+        self.sesion = requests.Session()
+        self.id_persona = None
+
+    def iniciar_sesion(self, correo, contrasenia):
+        r = self.sesion.post(f"{self.frontend}/iniciar_sesion", json={"correo": correo, "contrasenia": contrasenia})
+        if r.status_code != 200:
+            return False
+        self.id_persona = r.json().get("id")
+        return self.id_persona is not None
+
+    def _paso(self, paso, metodo, ruta, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            r = self.sesion.request(metodo, f"{self.frontend}{ruta}", timeout=60, allow_redirects=False, **kwargs)
+            # El cuerpo entero cuenta en la latencia del paso
+            r.content
+        except requests.exceptions.RequestException as e:
+            self.muestras.anotar(paso, (time.perf_counter() - inicio) * 1000, type(e).__name__)
+            raise PasoFallido(paso)
+        ms = (time.perf_counter() - inicio) * 1000
+        error = f"HTTP {r.status_code}" if r.status_code >= 300 else None
+        if r.headers.get("Content-Type", "").startswith("application/json"):
+            cuerpo = r.json()
+            if isinstance(cuerpo, dict) and (cuerpo.get("success") is False or "error" in cuerpo):
+                error = f"HTTP {r.status_code}: {cuerpo.get('message') or cuerpo.get('error')}"
+        self.muestras.anotar(paso, ms, error)
+        if error is not None:
+            raise PasoFallido(paso)
+        return r
+
+    def recorrido(self):
+        self._paso("inicio", "GET", "/index.html")
+        turnos = self._paso("rutas_opciones", "GET", "/api/rutas/opciones").json()["turnos"]
+        turno = random.choice([t for t in turnos if t.get("estado_turno") == "Disponible"] or turnos)
+        horario = turno["horario"]
+        ruta = horario["ruta"]
+        bus = ruta["bus"]
+        viaje = {"origen": ruta["origen"], "destino": ruta["destino"], "fecha": turno["fecha_salida"]}
+        self._paso("buscar_cooperativas", "GET", "/buscar_cooperativas", params=viaje)
+        self._paso(
+            "buses_disponibles", "GET", "/api/buses/disponibles",
+            params={**viaje, "cooperativa": bus["cooperativa"]["id_cooperativa"]},
+        )
+        pagina = self._paso("asientos", "GET", f"/seleccion_boleto/asientos/{bus['id_bus']}", params=viaje)
+        # Como un usuario real, elige entre los asientos que la página muestra libres
+        libres = [int(n) for n in _ASIENTO_LIBRE.findall(pagina.text)]
+        if len(libres) < self.asientos:
+            self.muestras.anotar("recorrido", 0, "turno sin asientos libres")
+            raise PasoFallido("asientos")
+        asientos = random.sample(libres, self.asientos)
+        viaje_info = json.dumps({
+            **viaje,
+            "hora": horario["hora_salida"],
+            "asientos": asientos,
+            "precio_unitario": ruta["precio_unitario"],
+            "total": ruta["precio_unitario"] * len(asientos),
+        })
+        self._paso("metodos_pago", "GET", "/api/metodos-pago/usuario", params={"viajeInfo": viaje_info})
+        compra = self._paso("procesar_pago", "POST", "/procesar_pago", data={"viajeInfo": viaje_info}).json()
+        self._paso("pdf", "GET", compra["pdf_paths"][0])
+
+    def correr(self, hasta):
+        while time.monotonic() < hasta:
+            try:
+                self.recorrido()
+                self.muestras.recorrido(True)
+            except PasoFallido:
+                self.muestras.recorrido(False)
+            except (KeyError, IndexError, ValueError) as e:
+                # Respuesta con otra forma de la esperada: se cuenta como recorrido fallido
+                self.muestras.anotar("recorrido", 0, f"{type(e).__name__}: {e}")
+                self.muestras.recorrido(False)
+
+
+def preparar_usuarios(api, frontend, muestras, cantidad, asientos):
+    """Inicia sesión con `cantidad` cuentas Cliente distintas y les recarga el saldo"""
+    cuentas = [
+        c for c in requests.get(f"{api}/api/cuenta/lista", timeout=600).json().get("cuentas", [])
+        if c.get("tipo_cuenta") == "Cliente" and c.get("estado_cuenta") == "Activo" and c.get("contrasenia")
+    ]
+    usuarios, vistos = [], set()
+    for cuenta in cuentas:
+        if len(usuarios) == cantidad:
+            break
+        if cuenta["correo"].lower() in vistos:
+            continue
+        vistos.add(cuenta["correo"].lower())
+        usuario = Usuario(frontend, muestras, asientos)
+        if not usuario.iniciar_sesion(cuenta["correo"], cuenta["contrasenia"]):
+            continue
+        r = requests.put(
+            f"{api}/api/persona/actualizar", json={"id_persona": usuario.id_persona, "saldo_disponible": SALDO}
+        )
+        if r.status_code == 200:
+            usuarios.append(usuario)
+    if len(usuarios) < cantidad:
+        print(f"Solo {len(usuarios)} cuentas Cliente pudieron iniciar sesión; "
+              f"use --escala para tener más", file=sys.stderr)
+    return usuarios
+
+
+def comparar(actual, anterior):
+    print(f"\n{'paso':<20} {'p95 antes':>10} {'p95 ahora':>10} {'cambio':>8} {'req/s antes':>12} {'req/s ahora':>12}")
+    for paso, datos in actual["pasos"].items():
+        antes = anterior["pasos"].get(paso)
+        if not antes:
+            continue
+        cambio = (datos["p95_ms"] - antes["p95_ms"]) / antes["p95_ms"] * 100 if antes["p95_ms"] else 0
+        print(f"{paso:<20} {antes['p95_ms']:>10.1f} {datos['p95_ms']:>10.1f} {cambio:>+7.1f}% "
+              f"{antes['por_segundo']:>12.2f} {datos['por_segundo']:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--usuarios", type=int, default=10, help="usuarios virtuales concurrentes")
+    parser.add_argument("--duracion", type=float, default=30, help="segundos medidos")
+    parser.add_argument("--calentamiento", type=float, default=5, help="segundos iniciales sin medir")
+    parser.add_argument("--asientos", type=int, default=2, help="asientos por compra")
+    parser.add_argument("--frontend", help="URL de un frontend ya levantado (p. ej. con gunicorn)")
+    parser.add_argument("--api", help="URL de un backend ya levantado; por defecto se levanta el simulado")
+    parser.add_argument("--escala", type=int, default=1, help="--escala del backend simulado")
+    parser.add_argument("--colecciones", help="--colecciones del backend simulado")
+    parser.add_argument("--latencia", type=float, default=0.0, help="--latencia del backend simulado (ms)")
+    parser.add_argument("--salida", help="archivo JSON de resultados (por defecto carga_<commit>.json)")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para comparar")
+    args = parser.parse_args()
+
+    procesos = []
+    try:
+        api = args.api
+        if api is None:
+            api = "http://127.0.0.1:8099"
+            comando = [sys.executable, os.path.join(FRONTEND, "scripts", "backend_simulado.py"),
+                       "--puerto", "8099", "--escala", str(args.escala), "--latencia", str(args.latencia)]
+            if args.colecciones:
+                comando += ["--colecciones", args.colecciones]
+            procesos.append(subprocess.Popen(comando))
+            _esperar(f"{api}/api/descuento/lista", 900)
+        frontend = args.frontend
+        if frontend is None:
+            frontend = "http://127.0.0.1:5055"
+            entorno = {**os.environ, "API_URL": api, "LOG_NIVEL": os.environ.get("LOG_NIVEL", "WARNING")}
+            procesos.append(subprocess.Popen(
+                [sys.executable, "-m", "flask", "--app", "src.app:create_app", "run", "--port", "5055"],
+                cwd=FRONTEND, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            ))
+            _esperar(f"{frontend}/index.html", 60)
+
+        muestras = Muestras()
+        usuarios = preparar_usuarios(api, frontend, muestras, args.usuarios, args.asientos)
+        if not usuarios:
+            raise SystemExit("Ninguna cuenta pudo iniciar sesión")
+        inicio = time.monotonic()
+        fin = inicio + args.calentamiento + args.duracion
+        hilos = [threading.Thread(target=u.correr, args=(fin,), daemon=True) for u in usuarios]
+        for hilo in hilos:
+            hilo.start()
+        time.sleep(args.calentamiento)
+        muestras.medir = True
+        medido = time.monotonic()
+        for hilo in hilos:
+            hilo.join()
+        muestras.medir = False
+        duracion = time.monotonic() - medido
+    finally:
+        for proceso in procesos:
+            proceso.terminate()
+            proceso.wait()
+
+    commit = _commit()
+    resultado = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "configuracion": {
+            "usuarios": len(usuarios),
+            "duracion_s": args.duracion,
+            "asientos": args.asientos,
+            "frontend": args.frontend or "flask run",
+            "api": args.api or "backend_simulado",
+            "escala": args.escala if args.api is None else None,
+            "latencia_ms": args.latencia if args.api is None else None,
+        },
+        "duracion_s": round(duracion, 2),
+        **muestras.resumen(duracion),
+    }
+
+    print(f"{'paso':<20} {'req':>6} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}   (ms)")
+    for paso, datos in resultado["pasos"].items():
+        print(f"{paso:<20} {datos['peticiones']:>6} {datos['errores']:>5} {datos['por_segundo']:>8.2f} "
+              f"{datos['p50_ms']:>8.1f} {datos['p95_ms']:>8.1f} {datos['p99_ms']:>8.1f}")
+    recorridos = resultado["recorridos"]
+    print(f"recorridos: {recorridos['completados']} completos, {recorridos['fallidos']} fallidos, "
+          f"{recorridos['por_segundo']:.2f}/s")
+    for paso, errores in resultado["errores"].items():
+        for mensaje, veces in errores.items():
+            print(f"  {paso}: {mensaje} ({veces})", file=sys.stderr)
+
+    salida = args.salida or f"carga_{commit}.json"
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"Resultados en {salida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(resultado, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Microbenchmark del render de boletos en PDF.
+
+Compara, por formato, el tiempo por boleto del renderizador anterior a las
+plantillas (pdf_boleto.py de --referencia, leído con git show) con el actual:
+sin plantilla (la parte fija se dibuja en cada página), con la plantilla
+precompilada y en el documento combinado de /generar_pdf_boletos. Usa los
+boletos de backend/data/Boleto.json; no necesita el backend ni Flask en ejecución.
+
+Uso (desde frontend/):
+    python scripts/benchmark_pdf.py [-n 200] [--referencia <commit>]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import types
+
+FRONTEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, FRONTEND)
+
+from src.servicios.pdf_boleto import PLANTILLAS, pdf_lote  # noqa: E402
+
+DATOS = os.path.join(FRONTEND, "..", "backend", "data", "Boleto.json")
+
+
+def revision_base():
+    """Commit anterior al que agregó las plantillas"""
+    commits = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", "src/servicios/plantillas_pdf.py"],
+        cwd=FRONTEND, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    if not commits:
+        raise SystemExit("No se encontró el commit de las plantillas; indique --referencia")
+    return commits[-1] + "^"
+
+
+def cargar_referencia(revision):
+    """pdf_boleto.py de otra revisión como módulo de src.servicios (usa la config actual)"""
+    fuente = subprocess.run(
+        ["git", "show", f"{revision}:frontend/src/servicios/pdf_boleto.py"],
+        cwd=FRONTEND, capture_output=True, text=True, check=True,
+    ).stdout
+    modulo = types.ModuleType("src.servicios._pdf_referencia")
+    modulo.__package__ = "src.servicios"
+    exec(compile(fuente, f"{revision}:pdf_boleto.py", "exec"), modulo.__dict__)
+    return modulo
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200, help="boletos renderizados por medición")
+    parser.add_argument("--referencia", help="commit del renderizador anterior (por defecto, el previo a las plantillas)")
+    args = parser.parse_args()
+
+    revision = args.referencia or revision_base()
+    referencia = cargar_referencia(revision)
+    with open(DATOS, encoding="utf-8") as f:
+        muestra = json.load(f)
+    boletos = [muestra[i % len(muestra)] for i in range(args.n)]
+
+    print(f"referencia: {revision}")
+    print(f"{'formato':<8} {'referencia':>11} {'sin plantilla':>14} {'plantilla':>10} {'lote':>8} {'mejora':>7}"
+          f"   (ms por boleto, n={args.n})")
+    for formato in PLANTILLAS:
+        # Calentar: compila la plantilla y carga las métricas de las fuentes
+        referencia.pdf_lote(formato, boletos[:1])
+        pdf_lote(formato, boletos[:1])
+        pdf_lote(formato, boletos[:1], compilado=False)
+        iterador = iter(boletos * 2)
+        antes = medir(lambda: referencia.pdf_lote(formato, [next(iterador)]), args.n)
+        iterador = iter(boletos * 2)
+        sin_plantilla = medir(lambda: pdf_lote(formato, [next(iterador)], compilado=False), args.n)
+        iterador = iter(boletos * 2)
+        despues = medir(lambda: pdf_lote(formato, [next(iterador)]), args.n)
+        lote = medir(lambda: pdf_lote(formato, boletos), 1) / args.n
+        print(f"{formato:<8} {antes:>11.3f} {sin_plantilla:>14.3f} {despues:>10.3f} {lote:>8.3f} {antes / despues:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -557,6 +557,35 @@ export const saveBoleto = async (
   }
 };
 
+export interface EstadoTrabajoPdf {
+  estado: 'pendiente' | 'listo' | 'error';
+  boletos: Record<string, 'pendiente' | 'listo' | 'error'>;
+  descargas: Record<string, string>;
+}
+
+// Estado de los PDFs que Flask genera en segundo plano tras /api/boleto/guardar
+export const getEstadoTrabajoPdf = async (idTrabajo: string): Promise<EstadoTrabajoPdf | null> => {
+  try {
+    const response = await fetch(`${API_BASE}/api/pdf/trabajos/${encodeURIComponent(idTrabajo)}`, {
+      credentials: CREDENTIALS_MODE
+    });
+    if (!response.ok) return null;
+    const estado: EstadoTrabajoPdf = await response.json();
+    // Las URLs de descarga son relativas a Flask
+    for (const idBoleto of Object.keys(estado.descargas || {})) {
+      estado.descargas[idBoleto] = `${API_BASE}${estado.descargas[idBoleto]}`;
+    }
+    return estado;
+  } catch (error) {
+    console.error('Error al consultar el trabajo de PDFs:', error);
+    return null;
+  }
+};
+
+// Descarga directa del PDF de un boleto, para cuando no se puede consultar el trabajo
+export const getUrlPdfBoleto = (idBoleto: number | string): string =>
+  `${API_BASE}/generar_pdf_boleto/${encodeURIComponent(String(idBoleto))}`;
+
 export const updatePersona = async (persona: PersonaBackend): Promise<boolean> => {
   try {
     const response = await fetch(`${API_BASE}/api/persona/actualizar`, {
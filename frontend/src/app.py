@@ -5,6 +5,12 @@ from .router.route_bus import router_bus
 from .router.route_admin import router_admin
 from .router.router_api import router_api
 from .config import API_URL
+from .servicios.cache_catalogo import cache_catalogo
+from .servicios.cotizaciones import cache_cotizaciones
+from .servicios.instrumentacion import instrumentar
+from .servicios.metricas import medidor_caches, metricas, vista_metricas
+from .servicios.pdf_boleto import cache_pdf
+from .servicios.personas_sesion import personas_sesion
 
 
 def create_app():
@@ -17,6 +23,16 @@ def create_app():
     app.register_blueprint(router_admin)
     app.register_blueprint(router_api)
 
+    instrumentar(app)
+    # Formato de texto de Prometheus; las cachés se leen en cada consulta
+    metricas.medidor(medidor_caches({
+        "catalogo": cache_catalogo.estadisticas,
+        "cotizaciones": cache_cotizaciones.estadisticas,
+        "personas_sesion": personas_sesion.estadisticas,
+        "pdf": cache_pdf.estadisticas,
+    }))
+    app.add_url_rule("/metrics", "metricas", vista_metricas)
+
     @app.template_filter("formato_fecha")
     def formato_fecha(fecha):
         if not fecha:
@@ -2,3 +2,51 @@ import os
 # URL base del backend. En contenedor use el nombre del servicio 'backend'.
 # Para pruebas locales por defecto apuntamos a localhost:8099
 API_URL = os.getenv("API_URL", "http://backend:8099")
+
+# Pool de conexiones HTTP hacia el backend (uno por proceso/worker)
+BACKEND_POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "20"))
+BACKEND_POOL_BLOCK = os.getenv("BACKEND_POOL_BLOCK", "false").lower() == "true"
+BACKEND_TIMEOUT = float(os.getenv("BACKEND_TIMEOUT", "10"))
+# GETs idénticos concurrentes comparten una llamada; ms que se reutiliza el resultado al terminar
+BACKEND_SINGLEFLIGHT_MS = float(os.getenv("BACKEND_SINGLEFLIGHT_MS", "0"))
+
+# Cabecera Server-Timing y una línea JSON por petición con los tiempos del backend, plantillas y PDFs
+# (las métricas de /metrics se recogen siempre)
+INSTRUMENTACION = os.getenv("INSTRUMENTACION", "true").lower() == "true"
+
+# Registro asíncrono (JSON por línea en stdout): nivel, caracteres máximos por campo,
+# fracción de eventos de alto volumen que se escriben y eventos en cola antes de descartar
+LOG_NIVEL = os.getenv("LOG_NIVEL", "INFO").upper()
+LOG_MAX_CARACTERES = int(os.getenv("LOG_MAX_CARACTERES", "500"))
+LOG_MUESTREO = float(os.getenv("LOG_MUESTREO", "0.1"))
+LOG_COLA_MAX = int(os.getenv("LOG_COLA_MAX", "10000"))
+
+# Caché de catálogo (cooperativa/bus/ruta/horario/turno). "memoria" o redis://...
+CATALOGO_CACHE_URL = os.getenv("CATALOGO_CACHE_URL", "memoria")
+CATALOGO_CACHE_TTL = int(os.getenv("CATALOGO_CACHE_TTL", "300"))
+# Segundos entre refrescos en segundo plano de las listas que las vistas leen de memoria
+CATALOGO_REFRESCO_INTERVALO = int(os.getenv("CATALOGO_REFRESCO_INTERVALO", "60"))
+
+# Segundos que se reutiliza la cotización del checkout de un usuario
+COTIZACION_CACHE_TTL = int(os.getenv("COTIZACION_CACHE_TTL", "30"))
+
+# Segundos que se reutiliza la persona del usuario con sesión (nombre, correo, tarifa)
+SESION_PERSONA_TTL = int(os.getenv("SESION_PERSONA_TTL", "60"))
+
+# Segundos máximos que se reutiliza la ocupación de asientos de un turno y los boletos de un
+# usuario: las compras de la app móvil o de otros workers no pasan por este proceso
+ASIENTOS_TTL = int(os.getenv("ASIENTOS_TTL", "5"))
+BOLETOS_PERSONA_TTL = int(os.getenv("BOLETOS_PERSONA_TTL", "30"))
+
+# Compra de boletos: llamadas simultáneas por asiento cuando el backend no acepta lotes
+COMPRA_MAX_PARALELO = int(os.getenv("COMPRA_MAX_PARALELO", "4"))
+
+# Hilos para las consultas en paralelo de las vistas con varios recursos
+FANOUT_MAX_PARALELO = int(os.getenv("FANOUT_MAX_PARALELO", "8"))
+
+# Caché LRU de PDFs de boletos ya generados (por worker)
+PDF_CACHE_MAX_MB = float(os.getenv("PDF_CACHE_MAX_MB", "32"))
+
+# Cola de PDFs post-pago: procesos de render y segundos que se conserva cada trabajo
+PDF_TRABAJOS_PROCESOS = int(os.getenv("PDF_TRABAJOS_PROCESOS", "2"))
+PDF_TRABAJOS_TTL = int(os.getenv("PDF_TRABAJOS_TTL", "3600"))
@@ -2,22 +2,35 @@ from flask import Blueprint, jsonify, render_template, flash, redirect, request,
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
-from flask import make_response
+from flask import make_response, send_file
 from dotenv import load_dotenv
 from functools import wraps
-from fpdf import FPDF
 from ..config import API_URL
+from ..servicios.asientos import estado_asientos
+from ..servicios.cliente_http import cliente_backend
+from ..servicios.compras import comprar_asientos
+from ..servicios.cotizaciones import cache_cotizaciones
+from ..servicios.descuentos import motor_descuentos
+from ..servicios.indices import indice_boletos, indice_personas, indice_turnos
+from ..servicios.instrumentacion import registrar_externa
+from ..servicios.paralelo import obtener_en_paralelo
+from ..servicios.personas_sesion import personas_sesion
+from ..servicios.pdf_boleto import generar_pdf, generar_pdf_lote, huella, huella_lote
+from ..servicios.refresco_catalogo import agregar_edad, refresco_catalogo
+from ..servicios.registro import obtener_registro, resumen_respuesta
+from ..servicios.trabajos_pdf import cola_pdf
 from os import getenv
 import requests
 import secrets
+import io
 import smtplib
-import qrcode
 import time
 import json
 import jwt
 import os
 
 router = Blueprint("router", __name__)
+log = obtener_registro("router")
 
 load_dotenv()
 SECRET_KEY = getenv("JWT_SECRET_KEY", "tu_contrasenia_secreta")
@@ -25,17 +38,11 @@ ALGORITHM = "HS256"
 
 def backend_request(method, path, **kwargs):
     try:
-        if str(path).startswith("http"):
-            url = path
-        elif str(path).startswith("/"):
-            url = API_URL.rstrip("/") + path
-        else:
-            url = API_URL.rstrip("/") + "/" + path
         headers = kwargs.pop("headers", {}) or {}
         token = session.get("token")
         if token:
             headers.setdefault("Authorization", f"Bearer {token}")
-        resp = requests.request(method, url, headers=headers, timeout=10, **kwargs)
+        resp = cliente_backend.request(method, path, headers=headers, **kwargs)
         return resp
     except requests.exceptions.RequestException as e:
         # Construir una response de error simple
@@ -124,23 +131,29 @@ def chat_with_gemini():
             return jsonify({"error": "API key de Gemini no configurada"}), 500
 
         # Llamar a la API de Gemini
-        response = requests.post(
-            f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
-            headers={"Content-Type": "application/json"},
-            json={
-                "contents": [
-                    {
-                        "role": "user",
-                        "parts": [{"text": f"{SYSTEM_PROMPT}\n\nPregunta del usuario: {query}"}]
+        inicio = time.perf_counter()
+        try:
+            response = requests.post(
+                f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
+                headers={"Content-Type": "application/json"},
+                json={
+                    "contents": [
+                        {
+                            "role": "user",
+                            "parts": [{"text": f"{SYSTEM_PROMPT}\n\nPregunta del usuario: {query}"}]
+                        }
+                    ],
+                    "generationConfig": {
+                        "temperature": 0.7,
+                        "maxOutputTokens": 1024
                     }
-                ],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "maxOutputTokens": 1024
-                }
-            },
-            timeout=30
-        )
+                },
+                timeout=30
+            )
+        except requests.exceptions.RequestException as e:
+            registrar_externa("gemini", type(e).__name__, (time.perf_counter() - inicio) * 1000)
+            raise
+        registrar_externa("gemini", response.status_code, (time.perf_counter() - inicio) * 1000)
 
         if response.status_code == 429:
             return jsonify({
@@ -163,7 +176,7 @@ def chat_with_gemini():
     except requests.exceptions.Timeout:
         return jsonify({"error": "Tiempo de espera agotado"}), 504
     except Exception as e:
-        print(f"Error en chat_with_gemini: {e}")
+        log.exception("gemini_error", error=str(e))
         return jsonify({"error": "Error interno del servidor"}), 500
 
 def requiere_iniciar(f):
@@ -207,8 +220,7 @@ def requiere_cliente(f):
 def obtener_info_usuario():
     try:
         usuario_id = session.get("user", {}).get("id")
-        r_usuario = requests.get(f"{API_URL}/api/persona/lista/{usuario_id}")
-        datos_usuario = r_usuario.json().get("persona", {}) if r_usuario.status_code == 200 else {}
+        datos_usuario = personas_sesion.obtener(usuario_id) or {}
         return {
             "nombre": datos_usuario.get("nombre", "Usuario"),
             "apellido": datos_usuario.get("apellido", ""),
@@ -233,9 +245,8 @@ def api_session():
     # Intentar obtener datos completos del usuario desde el backend
     try:
         if usuario_id:
-            response = requests.get(f"{API_URL}/api/persona/lista/{usuario_id}", timeout=10)
-            if response.status_code == 200:
-                persona_data = response.json().get("persona", {})
+            persona_data = personas_sesion.obtener(usuario_id)
+            if persona_data is not None:
                 return jsonify({
                     "authenticated": True,
                     "user": {
@@ -284,10 +295,11 @@ def seleccionar_asientos():
 def get_turnos():
     """Obtener todos los turnos disponibles"""
     try:
-        response = backend_request('GET', '/api/turno/lista')
-        if response.status_code == 200:
-            return jsonify(response.json())
-        return jsonify({"error": "Error al obtener turnos"}), response.status_code
+        turnos, edad = refresco_catalogo.leer("turno")
+        agregar_edad(edad)
+        return jsonify(turnos)
+    except RuntimeError:
+        return jsonify({"error": "Error al obtener turnos"}), 502
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -298,11 +310,8 @@ def iniciar_sesion():
     is_json_request = request.is_json or request.headers.get("Content-Type") == "application/json"
     
     if "user" in session:
-        try:
-            print('[iniciar_sesion] user in session =', session.get('user'))
-            print('[iniciar_sesion] tipo_cuenta =', session.get('user', {}).get('tipo_cuenta'))
-        except Exception:
-            pass
+        log.debug("sesion_existente", usuario=session.get("user", {}).get("id"),
+                  tipo_cuenta=session.get("user", {}).get("tipo_cuenta"))
         
         # Si es petición JSON, devolver datos del usuario en sesión
         if is_json_request:
@@ -319,21 +328,10 @@ def iniciar_sesion():
         
         redirect_url = session.pop("redirect_after_login", None)
         if redirect_url:
-            try:
-                print('[iniciar_sesion] redirect_after_login ->', redirect_url)
-            except Exception:
-                pass
+            log.debug("redireccion_login", destino=redirect_url)
             return redirect(redirect_url)
         if session["user"].get("tipo_cuenta") == "Administrador":
-            try:
-                print('[iniciar_sesion] redirecting to administrador')
-            except Exception:
-                pass
             return redirect(url_for("router.administrador"))
-        try:
-            print('[iniciar_sesion] redirecting to cliente')
-        except Exception:
-            pass
         return redirect(url_for("router.cliente"))
     
     # Servir el login React de busgo en GET
@@ -358,59 +356,52 @@ def iniciar_sesion():
         
         try:
             # Llamar al endpoint de autenticación del backend para validar credenciales y obtener token
-            r = requests.post(f"{API_URL}/api/auth/login", json={"correo": correo, "contrasenia": contrasenia})
-            print(f'[iniciar_sesion] Backend response status: {r.status_code}')
-            print(f'[iniciar_sesion] Backend response text: {r.text}')
+            r = cliente_backend.post(f"{API_URL}/api/auth/login", json={"correo": correo, "contrasenia": contrasenia})
             if r.status_code == 200:
                 data = r.json()
-                print(f'[iniciar_sesion] Backend response JSON keys: {list(data.keys())}')
-                print(f'[iniciar_sesion] Token en respuesta: {data.get("token", "NO ESTÁ")}')
                 token = data.get("token")
-                print(f'[iniciar_sesion] Token extraído: {token[:50] if token else "NO TOKEN"}')
+                log.debug("login_backend", estado=r.status_code, claves=list(data.keys()), token=bool(token))
                 if token:
                     session["token"] = token
-                    print(f'[iniciar_sesion] Token guardado en sesión')
                 # Poblar session['user'] consultando persona asociada
-                personas_resp = backend_request('GET', f"/api/persona/lista")
-                if personas_resp.status_code == 200:
-                    personas = personas_resp.json().get("personas", [])
-                    persona = next((p for p in personas if p.get("cuenta", {}).get("correo") == correo), None)
-                    if persona:
-                        cuenta = persona.get("cuenta", {})
-                        user_data = {
-                            "id": persona.get("id_persona"),
-                            "nombre": persona.get("nombre"),
-                            "apellido": persona.get("apellido"),
+                persona = indice_personas.buscar_por_correo(correo)
+                if persona:
+                    personas_sesion.guardar(persona)
+                    cuenta = persona.get("cuenta", {})
+                    user_data = {
+                        "id": persona.get("id_persona"),
+                        "nombre": persona.get("nombre"),
+                        "apellido": persona.get("apellido"),
+                        "tipo_cuenta": cuenta.get("tipo_cuenta"),
+                        "correo": cuenta.get("correo"),
+                    }
+                    session["user"] = user_data
+                    
+                    # Si es petición JSON, devolver datos del usuario
+                    if is_json_request:
+                        response_data = {
+                            "id": user_data.get("id"),
+                            "nombre": user_data.get("nombre"),
+                            "apellido": user_data.get("apellido"),
+                            "correo": user_data.get("correo"),
+                            "telefono": persona.get("telefono", ""),
+                            "rol": "admin" if cuenta.get("tipo_cuenta") == "Administrador" else "client",
                             "tipo_cuenta": cuenta.get("tipo_cuenta"),
-                            "correo": cuenta.get("correo"),
                         }
-                        session["user"] = user_data
-                        
-                        # Si es petición JSON, devolver datos del usuario
-                        if is_json_request:
-                            response_data = {
-                                "id": user_data.get("id"),
-                                "nombre": user_data.get("nombre"),
-                                "apellido": user_data.get("apellido"),
-                                "correo": user_data.get("correo"),
-                                "telefono": persona.get("telefono", ""),
-                                "rol": "admin" if cuenta.get("tipo_cuenta") == "Administrador" else "client",
-                                "tipo_cuenta": cuenta.get("tipo_cuenta"),
-                            }
-                            # Incluir el token en la respuesta JSON
-                            if token:
-                                response_data["token"] = token
-                            return jsonify(response_data), 200
-                        
-                        redirect_url = session.pop("redirect_after_login", None)
-                        if redirect_url:
-                            return redirect(redirect_url)
-                        if cuenta.get("tipo_cuenta") == "Administrador":
-                            flash("Bienvenido Administrador!", "success")
-                            return redirect(url_for("router.administrador"))
-                        else:
-                            flash("Bienvenido!", "success")
-                            return redirect(url_for("router.cliente"))
+                        # Incluir el token en la respuesta JSON
+                        if token:
+                            response_data["token"] = token
+                        return jsonify(response_data), 200
+                    
+                    redirect_url = session.pop("redirect_after_login", None)
+                    if redirect_url:
+                        return redirect(redirect_url)
+                    if cuenta.get("tipo_cuenta") == "Administrador":
+                        flash("Bienvenido Administrador!", "success")
+                        return redirect(url_for("router.administrador"))
+                    else:
+                        flash("Bienvenido!", "success")
+                        return redirect(url_for("router.cliente"))
                 # fallback
                 session.pop("token", None)
                 if is_json_request:
@@ -419,11 +410,13 @@ def iniciar_sesion():
                 return redirect(url_for("router.iniciar_sesion"))
             elif r.status_code == 423:
                 mensaje = r.json().get("mensaje", "Cuenta bloqueada")
+                log.info("login_rechazado", estado=r.status_code, respuesta=resumen_respuesta(r))
                 if is_json_request:
                     return jsonify({"mensaje": mensaje}), 423
                 flash(mensaje, "danger")
                 return redirect(url_for("router.iniciar_sesion"))
             else:
+                log.info("login_rechazado", estado=r.status_code, respuesta=resumen_respuesta(r))
                 if is_json_request:
                     return jsonify({"error": "Correo o contraseña incorrectos"}), 401
                 flash("Correo o contraseña incorrectos", "danger")
@@ -463,23 +456,26 @@ def registro():
                 if not valor or not valor.strip():
                     flash(f"El campo {campo} es requerido", "danger")
                     return render_template("registro_usuario.html")
-            r_personas = requests.get(f"{API_URL}/api/persona/lista")
-            personas = r_personas.json().get("personas", [])
             numero_identificacion = request.form.get("numero_identificacion")
             correo = request.form.get("correo")
             telefono = request.form.get("telefono")
-            for persona in personas:
+            conflicto = indice_personas.conflicto(
+                numero_identificacion=numero_identificacion, correo=correo, telefono=telefono
+            )
+            if conflicto:
+                ids = indice_personas.buscar_ids(conflicto, request.form.get(conflicto))
+                persona = (indice_personas.obtener(ids[0]) if ids else None) or {}
                 # Algunos registros guardan el correo dentro de persona['cuenta']
                 persona_correo = persona.get('correo') or (persona.get('cuenta', {}) or {}).get('correo')
-                if persona.get("numero_identificacion") == numero_identificacion:
+                if conflicto == "numero_identificacion":
                     return render_template(
                         "registro_usuario.html",
                         error="Ya existe una persona registrada con este número de identificación",
                     )
                 # Si existe una persona registrada con el mismo correo, y venimos desde Google,
                 # asociar sesión y redirigir directamente al cliente en lugar de mostrar error.
-                if persona_correo == correo:
-                    if session.get('from_google'):
+                if conflicto == "correo":
+                    if session.get('from_google') and persona:
                         try:
                             cuenta = persona.get('cuenta', {})
                             session['user'] = {
@@ -504,9 +500,9 @@ def registro():
                         "registro_usuario.html",
                         error="Ya existe una persona registrada con este correo electrónico",
                     )
-                if persona.get("telefono") == telefono:
+                if conflicto == "telefono":
                     # Si venimos desde Google, asociar sesión y redirigir directamente al cliente
-                    if session.get('from_google'):
+                    if session.get('from_google') and persona:
                         try:
                             cuenta = persona.get('cuenta', {})
                             # Si tenemos correo de Google y la cuenta actual no tiene correo, update
@@ -537,7 +533,7 @@ def registro():
                                         },
                                     }
                                     try:
-                                        upd_resp = requests.put(f"{API_URL}/api/persona/actualizar", json=update_data, timeout=10)
+                                        upd_resp = cliente_backend.put(f"{API_URL}/api/persona/actualizar", json=update_data, timeout=10)
                                         if upd_resp.status_code == 200:
                                             # reflect change locally
                                             persona['cuenta'] = persona.get('cuenta', {})
@@ -587,7 +583,7 @@ def registro():
                 "tipo_cuenta": "Cliente",
                 "estado_cuenta": "Activo",
             }
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/persona/guardar",
                 headers={"Content-Type": "application/json"},
                 json=datos_registro,
@@ -601,25 +597,22 @@ def registro():
                 # Si venimos del flujo de Google, iniciar sesión automáticamente y redirigir a cliente
                 if session.get('from_google'):
                     try:
-                        # volver a pedir la lista de personas y buscar por correo
-                        personas_resp = backend_request('GET', '/api/persona/lista')
-                        if personas_resp.status_code == 200:
-                            personas = personas_resp.json().get('personas', [])
-                            persona = next((p for p in personas if p.get('cuenta', {}).get('correo') == correo), None)
-                            if persona:
-                                cuenta = persona.get('cuenta', {})
-                                session['user'] = {
-                                    'id': persona.get('id_persona'),
-                                    'nombre': persona.get('nombre'),
-                                    'apellido': persona.get('apellido'),
-                                    'tipo_cuenta': cuenta.get('tipo_cuenta'),
-                                    'correo': cuenta.get('correo'),
-                                }
-                                # limpiar marca de from_google para evitar reintentos
-                                session.pop('from_google', None)
-                                session.pop('google_correo', None)
-                                flash('Registro asociado. Sesión iniciada.', 'success')
-                                return redirect(url_for('router.cliente'))
+                        # buscar la persona recién registrada por correo
+                        persona = indice_personas.buscar_por_correo(correo)
+                        if persona:
+                            cuenta = persona.get('cuenta', {})
+                            session['user'] = {
+                                'id': persona.get('id_persona'),
+                                'nombre': persona.get('nombre'),
+                                'apellido': persona.get('apellido'),
+                                'tipo_cuenta': cuenta.get('tipo_cuenta'),
+                                'correo': cuenta.get('correo'),
+                            }
+                            # limpiar marca de from_google para evitar reintentos
+                            session.pop('from_google', None)
+                            session.pop('google_correo', None)
+                            flash('Registro asociado. Sesión iniciada.', 'success')
+                            return redirect(url_for('router.cliente'))
                     except Exception:
                         pass
                 return redirect(url_for("router.iniciar_sesion"))
@@ -644,19 +637,12 @@ def _load_backend_google_config():
         base = os.path.dirname(__file__)
         env_path = os.path.normpath(os.path.join(base, "../../../backend/.env"))
         exists = os.path.exists(env_path)
-        try:
-            print('[_load_backend_google_config] env_path =', env_path, 'exists=', exists)
-        except Exception:
-            pass
         if exists:
             load_dotenv(env_path)
         # Leer variables después de intentar cargar el .env
         client_id = getenv("GOOGLE_CLIENT_ID")
-        # Mostrar solo client_id para depuración (no imprimir secret)
-        try:
-            print('[_load_backend_google_config] GOOGLE_CLIENT_ID =', client_id)
-        except Exception:
-            pass
+        # Mostrar solo client_id para depuración (no registrar el secret)
+        log.debug("google_config", env_path=env_path, existe=exists, client_id=client_id)
         return {
             "client_id": client_id,
             "client_secret": getenv("GOOGLE_CLIENT_SECRET"),
@@ -683,23 +669,12 @@ def google_login():
         f"&redirect_uri={requests.utils.requote_uri(redirect_uri)}"
         f"&access_type=offline&prompt=consent"
     )
-    try:
-        print('[google_login] auth_url =', auth_url)
-        print('[google_login] client_id =', client_id)
-        print('[google_login] redirect_uri used =', redirect_uri)
-        print('[google_login] cfg.redirect_uri =', cfg.get('redirect_uri'))
-    except Exception:
-        pass
+    log.debug("google_login", auth_url=auth_url, redirect_uri=redirect_uri, redirect_uri_cfg=cfg.get("redirect_uri"))
     return redirect(auth_url)
 
 @router.route("/auth/google/callback", methods=["GET", "POST"])
 def google_callback():
-    try:
-        print('[google_callback] request.url =', request.url)
-        print('[google_callback] request.args =', dict(request.args))
-        print('[google_callback] request.method =', request.method)
-    except Exception:
-        pass
+    log.debug("google_callback", metodo=request.method, args=sorted(request.args))
 
     error = request.args.get("error")
     if error:
@@ -707,14 +682,8 @@ def google_callback():
         return redirect(url_for("router.iniciar_sesion"))
     code = request.args.get("code")
     if not code:
-        try:
-            # mostrar información adicional en logs para depuración
-            print('[google_callback] No code received. request.args:', dict(request.args))
-            print('[google_callback] Full request headers:')
-            for k, v in request.headers.items():
-                print(f'  {k}: {v}')
-        except Exception:
-            pass
+        # Información adicional para depuración (sin valores de cabeceras, que pueden traer cookies)
+        log.warning("google_sin_codigo", args=dict(request.args), cabeceras=list(request.headers.keys()))
         flash("No se recibió código de Google. Revisa que la redirect URI registrada en Google Cloud Console sea exactamente http://localhost:5000/auth/google/callback", "danger")
         return redirect(url_for("router.iniciar_sesion"))
 
@@ -743,21 +712,12 @@ def google_callback():
             timeout=10,
         )
     except requests.exceptions.RequestException as e:
-        # Log detailed exception and traceback to container logs for debugging
-        try:
-            print('[google_callback] token exchange exception repr =', repr(e))
-            traceback.print_exc()
-        except Exception:
-            pass
+        log.exception("google_token_error", error=repr(e))
         flash(f"Error conectando con Google: {str(e)}", "danger")
         return redirect(url_for("router.iniciar_sesion"))
 
     if token_resp.status_code != 200:
-        try:
-            print('[google_callback] token exchange failed, status=', token_resp.status_code)
-            print('[google_callback] token_resp.text =', token_resp.text)
-        except Exception:
-            pass
+        log.warning("google_token_fallido", estado=token_resp.status_code, respuesta=resumen_respuesta(token_resp))
         flash("No se pudo obtener token de Google", "danger")
         return redirect(url_for("router.iniciar_sesion"))
 
@@ -775,21 +735,12 @@ def google_callback():
             timeout=10,
         )
     except requests.exceptions.RequestException as e:
-        # Log detailed exception and traceback
-        try:
-            print('[google_callback] userinfo request exception repr =', repr(e))
-            traceback.print_exc()
-        except Exception:
-            pass
+        log.exception("google_userinfo_error", error=repr(e))
         flash(f"Error obteniendo información de usuario: {str(e)}", "danger")
         return redirect(url_for("router.iniciar_sesion"))
 
     if userinfo_resp.status_code != 200:
-        try:
-            print('[google_callback] userinfo request failed, status=', userinfo_resp.status_code)
-            print('[google_callback] userinfo_resp.text =', userinfo_resp.text)
-        except Exception:
-            pass
+        log.warning("google_userinfo_fallido", estado=userinfo_resp.status_code, respuesta=resumen_respuesta(userinfo_resp))
         flash("No se pudo obtener la información del perfil de Google", "danger")
         return redirect(url_for("router.iniciar_sesion"))
 
@@ -801,32 +752,23 @@ def google_callback():
 
     # Buscar persona en backend por correo
     try:
-        personas_resp = requests.get(f"{API_URL}/api/persona/lista", timeout=10)
-        try:
-            print(f"[google_callback] personas_resp.status = {personas_resp.status_code}")
-        except Exception:
-            pass
-        if personas_resp.status_code == 200:
-            personas = personas_resp.json().get("personas", [])
-            persona = next((p for p in personas if (p.get("correo") or (p.get("cuenta", {}) or {}).get("correo")) == correo), None)
-            if persona:
-                cuenta = persona.get("cuenta", {})
-                # SIEMPRE usar los nombres del perfil de Google, nunca los guardados en la BD
-                session["user"] = {
-                    "id": persona.get("id_persona"),
-                    "nombre": nombre,
-                    "apellido": apellido,
-                    "tipo_cuenta": cuenta.get("tipo_cuenta"),
-                    "correo": cuenta.get("correo") or correo,
-                }
-                flash("Sesión iniciada con Google", "success")
-                return redirect(url_for("router.cliente"))
+        persona = indice_personas.buscar_por_correo(correo)
+        if persona:
+            personas_sesion.guardar(persona)
+            cuenta = persona.get("cuenta", {})
+            # SIEMPRE usar los nombres del perfil de Google, nunca los guardados en la BD
+            session["user"] = {
+                "id": persona.get("id_persona"),
+                "nombre": nombre,
+                "apellido": apellido,
+                "tipo_cuenta": cuenta.get("tipo_cuenta"),
+                "correo": cuenta.get("correo") or correo,
+            }
+            flash("Sesión iniciada con Google", "success")
+            return redirect(url_for("router.cliente"))
     except Exception as e:
         # si falla la consulta al backend, continuar al flujo de registro
-        try:
-            print(f"[google_callback] personas_resp exception = {e}")
-        except Exception:
-            pass
+        log.warning("google_busqueda_persona", error=str(e))
         persona = None
 
     # Si no existe, intentar crear la persona automáticamente usando los datos de Google
@@ -850,11 +792,8 @@ def google_callback():
             "tipo_cuenta": "Cliente",
             "estado_cuenta": "Activo",
         }
-        try:
-            print('[google_callback] datos_registro payload =', datos_registro)
-        except Exception:
-            pass
-        crear_resp = requests.post(
+        log.debug("google_registro", datos=datos_registro)
+        crear_resp = cliente_backend.post(
             f"{API_URL}/api/persona/guardar",
             headers={"Content-Type": "application/json"},
             json=datos_registro,
@@ -862,67 +801,57 @@ def google_callback():
         )
         if crear_resp.status_code == 200:
             # Buscar la persona recién creada y crear la sesión
-            personas_resp = requests.get(f"{API_URL}/api/persona/lista", timeout=10)
-            if personas_resp.status_code == 200:
-                personas = personas_resp.json().get("personas", [])
-                persona = next((p for p in personas if (p.get("correo") or (p.get("cuenta", {}) or {}).get("correo")) == correo), None)
+            persona = indice_personas.buscar_por_correo(correo)
+            if persona:
+                cuenta = persona.get("cuenta", {})
+                session["user"] = {
+                    "id": persona.get("id_persona"),
+                    "nombre": persona.get("nombre"),
+                    "apellido": persona.get("apellido"),
+                    "tipo_cuenta": cuenta.get("tipo_cuenta") or "Cliente",
+                    "correo": cuenta.get("correo") or correo,
+                }
+                # Intentar login automático para obtener token de sesión
+                try:
+                    login_resp = cliente_backend.post(
+                        f"{API_URL}/api/auth/login",
+                        json={"correo": correo, "contrasenia": generated_password},
+                        timeout=10,
+                    )
+                    if login_resp.status_code == 200:
+                        login_data = login_resp.json()
+                        token = login_data.get("token") or login_data.get("access_token")
+                        if token:
+                            session["token"] = token
+                except Exception:
+                    # No crítico: si falla el login automático dejaremos al usuario con session['user'] y sin token
+                    pass
+                # Limpiar marcas de flujo Google
+                session.pop("from_google", None)
+                session.pop("google_correo", None)
+                session.pop("google_user", None)
+                flash("Cuenta creada e iniciada con Google", "success")
+                return redirect(url_for("router.cliente"))
+        # Si la creación falla, intentar asociar por correo
+        else:
+            log.warning("google_registro_fallido", estado=crear_resp.status_code, respuesta=resumen_respuesta(crear_resp))
+            try:
+                persona = indice_personas.buscar_por_correo(correo)
                 if persona:
                     cuenta = persona.get("cuenta", {})
                     session["user"] = {
                         "id": persona.get("id_persona"),
                         "nombre": persona.get("nombre"),
                         "apellido": persona.get("apellido"),
-                        "tipo_cuenta": cuenta.get("tipo_cuenta") or "Cliente",
+                        "tipo_cuenta": cuenta.get("tipo_cuenta", "Cliente"),
                         "correo": cuenta.get("correo") or correo,
                     }
-                    # Intentar login automático para obtener token de sesión
-                    try:
-                        login_resp = requests.post(
-                            f"{API_URL}/api/auth/login",
-                            json={"correo": correo, "contrasenia": generated_password},
-                            timeout=10,
-                        )
-                        if login_resp.status_code == 200:
-                            login_data = login_resp.json()
-                            token = login_data.get("token") or login_data.get("access_token")
-                            if token:
-                                session["token"] = token
-                    except Exception:
-                        # No crítico: si falla el login automático dejaremos al usuario con session['user'] y sin token
-                        pass
-                    # Limpiar marcas de flujo Google
-                    session.pop("from_google", None)
-                    session.pop("google_correo", None)
-                    session.pop("google_user", None)
-                    flash("Cuenta creada e iniciada con Google", "success")
-                    return redirect(url_for("router.cliente"))
-        # Si la creación falla, intentar asociar por correo consultando la lista de personas
-        else:
-            try:
-                print('[google_callback] crear_resp.status=', crear_resp.status_code)
-                print('[google_callback] crear_resp.text =', crear_resp.text)
-            except Exception:
-                pass
-            try:
-                personas_resp = requests.get(f"{API_URL}/api/persona/lista", timeout=10)
-                if personas_resp.status_code == 200:
-                    personas = personas_resp.json().get("personas", [])
-                    persona = next((p for p in personas if (p.get("correo") or (p.get("cuenta", {}) or {}).get("correo")) == correo), None)
-                    if persona:
-                        cuenta = persona.get("cuenta", {})
-                        session["user"] = {
-                            "id": persona.get("id_persona"),
-                            "nombre": persona.get("nombre"),
-                            "apellido": persona.get("apellido"),
-                            "tipo_cuenta": cuenta.get("tipo_cuenta", "Cliente"),
-                            "correo": cuenta.get("correo") or correo,
-                        }
-                        # limpiar marcas por si existían
-                        session.pop('from_google', None)
-                        session.pop('google_correo', None)
-                        session.pop('google_user', None)
-                        flash('Cuenta existente asociada. Sesión iniciada.', 'success')
-                        return redirect(url_for('router.cliente'))
+                    # limpiar marcas por si existían
+                    session.pop('from_google', None)
+                    session.pop('google_correo', None)
+                    session.pop('google_user', None)
+                    flash('Cuenta existente asociada. Sesión iniciada.', 'success')
+                    return redirect(url_for('router.cliente'))
             except Exception:
                 # Si falla la consulta, continuar
                 pass
@@ -951,70 +880,53 @@ def google_callback():
             "tipo_cuenta": "Cliente",
             "estado_cuenta": "Activo",
         }
-        try:
-            print('[google_callback] Intentando crear persona automáticamente con datos:', datos_registro)
-        except Exception:
-            pass
-        crear_resp = requests.post(
+        log.debug("google_registro_automatico", datos=datos_registro)
+        crear_resp = cliente_backend.post(
             f"{API_URL}/api/persona/guardar",
             headers={"Content-Type": "application/json"},
             json=datos_registro,
             timeout=10,
         )
-        try:
-            print(f"[google_callback] crear_resp.status = {crear_resp.status_code}")
-            print(f"[google_callback] crear_resp.text = {crear_resp.text}")
-        except Exception:
-            pass
+        log.debug("google_registro_automatico", estado=crear_resp.status_code, respuesta=resumen_respuesta(crear_resp))
         if crear_resp.status_code == 200:
             # Intentar obtener el id de la persona creada
             persona_id = None
             try:
                 # Intentar buscar la persona recién creada por correo
-                personas_resp = requests.get(f"{API_URL}/api/persona/lista", timeout=10)
-                try:
-                    print(f"[google_callback] personas_resp_after_create.status = {personas_resp.status_code}")
-                except Exception:
-                    pass
-                if personas_resp.status_code == 200:
-                    personas = personas_resp.json().get("personas", [])
-                    persona = next((p for p in personas if (p.get("correo") or (p.get("cuenta", {}) or {}).get("correo")) == correo), None)
-                    if persona:
-                        persona_id = persona.get("id_persona")
-                        cuenta = persona.get("cuenta", {})
-                        session["user"] = {
-                            "id": persona_id,
-                            "nombre": nombre,
-                            "apellido": apellido,
-                            "tipo_cuenta": cuenta.get("tipo_cuenta", "Cliente"),
-                            "correo": cuenta.get("correo") or correo,
-                        }
-                        # intentar login para obtener token
-                        try:
-                            login_resp = requests.post(
-                                f"{API_URL}/api/auth/login",
-                                json={"correo": correo, "contrasenia": generated_password},
-                                timeout=10,
-                            )
-                            if login_resp.status_code == 200:
-                                login_data = login_resp.json()
-                                token = login_data.get("token") or login_data.get("access_token")
-                                if token:
-                                    session["token"] = token
-                        except Exception:
-                            pass
-                        # limpiar marcas
-                        session.pop('from_google', None)
-                        session.pop('google_correo', None)
-                        session.pop('google_user', None)
-                        session.pop('google_only', None)
-                        flash("Cuenta creada automáticamente con Google", "success")
-                        return redirect(url_for("router.cliente"))
+                persona = indice_personas.buscar_por_correo(correo)
+                if persona:
+                    persona_id = persona.get("id_persona")
+                    cuenta = persona.get("cuenta", {})
+                    session["user"] = {
+                        "id": persona_id,
+                        "nombre": nombre,
+                        "apellido": apellido,
+                        "tipo_cuenta": cuenta.get("tipo_cuenta", "Cliente"),
+                        "correo": cuenta.get("correo") or correo,
+                    }
+                    # intentar login para obtener token
+                    try:
+                        login_resp = cliente_backend.post(
+                            f"{API_URL}/api/auth/login",
+                            json={"correo": correo, "contrasenia": generated_password},
+                            timeout=10,
+                        )
+                        if login_resp.status_code == 200:
+                            login_data = login_resp.json()
+                            token = login_data.get("token") or login_data.get("access_token")
+                            if token:
+                                session["token"] = token
+                    except Exception:
+                        pass
+                    # limpiar marcas
+                    session.pop('from_google', None)
+                    session.pop('google_correo', None)
+                    session.pop('google_user', None)
+                    session.pop('google_only', None)
+                    flash("Cuenta creada automáticamente con Google", "success")
+                    return redirect(url_for("router.cliente"))
             except Exception as e:
-                try:
-                    print(f'[google_callback] Error obteniendo id de persona: {e}')
-                except Exception:
-                    pass
+                log.warning("google_id_persona", error=str(e))
             
             # Si no se pudo obtener el id, crear sesión temporal
             session["user"] = {
@@ -1026,7 +938,7 @@ def google_callback():
             }
             # intentar login para obtener token
             try:
-                login_resp = requests.post(
+                login_resp = cliente_backend.post(
                     f"{API_URL}/api/auth/login",
                     json={"correo": correo, "contrasenia": generated_password},
                     timeout=10,
@@ -1046,11 +958,7 @@ def google_callback():
             flash("Cuenta creada automáticamente con Google", "success")
             return redirect(url_for("router.cliente"))
     except Exception:
-        try:
-            import traceback
-            traceback.print_exc()
-        except Exception:
-            pass
+        log.exception("google_registro_error")
     
     # Si todo falla, mostrar error
     flash("Error creando la cuenta con Google. Por favor intenta nuevamente.", "danger")
@@ -1063,23 +971,17 @@ def recuperar_contrasenia():
     if request.method == "POST":
         correo = request.form.get("correo")
         try:
-            response = requests.get(f"{API_URL}/api/persona/lista")
-            if response.status_code == 200:
-                personas = response.json().get("personas", [])
-                persona = next((p for p in personas if p.get("correo") == correo), None)
-                if persona:
-                    token = secrets.token_urlsafe(32)
-                    session[f"reset_token_{token}"] = persona["id_persona"]
-                    session[f"reset_token_{token}_expiry"] = int(time.time()) + 3600
-                    reset_url = url_for("router.cambiar_contrasenia", token=token, _external=True)
-                    print("\nURL para cambiar contraseña:")
-                    print(f"Token: {token}")
-                    print(f"URL completa: {reset_url}\n")
-                    enviar_al_correo(correo, reset_url)
-                    return redirect(url_for("router.correo_enviado"))
-                flash("No se encontró una cuenta con ese correo", "error")
-            else:
-                flash("Error al verificar el correo", "danger")
+            persona = indice_personas.buscar_por_correo(correo)
+            if persona:
+                token = secrets.token_urlsafe(32)
+                session[f"reset_token_{token}"] = persona["id_persona"]
+                session[f"reset_token_{token}_expiry"] = int(time.time()) + 3600
+                reset_url = url_for("router.cambiar_contrasenia", token=token, _external=True)
+                # La URL lleva el token: no se escribe en el registro
+                log.debug("recuperar_contrasenia", id_persona=persona["id_persona"])
+                enviar_al_correo(correo, reset_url)
+                return redirect(url_for("router.correo_enviado"))
+            flash("No se encontró una cuenta con ese correo", "error")
         except Exception as e:
             flash(f"Error: {str(e)}", "danger")
     return render_template("utiles/rc_recuperar_contrasenia.html")
@@ -1106,7 +1008,7 @@ def cambiar_contrasenia(token):
             flash("Las contraseñas no coinciden", "danger")
             return redirect(url_for("router.cambiar_contrasenia", token=token))
         try:
-            response = requests.get(f"{API_URL}/api/persona/lista/{persona_id}")
+            response = cliente_backend.get(f"{API_URL}/api/persona/lista/{persona_id}")
             if response.status_code == 200:
                 persona_data = response.json()["persona"]
                 update_data = {
@@ -1131,7 +1033,7 @@ def cambiar_contrasenia(token):
                         "estado_cuenta": persona_data["cuenta"]["estado_cuenta"],
                     },
                 }
-                update_response = requests.put(
+                update_response = cliente_backend.put(
                     f"{API_URL}/api/persona/actualizar", json=update_data
                 )
                 if update_response.status_code == 200:
@@ -1184,7 +1086,7 @@ def enviar_al_correo(to_email, reset_url):
 def perfil():
     if request.method == "POST":
         try:
-            r_usuario = requests.get(
+            r_usuario = cliente_backend.get(
                 f"{API_URL}/api/persona/lista/{session['user']['id']}"
             )
             datos_actuales = r_usuario.json().get("persona", {})
@@ -1216,9 +1118,10 @@ def perfil():
                     ),
                 },
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/persona/actualizar", json=datos_actualizacion
             )
+            personas_sesion.invalidar(session["user"]["id"])
             if r.status_code == 200:
                 session["user"].update(
                     {
@@ -1237,7 +1140,7 @@ def perfil():
             flash(f"Error en el primer try: {str(e)}", "error")
         return redirect(url_for("router.perfil"))
     try:
-        r_usuario = requests.get(f"{API_URL}/api/persona/lista/{session['user']['id']}")
+        r_usuario = cliente_backend.get(f"{API_URL}/api/persona/lista/{session['user']['id']}")
         usuario_perfil = r_usuario.json().get("persona", {})
         return render_template(
             "perfil.html",
@@ -1284,7 +1187,7 @@ def procesar_pago():
             if not viaje_info or not viaje_info.get("asientos"):
                 return jsonify({"success": False, "message": "Información de viaje inválida"})
             usuario_id = session.get("user", {}).get("id")
-            r_usuario = requests.get(f"{API_URL}/api/persona/lista/{usuario_id}")
+            r_usuario = cliente_backend.get(f"{API_URL}/api/persona/lista/{usuario_id}")
             if r_usuario.status_code != 200:
                 return jsonify({"success": False, "message": "Error al obtener datos del usuario"})
             usuario = r_usuario.json().get("persona", {})
@@ -1292,63 +1195,80 @@ def procesar_pago():
             total_pagar = float(viaje_info.get("total", 0))
             if saldo_actual < total_pagar:
                 return jsonify({"success": False, "message": "Saldo insuficiente"})
-            r = requests.get(f"{API_URL}/api/turno/lista")
-            if r.status_code != 200:
+            if not indice_turnos.refrescar():
                 raise ValueError("Error al obtener turnos")
-            turnos = r.json().get("turnos", [])
-            turno_encontrado = None
-            for turno in turnos:
-                fecha_turno = datetime.strptime(turno["fecha_salida"], "%d/%m/%Y").date()
-                fecha_viaje = datetime.strptime(viaje_info["fecha"], "%d/%m/%Y").date()
-                ruta = turno["horario"]["ruta"]
-                if (
-                    fecha_turno == fecha_viaje
-                    and turno["horario"]["hora_salida"] == viaje_info["hora"]
-                    and ruta["origen"] == viaje_info["origen"]
-                    and ruta["destino"] == viaje_info["destino"]
-                ):
-                    turno_encontrado = turno
-                    break
+            turno_encontrado = next(
+                iter(
+                    indice_turnos.buscar_salida(
+                        viaje_info["origen"],
+                        viaje_info["destino"],
+                        viaje_info["fecha"],
+                        viaje_info["hora"],
+                    )
+                ),
+                None,
+            )
             if not turno_encontrado:
                 raise ValueError("No se encontró un turno válido")
-            boletos_creados = []
+            # El backend no rechaza asientos ya vendidos: se confirman contra él antes de comprar
+            capacidad = turno_encontrado["horario"]["ruta"]["bus"]["capacidad_pasajeros"]
+            ocupados = estado_asientos.ocupados(turno_encontrado["id_turno"], capacidad, viaje_info["asientos"])
+            if ocupados:
+                return jsonify(
+                    {
+                        "success": False,
+                        "message": "Los asientos " + ", ".join(map(str, ocupados)) + " ya no están disponibles",
+                        "asientos_ocupados": ocupados,
+                    }
+                ), 409
             fecha_actual = datetime.now().strftime("%d/%m/%Y")
-            for numero_asiento in viaje_info["asientos"]:
-                boleto_data = {
-                    "fecha_compra": fecha_actual,
-                    "asientos": [numero_asiento],
-                    "precio_unitario": float(viaje_info["precio_unitario"]),
-                    "estado_boleto": "Vendido",
-                    "persona": {"id_persona": usuario_id},
-                    "turno": {"id_turno": turno_encontrado["id_turno"]},
-                }
-                response = requests.post(
-                    f"{API_URL}/api/boleto/guardar",
-                    headers={"Content-Type": "application/json"},
-                    json=boleto_data,
-                )
-                if response.status_code != 200:
-                    raise Exception(f"Error al guardar boleto: {response.text}")
-                boleto_guardado = response.json().get("boleto")
-                if boleto_guardado:
-                    boletos_creados.append(boleto_guardado)
-            pdf_paths = []
-            for boleto in boletos_creados:
-                pdf_data = {
-                    **boleto,
-                    "origen": viaje_info["origen"],
-                    "destino": viaje_info["destino"],
-                    "cooperativa": viaje_info["cooperativa"],
-                }
-                pdf_path = generar_boleto_pdf(pdf_data)
-                if pdf_path:
-                    pdf_paths.append(pdf_path)
+            boleto_data = {
+                "fecha_compra": fecha_actual,
+                "precio_unitario": float(viaje_info["precio_unitario"]),
+                "estado_boleto": "Vendido",
+                "persona": {"id_persona": usuario_id},
+                "turno": {"id_turno": turno_encontrado["id_turno"]},
+            }
+            compra = comprar_asientos(boleto_data, viaje_info["asientos"])
+            cache_cotizaciones.invalidar_usuario(usuario_id)
+            boletos_creados = compra["boletos"]
+            indice_boletos.agregar(boletos_creados)
+            estado_asientos.registrar(boletos_creados)
+            fallidos = [a for a in compra["asientos"] if not a["success"]]
+            if not boletos_creados:
+                return jsonify(
+                    {
+                        "success": False,
+                        "message": fallidos[0]["message"] if fallidos else "No se pudo guardar el boleto",
+                        "asientos": compra["asientos"],
+                    }
+                ), 400
+            pdf_paths = [
+                url_for("router.generar_boleto_pdf", boleto_id=boleto["id_boleto"])
+                for boleto in boletos_creados
+                if boleto.get("id_boleto") is not None
+            ]
+            ids_creados = [str(b["id_boleto"]) for b in boletos_creados if b.get("id_boleto") is not None]
+            pdf_lote = url_for("router.generar_boletos_pdf", ids=",".join(ids_creados)) if ids_creados else None
+            # Los PDFs se renderizan en segundo plano; la respuesta no los espera
+            id_trabajo = cola_pdf.encolar(boletos_creados, propietario=usuario_id)
+            nuevo_saldo = compra["saldo_restante"]
+            if nuevo_saldo is None:
+                nuevo_saldo = saldo_actual - total_pagar
+            if fallidos:
+                mensaje = "No se pudieron comprar los asientos " + ", ".join(str(a["asiento"]) for a in fallidos)
+            else:
+                mensaje = "Boletos generados correctamente"
             return jsonify(
                 {
                     "success": True,
-                    "message": "Boletos generados correctamente",
+                    "message": mensaje,
+                    "asientos": compra["asientos"],
                     "pdf_paths": pdf_paths,
-                    "nuevo_saldo": saldo_actual - total_pagar,
+                    "pdf_lote": pdf_lote,
+                    "trabajo_pdf": id_trabajo,
+                    "estado_pdf": url_for("router_api.estado_trabajo_pdf", id_trabajo=id_trabajo),
+                    "nuevo_saldo": nuevo_saldo,
                 }
             )
         except ValueError as e:
@@ -1367,9 +1287,10 @@ def transferir_saldo():
         usuario_id = session.get("user", {}).get("id")
         if not usuario_id:
             return jsonify({"success": False, "message": "Usuario no identificado"}), 401
-        response = requests.post(
+        response = cliente_backend.post(
             f"{API_URL}/api/persona/transferir-saldo", json={"id_persona": usuario_id}
         )
+        cache_cotizaciones.invalidar_usuario(usuario_id)
         if response.status_code == 200:
             return jsonify({"success": True, "message": "Saldo transferido correctamente"})
         return jsonify({"success": False, "message": "Error al transferir el saldo"}), 500
@@ -1385,15 +1306,15 @@ def metodos_pago_usuario():
         if not usuario_id:
             return jsonify({"error": "Usuario no autenticado"}), 401
         viaje_info = request.args.get("viajeInfo")
-        precio_original = 0
+        precio_unitario = 0
+        asientos = 0
         if viaje_info:
             viaje_info = json.loads(viaje_info)
-            precio_original = float(viaje_info.get("precio_unitario", 0)) * len(
-                viaje_info.get("asientos", [])
-            )
-        response = requests.get(f"{API_URL}/api/persona/lista/{usuario_id}")
-        if response.status_code == 200:
-            persona = response.json().get("persona", {})
+            precio_unitario = float(viaje_info.get("precio_unitario", 0))
+            asientos = len(viaje_info.get("asientos", []))
+        precio_original = precio_unitario * asientos
+        persona = personas_sesion.obtener(usuario_id)
+        if persona is not None:
             metodos_pago = []
             if persona.get("metodo_pago"):
                 metodo = persona["metodo_pago"]
@@ -1411,43 +1332,17 @@ def metodos_pago_usuario():
             else:
                 flash("No se encontraron métodos de pago", "info")
             tipo_tarifa = persona.get("tipo_tarifa", "General")
-            r_descuentos = requests.get(f"{API_URL}/api/descuento/lista")
-            descuentos_aplicables = []
-            porcentaje_total = 0
-            if r_descuentos.status_code == 200:
-                descuentos = r_descuentos.json().get("descuentos", [])
-                fecha_actual = datetime.now()
-                for d in descuentos:
-                    if d["tipo_descuento"] == tipo_tarifa and d["estado_descuento"] == "Activo":
-                        porcentaje_total += d["porcentaje"]
-                        descuentos_aplicables.append(
-                            {
-                                "nombre": d["nombre_descuento"],
-                                "porcentaje": d["porcentaje"],
-                                "tipo": "Tarifa Base",
-                            }
-                        )
-                for d in descuentos:
-                    if (
-                        d["tipo_descuento"] == "Promocional"
-                        and d["estado_descuento"] == "Activo"
-                        and "fecha_inicio" in d
-                        and "fecha_fin" in d
-                    ):
-                        fecha_inicio = datetime.strptime(d["fecha_inicio"], "%d/%m/%Y")
-                        fecha_fin = datetime.strptime(d["fecha_fin"], "%d/%m/%Y")
-                        if fecha_inicio <= fecha_actual <= fecha_fin:
-                            porcentaje_total += d["porcentaje"]
-                            descuentos_aplicables.append(
-                                {
-                                    "nombre": d["nombre_descuento"],
-                                    "porcentaje": d["porcentaje"],
-                                    "tipo": "Promocional",
-                                    "vigencia": f"Válido hasta {d['fecha_fin']}",
-                                }
-                            )
-            descuento_monto = precio_original * (porcentaje_total / 100)
-            precio_final = precio_original - descuento_monto
+            edad = motor_descuentos.actualizar()
+            if edad is not None:
+                agregar_edad(edad)
+            cotizacion = cache_cotizaciones.cotizacion(
+                usuario_id,
+                tipo_tarifa,
+                asientos,
+                precio_unitario,
+                datetime.now().date(),
+                lambda: motor_descuentos.cotizar(tipo_tarifa, precio_original),
+            )
             return jsonify(
                 {
                     "metodos": metodos_pago,
@@ -1457,11 +1352,7 @@ def metodos_pago_usuario():
                         "correo": persona.get("correo"),
                         "saldo_disponible": persona.get("saldo_disponible", 0),
                         "tipo_tarifa": tipo_tarifa.replace("_", " "),
-                        "descuentos_aplicables": descuentos_aplicables,
-                        "precio_original": precio_original,
-                        "precio_final": precio_final,
-                        "ahorro_total": descuento_monto,
-                        "porcentaje_descuento_total": porcentaje_total,
+                        **cotizacion,
                     },
                 }
             )
@@ -1472,100 +1363,37 @@ def metodos_pago_usuario():
 
 # Generacion de PDF
 
+def enviar_pdf(formato, boleto, nombre_archivo):
+    """Enviar el PDF del boleto desde memoria, con ETag y 304 si el cliente ya lo tiene"""
+    etag = huella(formato, boleto)
+    return responder_pdf(etag, lambda: generar_pdf(formato, boleto, etag), nombre_archivo)
+
+
+def responder_pdf(etag, generar, nombre_archivo):
+    """304 si el cliente ya tiene esa versión; si no, genera y envía el PDF"""
+    if etag in request.if_none_match:
+        response = make_response("", 304)
+        response.set_etag(etag)
+        return response
+    response = send_file(
+        io.BytesIO(generar()),
+        mimetype="application/pdf",
+        as_attachment=True,
+        download_name=nombre_archivo,
+        etag=etag,
+    )
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
 @router.route("/generar_pdf_boleto/<int:boleto_id>")
 def generar_boleto_pdf(boleto_id):
     try:
-        response = requests.get(f"{API_URL}/api/boleto/lista/{boleto_id}")
+        response = cliente_backend.get(f"{API_URL}/api/boleto/lista/{boleto_id}")
         if response.status_code != 200:
             return jsonify({"error": "Boleto no encontrado"}), 404
         boleto_data = response.json().get("boleto", {})
-        turno = boleto_data.get("turno", {})
-        horario = turno.get("horario", {})
-        ruta = horario.get("ruta", {})
-        bus = ruta.get("bus", {})
-        cooperativa = bus.get("cooperativa", {})
-        persona = boleto_data.get("persona", {})
-        pdf = FPDF("P", "mm", "A5")
-        pdf.add_page()
-        pdf.set_fill_color(122, 183, 48)
-        pdf.rect(0, 0, 148, 20, "F")
-        pdf.set_font("Arial", "B", 16)
-        pdf.set_text_color(255, 255, 255)
-        pdf.cell(130, 12, "BOLETO", 0, 1, "C")
-        pdf.set_draw_color(122, 183, 48)
-        pdf.rect(5, 25, 138, 155)
-        pdf.set_text_color(0, 0, 0)
-        pdf.set_font("Arial", "B", 11)
-        pdf.set_xy(10, 27)
-        pdf.cell(120, 8, f'Boleto N° {boleto_data.get("id_boleto", "N/A")}', 0, 1, "C")
-        pdf.line(5, 38, 143, 38)
-        pdf.set_xy(10, 40)
-        pdf.set_font("Arial", "B", 9)
-        pdf.cell(60, 5, "DETALLES DEL VIAJE", 0, 1)
-        pdf.set_font("Arial", "", 8)
-        detalles_izq = [
-            f'Fecha de compra: {boleto_data.get("fecha_compra")}',
-            f'Fecha de viaje: {turno.get("fecha_salida")}',
-            f'Hora de salida: {horario.get("hora_salida")}',
-            f'Origen: {ruta.get("origen")}',
-            f'Destino: {ruta.get("destino")}',
-            f'Estado: {boleto_data.get("estado_boleto")}',
-        ]
-        y = 46
-        for detalle in detalles_izq:
-            pdf.set_xy(12, y)
-            pdf.cell(65, 5, detalle)
-            y += 6
-        pdf.set_xy(75, 40)
-        pdf.set_font("Arial", "B", 9)
-        pdf.cell(65, 5, "INFORMACIÓN DEL BUS", 0, 1)
-        pdf.set_font("Arial", "", 8)
-        detalles_der = [
-            f'Cooperativa: {cooperativa.get("nombre_cooperativa")}',
-            f'N° de Bus: {bus.get("numero_bus")}',
-            f'Placa: {bus.get("placa")}',
-            f'N° de Asiento: {boleto_data.get("numero_asiento")}',
-            f'Precio: $ {boleto_data.get("precio_final", "0.00")}',
-            f'Modelo: {bus.get("modelo")}',
-        ]
-        y = 46
-        for detalle in detalles_der:
-            pdf.set_xy(77, y)
-            pdf.cell(65, 5, detalle)
-            y += 6
-        pdf.set_xy(10, 85)
-        pdf.set_font("Arial", "B", 9)
-        pdf.cell(128, 5, "DATOS DEL PASAJERO", 0, 1)
-        pdf.set_font("Arial", "", 8)
-        pdf.set_xy(12, 91)
-        pdf.multi_cell(
-            130,
-            5,
-            f'Nombre: {persona.get("nombre", "")} {persona.get("apellido", "")}\nIdentificación: {persona.get("numero_identificacion", "")}\nTeléfono: {persona.get("telefono", "")}',
-        )
-        qr = qrcode.QRCode(version=1, box_size=3)
-        qr_data = f'Boleto #{boleto_data.get("id_boleto")}\nPasajero: {persona.get("nombre")} {persona.get("apellido")}\nRuta: {ruta.get("origen")} - {ruta.get("destino")}'
-        qr.add_data(qr_data)
-        qr.make()
-        qr_img = qr.make_image()
-        qr_path = f"temp_qr_{boleto_id}.png"
-        qr_img.save(qr_path)
-        pdf.image(qr_path, x=55, y=110, w=35)
-        os.remove(qr_path)
-        pdf.set_y(155)
-        pdf.set_font("Arial", "I", 7)
-        pdf.multi_cell(
-            130,
-            3,
-            f"Este documento es válido únicamente para la fecha y hora indicadas.\nCooperativa de Transportes {cooperativa.get('nombre_cooperativa')}\nDirección: {cooperativa.get('direccion')}\nTeléfono: {cooperativa.get('telefono')}",
-            0,
-            "C",
-        )
-        pdf_output = pdf.output(dest="S").encode("latin-1")
-        response = make_response(pdf_output)
-        response.headers["Content-Type"] = "application/pdf"
-        response.headers["Content-Disposition"] = f"attachment; filename=boleto_{boleto_id}.pdf"
-        return response
+        return enviar_pdf("boleto", boleto_data, f"boleto_{boleto_id}.pdf")
     except Exception as e:
         return jsonify({"error": "Error generando el PDF"}), 500
 
@@ -1573,99 +1401,59 @@ def generar_boleto_pdf(boleto_id):
 @router.route("/generar_ticket/<int:boleto_id>")
 def generar_ticket_pdf(boleto_id):
     try:
-        response = requests.get(f"{API_URL}/api/boleto/lista/{boleto_id}")
+        response = cliente_backend.get(f"{API_URL}/api/boleto/lista/{boleto_id}")
         if response.status_code != 200:
             return jsonify({"error": "Boleto no encontrado"}), 404
         boleto = response.json().get("boleto", {})
-        turno = boleto.get("turno", {})
-        horario = turno.get("horario", {})
-        ruta = horario.get("ruta", {})
-        bus = ruta.get("bus", {})
-        cooperativa = bus.get("cooperativa", {})
-        persona = boleto.get("persona", {})
-        pdf = FPDF("P", "mm", (80, 160))
-        pdf.add_page()
-        pdf.set_fill_color(122, 183, 48)
-        pdf.rect(0, 0, 80, 15, "F")
-        pdf.set_text_color(255, 255, 255)
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(55, 2, f'{cooperativa.get("nombre_cooperativa", "").upper()}', 0, 1, "C")
-        pdf.set_text_color(0, 0, 0)
-        pdf.set_font("Arial", "B", 11)
-        pdf.cell(55, 12, f'TICKET #{boleto.get("id_boleto", "N/A")}', 0, 1, "C")
-        pdf.set_draw_color(122, 183, 48)
-        pdf.line(5, pdf.get_y(), 75, pdf.get_y())
-        pdf.ln(2)
-        pdf.set_font("Arial", "B", 9)
-        pdf.cell(80, 5, "DETALLES DEL VIAJE:", 0, 1, "L")
-        pdf.set_font("Arial", "", 8)
-        detalles = [
-            f'Fecha: {turno.get("fecha_salida")}',
-            f'Hora: {horario.get("hora_salida")}',
-            f'Origen: {ruta.get("origen")}',
-            f'Destino: {ruta.get("destino")}',
-        ]
-        for detalle in detalles:
-            pdf.cell(80, 4, detalle, 0, 1, "L")
-        pdf.ln(2)
-        pdf.line(5, pdf.get_y(), 75, pdf.get_y())
-        pdf.ln(2)
-        pdf.set_font("Arial", "B", 9)
-        pdf.cell(80, 5, "PASAJERO:", 0, 1, "L")
-        pdf.set_font("Arial", "", 8)
-        pasajero = [
-            f'Nombre: {persona.get("nombre")} {persona.get("apellido")}',
-            f'ID: {persona.get("numero_identificacion")}',
-        ]
-        for dato in pasajero:
-            pdf.cell(80, 4, dato, 0, 1, "L")
-        pdf.ln(2)
-        pdf.line(5, pdf.get_y(), 75, pdf.get_y())
-        pdf.ln(2)
-        pdf.set_font("Arial", "B", 9)
-        pdf.cell(80, 5, "DETALLES DEL SERVICIO:", 0, 1, "L")
-        pdf.set_font("Arial", "", 8)
-        servicio = [
-            f'Bus #: {bus.get("numero_bus")}',
-            f'Asiento: {boleto.get("numero_asiento")}',
-            f'Precio: $ {boleto.get("precio_final")}',
-        ]
-        for detalle in servicio:
-            pdf.cell(80, 4, detalle, 0, 1, "L")
-        qr = qrcode.QRCode(version=1, box_size=2)
-        qr_data = (
-            f'Ticket #{boleto.get("id_boleto")}\n'
-            f'Ruta: {ruta.get("origen")} - {ruta.get("destino")}\n'
-            f'Fecha: {turno.get("fecha_salida")}'
-        )
-        qr.add_data(qr_data)
-        qr.make()
-        qr_img = qr.make_image()
-        qr_path = f"temp_qr_ticket_{boleto_id}.png"
-        qr_img.save(qr_path)
-        pdf.image(qr_path, x=25, y=95, w=30)
-        os.remove(qr_path)
-        pdf.set_y(125)
-        pdf.set_font("Arial", "I", 4)
-        pdf.multi_cell(
-            60,
-            2,
-            f'Tel: {cooperativa.get("telefono")}\n'
-            f'{cooperativa.get("direccion")}\n'
-            f"¡Gracias por viajar con nosotros!\n"
-            f"Válido solo para la fecha y hora indicadas",
-            0,
-            "C",
-        )
-        pdf_output = pdf.output(dest="S").encode("latin-1")
-        response = make_response(pdf_output)
-        response.headers["Content-Type"] = "application/pdf"
-        response.headers["Content-Disposition"] = f"attachment; filename=ticket_{boleto_id}.pdf"
-        return response
+        return enviar_pdf("ticket", boleto, f"ticket_{boleto_id}.pdf")
     except Exception as e:
         return jsonify({"error": "Error generando el ticket"}), 500
 
 
+# Máximo de boletos por documento combinado
+MAX_BOLETOS_LOTE = 50
+
+
+def obtener_boletos(usuario_id, ids):
+    """Boletos del usuario con esos ids, en el orden pedido, desde el índice por persona.
+
+    Los ids que no son del usuario simplemente no aparecen: nunca se recorre
+    /api/boleto/lista ni se entregan boletos de otros pasajeros.
+    """
+    encontrados = {}
+    for boleto in indice_boletos.de_persona(usuario_id):
+        if boleto.get("id_boleto") in ids:
+            encontrados[boleto["id_boleto"]] = boleto
+    return [encontrados[i] for i in ids if i in encontrados]
+
+
+@router.route("/generar_pdf_boletos")
+@requiere_iniciar
+def generar_boletos_pdf():
+    """Un solo PDF con una página por boleto: /generar_pdf_boletos?ids=1,2,3[&formato=ticket]"""
+    formato = request.args.get("formato", "boleto")
+    if formato not in ("boleto", "ticket"):
+        return jsonify({"error": "Formato no soportado"}), 400
+    try:
+        ids = list(dict.fromkeys(int(i) for i in request.args.get("ids", "").split(",") if i.strip()))
+    except ValueError:
+        return jsonify({"error": "Lista de boletos inválida"}), 400
+    if not ids or len(ids) > MAX_BOLETOS_LOTE:
+        return jsonify({"error": f"Indique entre 1 y {MAX_BOLETOS_LOTE} boletos"}), 400
+    try:
+        boletos = obtener_boletos(session["user"].get("id"), ids)
+        faltantes = sorted(set(ids) - {b["id_boleto"] for b in boletos})
+        if faltantes:
+            return jsonify({"error": "Boletos no encontrados", "faltantes": faltantes}), 404
+        etag = huella_lote(formato, boletos)
+        return responder_pdf(
+            etag, lambda: generar_pdf_lote(formato, boletos, etag), f"{formato}s_{len(boletos)}.pdf"
+        )
+    except Exception as e:
+        log.exception("pdf_lote_error", error=str(e))
+        return jsonify({"error": "Error generando el PDF"}), 500
+
+
 # CRUD de Cooperativas
 
 
@@ -1674,29 +1462,28 @@ def generar_ticket_pdf(boleto_id):
 def lista_cooperativa():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/cooperativa/lista")
-        print("[lista_cooperativa] status_code:", r.status_code)
-        print("[lista_cooperativa] response text:", r.text)
+        r = cliente_backend.get(f"{API_URL}/api/cooperativa/lista")
         if r.status_code == 200:
             try:
                 data = r.json()
-                print("[lista_cooperativa] data:", data)
+                log.debug("lista_cooperativa", estado=r.status_code, cooperativas=data.get("cooperativas"))
                 return render_template(
                     "crud/cooperativa/cooperativa.html",
                     lista=data.get("cooperativas", []),
                     usuario=usuario,
                 )
             except json.JSONDecodeError as je:
-                print("[lista_cooperativa] JSONDecodeError:", je)
+                log.warning("lista_cooperativa_json", error=str(je), respuesta=resumen_respuesta(r))
                 flash("Error al decodificar la respuesta del servidor", "error")
                 return render_template(
                     "crud/cooperativa/cooperativa.html", lista=[], usuario=usuario
                 )
         else:
+            log.warning("lista_cooperativa", estado=r.status_code, respuesta=resumen_respuesta(r))
             flash(f"Error del servidor: {r.status_code}", "error")
             return render_template("crud/cooperativa.html", lista=[], usuario=usuario)
     except requests.exceptions.RequestException as e:
-        print("[lista_cooperativa] RequestException:", e)
+        log.error("lista_cooperativa_conexion", error=str(e))
         flash(f"Error de conexión: {str(e)}", "error")
         return render_template("crud/cooperativa/cooperativa.html", lista=[], usuario=usuario)
 
@@ -1711,7 +1498,7 @@ def crear_cooperativa():
             ruc = request.form.get("ruc")
             telefono = request.form.get("telefono")
             correo = request.form.get("correo_empresarial")
-            r_cooperativas = requests.get(f"{API_URL}/api/cooperativa/lista")
+            r_cooperativas = cliente_backend.get(f"{API_URL}/api/cooperativa/lista")
             cooperativas = r_cooperativas.json().get("cooperativas", [])
             for coop in cooperativas:
                 if coop["nombre_cooperativa"].lower() == nombre.lower():
@@ -1747,7 +1534,7 @@ def crear_cooperativa():
                 "telefono": telefono,
                 "correo_empresarial": correo,
             }
-            response = requests.post(f"{API_URL}/api/cooperativa/guardar", json=datos)
+            response = cliente_backend.post(f"{API_URL}/api/cooperativa/guardar", json=datos)
             if response.status_code == 200:
                 flash("Cooperativa creada exitosamente", "success")
                 return redirect(url_for("router.lista_cooperativa"))
@@ -1773,7 +1560,7 @@ def editar_cooperativa(id):
             ruc = request.form.get("ruc")
             telefono = request.form.get("telefono")
             correo = request.form.get("correo_empresarial")
-            r_cooperativas = requests.get(f"{API_URL}/api/cooperativa/lista")
+            r_cooperativas = cliente_backend.get(f"{API_URL}/api/cooperativa/lista")
             cooperativas = r_cooperativas.json().get("cooperativas", [])
             for coop in cooperativas:
                 if coop["id_cooperativa"] != id:
@@ -1845,7 +1632,7 @@ def editar_cooperativa(id):
                 "telefono": telefono,
                 "correo_empresarial": correo,
             }
-            response = requests.put(f"{API_URL}/api/cooperativa/actualizar", json=datos)
+            response = cliente_backend.put(f"{API_URL}/api/cooperativa/actualizar", json=datos)
             if response.status_code == 200:
                 flash("Cooperativa actualizada exitosamente", "success")
                 return redirect(url_for("router.lista_cooperativa"))
@@ -1856,7 +1643,7 @@ def editar_cooperativa(id):
             flash(f"Error: {str(e)}", "error")
             return redirect(url_for("router.lista_cooperativa"))
     try:
-        r = requests.get(f"{API_URL}/api/cooperativa/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/cooperativa/lista/{id}")
         if r.status_code == 200:
             cooperativa = r.json().get("cooperativa")
             return render_template(
@@ -1873,7 +1660,7 @@ def editar_cooperativa(id):
 @router.route("/cooperativa/eliminar/<int:id>", methods=["POST"])
 def eliminar_cooperativa(id):
     try:
-        r = requests.delete(f"{API_URL}/api/cooperativa/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/cooperativa/eliminar/{id}")
         if r.status_code == 200:
             flash("Cooperativa eliminada correctamente", "success")
         else:
@@ -1888,7 +1675,7 @@ def eliminar_cooperativa(id):
 @router.route("/cooperativa/ordenar/<atributo>/<orden>")
 def ordenar_cooperativa(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/cooperativa/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/cooperativa/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -1901,7 +1688,7 @@ def ordenar_cooperativa(atributo, orden):
 @router.route("/cooperativa/buscar/<atributo>/<criterio>")
 def buscar_cooperativa(atributo, criterio):
     try:
-        response = requests.get(
+        response = cliente_backend.get(
             f"{API_URL}/api/cooperativa/buscar/{atributo}/{criterio}"
         )
         if response.status_code == 200:
@@ -1918,28 +1705,26 @@ def buscar_cooperativa(atributo, criterio):
 @router.route("/bus/lista")
 #@requiere_administrador
 def lista_bus():
-    print("Entrando a lista_bus admin de router") 
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/bus/lista")
-        print("[lista_bus] status_code:", r.status_code)
-        print("[lista_bus] response text:", r.text)
+        r = cliente_backend.get(f"{API_URL}/api/bus/lista")
         if r.status_code == 200:
             try:
                 data = r.json()
-                print("[lista_bus] data:", data)
+                log.debug("lista_bus", estado=r.status_code, buses=data.get("buses"))
                 return render_template(
                     "crud/bus/bus.html", lista=data.get("buses", []), usuario=usuario
                 )
             except json.JSONDecodeError as je:
-                print("[lista_bus] JSONDecodeError:", je)
+                log.warning("lista_bus_json", error=str(je), respuesta=resumen_respuesta(r))
                 flash("Error al decodificar la respuesta del servidor", "error")
                 return render_template("crud/bus/bus.html", lista=[], usuario=usuario)
         else:
+            log.warning("lista_bus", estado=r.status_code, respuesta=resumen_respuesta(r))
             flash(f"Error del servidor: {r.status_code}", "error")
             return render_template("crud/bus/bus.html", lista=[], usuario=usuario)
     except requests.exceptions.RequestException as e:
-        print("[lista_bus] RequestException:", e)
+        log.error("lista_bus_conexion", error=str(e))
         flash(f"Error de conexión: {str(e)}", "error")
         return render_template("crud/bus/bus.html", lista=[], usuario=usuario)
 
@@ -1949,9 +1734,9 @@ def lista_bus():
 def crear_bus():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/cooperativa/lista")
+        r = cliente_backend.get(f"{API_URL}/api/cooperativa/lista")
         cooperativas = r.json().get("cooperativas", []) if r.status_code == 200 else []
-        r_buses = requests.get(f"{API_URL}/api/bus/lista")
+        r_buses = cliente_backend.get(f"{API_URL}/api/bus/lista")
         buses = r_buses.json().get("buses", []) if r_buses.status_code == 200 else []
         ultimo_numero = max([bus.get("numero_bus", 0) for bus in buses], default=0)
         siguiente_numero = ultimo_numero + 1
@@ -1960,7 +1745,7 @@ def crear_bus():
         flash("Error al cargar las cooperativas", "error")
     if request.method == "POST":
         try:
-            r_buses = requests.get(f"{API_URL}/api/bus/lista")
+            r_buses = cliente_backend.get(f"{API_URL}/api/bus/lista")
             buses = r_buses.json().get("buses", [])
             numero = request.form.get("numero_bus")
             placa = request.form.get("placa")
@@ -1994,7 +1779,7 @@ def crear_bus():
                 "estado_bus": request.form["estado_bus"],
                 "cooperativa_id": request.form["cooperativa_id"],
             }
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/bus/guardar", headers=headers, json=data, timeout=5
             )
             if r.status_code == 200:
@@ -2024,16 +1809,15 @@ def editar_bus(id):
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_buses = requests.get(f"{API_URL}/api/bus/lista")
+            r_buses = cliente_backend.get(f"{API_URL}/api/bus/lista")
             buses = r_buses.json().get("buses", [])
             numero_bus = request.form["numero_bus"]
             placa = request.form["placa"].upper()
             for bus in buses:
                 if bus["id_bus"] != id:
                     if str(bus["numero_bus"]) == numero_bus:
-                        r = requests.get(f"{API_URL}/api/bus/lista/{id}")
+                        r, r_coop = obtener_en_paralelo(f"/api/bus/lista/{id}", "/api/cooperativa/lista")
                         bus_actual = r.json().get("bus")
-                        r_coop = requests.get(f"{API_URL}/api/cooperativa/lista")
                         cooperativas = r_coop.json().get("cooperativas", [])
                         return render_template(
                             "crud/bus/bus_editar.html",
@@ -2043,9 +1827,8 @@ def editar_bus(id):
                             error="El número de bus ya existe",
                         )
                     if bus["placa"].upper() == placa:
-                        r = requests.get(f"{API_URL}/api/bus/lista/{id}")
+                        r, r_coop = obtener_en_paralelo(f"/api/bus/lista/{id}", "/api/cooperativa/lista")
                         bus_actual = r.json().get("bus")
-                        r_coop = requests.get(f"{API_URL}/api/cooperativa/lista")
                         cooperativas = r_coop.json().get("cooperativas", [])
                         return render_template(
                             "crud/bus/bus_editar.html",
@@ -2066,7 +1849,7 @@ def editar_bus(id):
                 "estado_bus": request.form["estado_bus"],
                 "cooperativa_id": request.form["cooperativa_id"],
             }
-            r = requests.put(f"{API_URL}/api/bus/actualizar", headers=headers, json=data)
+            r = cliente_backend.put(f"{API_URL}/api/bus/actualizar", headers=headers, json=data)
             if r.status_code == 200:
                 flash("Bus actualizado correctamente", "success")
                 return redirect(url_for("router.lista_bus"))
@@ -2077,9 +1860,8 @@ def editar_bus(id):
             error_msg = f"Error de conexión: {str(e)}"
             flash(error_msg, "error")
     try:
-        r = requests.get(f"{API_URL}/api/bus/lista/{id}")
+        r, r_coop = obtener_en_paralelo(f"/api/bus/lista/{id}", "/api/cooperativa/lista")
         bus = r.json().get("bus") if r.status_code == 200 else None
-        r_coop = requests.get(f"{API_URL}/api/cooperativa/lista")
         cooperativas = r_coop.json().get("cooperativas", []) if r_coop.status_code == 200 else []
         if bus:
             return render_template(
@@ -2096,7 +1878,7 @@ def editar_bus(id):
 @router.route("/bus/eliminar/<int:id>", methods=["POST"])
 def eliminar_bus(id):
     try:
-        r = requests.delete(f"{API_URL}/api/bus/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/bus/eliminar/{id}")
         if r.status_code == 200:
             flash("Bus eliminado correctamente", "success")
         else:
@@ -2110,7 +1892,7 @@ def eliminar_bus(id):
 @router.route("/bus/ordenar/<atributo>/<orden>")
 def ordenar_bus(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/bus/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/bus/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -2122,7 +1904,7 @@ def ordenar_bus(atributo, orden):
 @router.route("/bus/buscar/<atributo>/<criterio>")
 def buscar_bus(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/bus/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/bus/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2138,7 +1920,7 @@ def buscar_bus(atributo, criterio):
 def lista_ruta():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/ruta/lista")
+        r = cliente_backend.get(f"{API_URL}/api/ruta/lista")
         if r.status_code == 200:
             try:
                 data = r.json()
@@ -2176,14 +1958,14 @@ def lista_ruta():
 def crear_ruta():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/bus/lista")
+        r = cliente_backend.get(f"{API_URL}/api/bus/lista")
         buses = r.json().get("buses", []) if r.status_code == 200 else []
     except:
         buses = []
         flash("Error al cargar los buses", "error")
     if request.method == "POST":
         try:
-            r_rutas = requests.get(f"{API_URL}/api/ruta/lista")
+            r_rutas = cliente_backend.get(f"{API_URL}/api/ruta/lista")
             rutas = r_rutas.json().get("rutas", [])
             origen = request.form["origen"]
             destino = request.form["destino"]
@@ -2225,7 +2007,7 @@ def crear_ruta():
                     }
                     data["escalas"].append(escala)
                 i += 1
-            r = requests.post(f"{API_URL}/api/ruta/guardar", headers=headers, json=data)
+            r = cliente_backend.post(f"{API_URL}/api/ruta/guardar", headers=headers, json=data)
             if r.status_code == 200:
                 flash("Ruta creada correctamente", "success")
                 return redirect(url_for("router.lista_ruta"))
@@ -2243,9 +2025,9 @@ def editar_ruta(id):
     usuario = obtener_info_usuario()
     if request.method == "GET":
         try:
-            r = requests.get(f"{API_URL}/api/ruta/lista/{id}")
+            r = cliente_backend.get(f"{API_URL}/api/ruta/lista/{id}")
             ruta = r.json().get("ruta") if r.status_code == 200 else None
-            r_bus = requests.get(f"{API_URL}/api/bus/lista")
+            r_bus = cliente_backend.get(f"{API_URL}/api/bus/lista")
             buses = r_bus.json().get("buses", []) if r_bus.status_code == 200 else []
             if ruta:
                 escalas = ruta.get("escalas", [])
@@ -2267,13 +2049,13 @@ def editar_ruta(id):
             return redirect(url_for("router.lista_ruta"))
     elif request.method == "POST":
         try:
-            r = requests.get(f"{API_URL}/api/ruta/lista/{id}")
+            r = cliente_backend.get(f"{API_URL}/api/ruta/lista/{id}")
             ruta_actual = r.json().get("ruta") if r.status_code == 200 else None
-            r_bus = requests.get(f"{API_URL}/api/bus/lista")
+            r_bus = cliente_backend.get(f"{API_URL}/api/bus/lista")
             buses = r_bus.json().get("buses", []) if r_bus.status_code == 200 else []
 
             if request.method == "POST":
-                r_rutas = requests.get(f"{API_URL}/api/ruta/lista")
+                r_rutas = cliente_backend.get(f"{API_URL}/api/ruta/lista")
                 rutas = r_rutas.json().get("rutas", [])
                 origen = request.form.get("origen", "").strip()
                 destino = request.form.get("destino", "").strip()
@@ -2321,7 +2103,7 @@ def editar_ruta(id):
                         escalas.append(escala)
             if escalas:
                 datos_ruta["escalas"] = escalas
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/ruta/actualizar",
                 headers={"Content-Type": "application/json"},
                 json=datos_ruta,
@@ -2341,7 +2123,7 @@ def editar_ruta(id):
 @router.route("/ruta/eliminar/<int:id>", methods=["POST"])
 def eliminar_ruta(id):
     try:
-        r = requests.delete(f"{API_URL}/api/ruta/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/ruta/eliminar/{id}")
         if r.status_code == 200:
             flash("Ruta eliminada correctamente", "success")
         else:
@@ -2355,7 +2137,7 @@ def eliminar_ruta(id):
 @router.route("/ruta/ordenar/<atributo>/<orden>")
 def ordenar_ruta(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/ruta/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/ruta/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             rutas = response.json().get("rutas", [])
             for ruta in rutas:
@@ -2382,7 +2164,7 @@ def ordenar_ruta(atributo, orden):
 @router.route("/ruta/buscar/<atributo>/<criterio>")
 def buscar_ruta(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/ruta/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/ruta/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2399,7 +2181,7 @@ def buscar_ruta(atributo, criterio):
 def lista_escala():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/escala/lista")
+        r = cliente_backend.get(f"{API_URL}/api/escala/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -2423,7 +2205,7 @@ def crear_escala():
                 "lugar_escala": request.form["lugar_escala"],
                 "tiempo": request.form["tiempo"],
             }
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/escala/guardar", headers=headers, json=data, timeout=5
             )
             if r.status_code == 200:
@@ -2439,7 +2221,7 @@ def crear_escala():
             error_msg = f"Error en la petición: {str(e)}"
             flash(error_msg, "error")
     try:
-        r = requests.get(f"{API_URL}/api/ruta/lista")
+        r = cliente_backend.get(f"{API_URL}/api/ruta/lista")
         rutas = r.json().get("rutas", []) if r.status_code == 200 else []
     except:
         rutas = []
@@ -2457,7 +2239,7 @@ def editar_escala(id):
                 "lugar_escala": request.form["lugar_escala"],
                 "tiempo": request.form["tiempo"],
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/escala/actualizar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -2470,7 +2252,7 @@ def editar_escala(id):
         except requests.exceptions.RequestException as e:
             flash(f"Error de conexión: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/escala/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/escala/lista/{id}")
         escala = r.json().get("escala") if r.status_code == 200 else None
         if escala:
             return render_template("crud/escala/escala_editar.html", escala=escala, usuario=usuario)
@@ -2484,7 +2266,7 @@ def editar_escala(id):
 @router.route("/escala/eliminar/<int:id>", methods=["POST"])
 def eliminar_escala(id):
     try:
-        r = requests.delete(f"{API_URL}/api/escala/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/escala/eliminar/{id}")
         if r.status_code == 200:
             flash("Escala eliminada correctamente", "success")
             return redirect(url_for("router.lista_escala"))
@@ -2497,7 +2279,7 @@ def eliminar_escala(id):
 @router.route("/escala/ordenar/<atributo>/<orden>")
 def ordenar_escala(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/escala/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/escala/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -2509,7 +2291,7 @@ def ordenar_escala(atributo, orden):
 @router.route("/escala/buscar/<atributo>/<criterio>")
 def buscar_escala(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/escala/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/escala/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2526,7 +2308,7 @@ def buscar_escala(atributo, criterio):
 def lista_horario():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/horario/lista")
+        r = cliente_backend.get(f"{API_URL}/api/horario/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -2545,7 +2327,7 @@ def lista_horario():
 def crear_horario():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/ruta/lista")
+        r = cliente_backend.get(f"{API_URL}/api/ruta/lista")
         rutas = r.json().get("rutas", []) if r.status_code == 200 else []
     except:
         rutas = []
@@ -2555,7 +2337,7 @@ def crear_horario():
             hora_salida = request.form["hora_salida"]
             hora_llegada = request.form["hora_llegada"]
             ruta_id = int(request.form["ruta_id"])
-            r_horarios = requests.get(f"{API_URL}/api/horario/lista")
+            r_horarios = cliente_backend.get(f"{API_URL}/api/horario/lista")
             horarios = r_horarios.json().get("horarios", [])
             hora_salida_nueva = sum(x * int(t) for x, t in zip([60, 1], hora_salida.split(":")))
             hora_llegada_nueva = sum(x * int(t) for x, t in zip([60, 1], hora_llegada.split(":")))
@@ -2589,7 +2371,7 @@ def crear_horario():
                 "estado_horario": request.form["estado_horario"],
                 "ruta": {"id_ruta": ruta_id},
             }
-            response = requests.post(f"{API_URL}/api/horario/guardar", json=data)
+            response = cliente_backend.post(f"{API_URL}/api/horario/guardar", json=data)
             if response.status_code == 200:
                 flash("Horario creado correctamente", "success")
                 return redirect(url_for("router.lista_horario"))
@@ -2605,9 +2387,9 @@ def crear_horario():
 def editar_horario(id):
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/horario/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/horario/lista/{id}")
         horario = r.json().get("horario") if r.status_code == 200 else None
-        r_rutas = requests.get(f"{API_URL}/api/ruta/lista")
+        r_rutas = cliente_backend.get(f"{API_URL}/api/ruta/lista")
         rutas = r_rutas.json().get("rutas", []) if r_rutas.status_code == 200 else []
     except requests.exceptions.RequestException as e:
         flash(f"Error de conexión: {str(e)}", "error")
@@ -2617,7 +2399,7 @@ def editar_horario(id):
                 hora_salida = request.form["hora_salida"]
                 hora_llegada = request.form["hora_llegada"]
                 ruta_id = int(request.form["ruta_id"])
-                r_horarios = requests.get(f"{API_URL}/api/horario/lista")
+                r_horarios = cliente_backend.get(f"{API_URL}/api/horario/lista")
                 horarios = r_horarios.json().get("horarios", [])
                 hora_salida_nueva = sum(x * int(t) for x, t in zip([60, 1], hora_salida.split(":")))
                 hora_llegada_nueva = sum(
@@ -2657,7 +2439,7 @@ def editar_horario(id):
                         "estado_horario": request.form["estado_horario"],
                         "ruta": {"id_ruta": ruta_id},
                     }
-                    r = requests.put(
+                    r = cliente_backend.put(
                         f"{API_URL}/api/horario/actualizar",
                         headers={"Content-Type": "application/json"},
                         json=data,
@@ -2682,7 +2464,7 @@ def editar_horario(id):
 @router.route("/horario/eliminar/<int:id>", methods=["POST"])
 def eliminar_horario(id):
     try:
-        r = requests.delete(f"{API_URL}/api/horario/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/horario/eliminar/{id}")
         if r.status_code == 200:
             flash("Horario eliminado correctamente", "success")
         else:
@@ -2695,7 +2477,7 @@ def eliminar_horario(id):
 @router.route("/horario/ordenar/<atributo>/<orden>")
 def ordenar_horario(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/horario/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/horario/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -2708,7 +2490,7 @@ def ordenar_horario(atributo, orden):
 @router.route("/horario/buscar/<atributo>/<criterio>")
 def buscar_horario(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/horario/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/horario/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2724,7 +2506,7 @@ def buscar_horario(atributo, criterio):
 def lista_turno():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/turno/lista")
+        r = cliente_backend.get(f"{API_URL}/api/turno/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -2743,9 +2525,9 @@ def lista_turno():
 def crear_turno():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/horario/lista")
+        r = cliente_backend.get(f"{API_URL}/api/horario/lista")
         horarios = r.json().get("horarios", []) if r.status_code == 200 else []
-        r_turno = requests.get(f"{API_URL}/api/turno/lista")
+        r_turno = cliente_backend.get(f"{API_URL}/api/turno/lista")
         turnos = r_turno.json().get("turnos", []) if r_turno.status_code == 200 else []
         ultimo_numero = 0
         for turno in turnos:
@@ -2782,8 +2564,8 @@ def crear_turno():
                     "estado_turno": request.form.get("estado_turno", "Disponible"),
                     "horario": {"id_horario": horario_id},
                 }
-                print("data", data)
-                r = requests.post(
+                log.debug("guardar_turno", datos=data)
+                r = cliente_backend.post(
                     f"{API_URL}/api/turno/guardar",
                     headers={"Content-Type": "application/json"},
                     json=data,
@@ -2811,7 +2593,7 @@ def editar_turno(id):
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_turnos = requests.get(f"{API_URL}/api/turno/lista")
+            r_turnos = cliente_backend.get(f"{API_URL}/api/turno/lista")
             turnos = r_turnos.json().get("turnos", [])
             numero_turno = int(request.form["numero_turno"])
             fecha_salida = request.form.get("fecha_salida")
@@ -2819,9 +2601,8 @@ def editar_turno(id):
             for turno in turnos:
                 if turno.get("numero_turno") == numero_turno and turno.get("id_turno") != id:
                     estados_turno = ["Disponible", "Cancelado", "Agotado"]
-                    r = requests.get(f"{API_URL}/api/turno/lista/{id}")
+                    r, r_horarios = obtener_en_paralelo(f"/api/turno/lista/{id}", "/api/horario/lista")
                     turno = r.json().get("turno") if r.status_code == 200 else None
-                    r_horarios = requests.get(f"{API_URL}/api/horario/lista")
                     horarios = (
                         r_horarios.json().get("horarios", [])
                         if r_horarios.status_code == 200
@@ -2845,9 +2626,8 @@ def editar_turno(id):
                         and turno.get("horario", {}).get("id_horario") == horario_id
                     ):
                         estados_turno = ["Disponible", "Cancelado", "Agotado"]
-                        r = requests.get(f"{API_URL}/api/turno/lista/{id}")
+                        r, r_horarios = obtener_en_paralelo(f"/api/turno/lista/{id}", "/api/horario/lista")
                         turno = r.json().get("turno") if r.status_code == 200 else None
-                        r_horarios = requests.get(f"{API_URL}/api/horario/lista")
                         horarios = (
                             r_horarios.json().get("horarios", [])
                             if r_horarios.status_code == 200
@@ -2871,7 +2651,7 @@ def editar_turno(id):
                 "estado_turno": request.form["estado_turno"],
                 "horario": {"id_horario": horario_id},
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/turno/actualizar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -2885,9 +2665,8 @@ def editar_turno(id):
             flash(f"Error de conexión: {str(e)}", "error")
     try:
         estados_turno = ["Disponible", "Cancelado", "Agotado"]
-        r = requests.get(f"{API_URL}/api/turno/lista/{id}")
+        r, r_horarios = obtener_en_paralelo(f"/api/turno/lista/{id}", "/api/horario/lista")
         turno = r.json().get("turno") if r.status_code == 200 else None
-        r_horarios = requests.get(f"{API_URL}/api/horario/lista")
         horarios = r_horarios.json().get("horarios", []) if r_horarios.status_code == 200 else []
         if turno and turno.get("fecha_salida"):
             try:
@@ -2913,7 +2692,7 @@ def editar_turno(id):
 @router.route("/turno/eliminar/<int:id>", methods=["POST"])
 def eliminar_turno(id):
     try:
-        r = requests.delete(f"{API_URL}/api/turno/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/turno/eliminar/{id}")
         if r.status_code == 200:
             flash("Turno eliminado correctamente", "success")
         else:
@@ -2926,7 +2705,7 @@ def eliminar_turno(id):
 @router.route("/turno/ordenar/<atributo>/<orden>")
 def ordenar_turno(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/turno/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/turno/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -2938,7 +2717,7 @@ def ordenar_turno(atributo, orden):
 @router.route("/turno/buscar/<atributo>/<criterio>")
 def buscar_turno(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/turno/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/turno/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2955,7 +2734,7 @@ def buscar_turno(atributo, criterio):
 def lista_frecuencia():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/frecuencia/lista")
+        r = cliente_backend.get(f"{API_URL}/api/frecuencia/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -2982,7 +2761,7 @@ def crear_frecuencia():
                 "precio_recorrido": float(request.form["precio_recorrido"]),
                 "horario": {"id_horario": int(request.form["horario_id"])},
             }
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/frecuencia/guardar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -2995,7 +2774,7 @@ def crear_frecuencia():
         except requests.exceptions.RequestException as e:
             flash(f"Error de conexión: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/horario/lista")
+        r = cliente_backend.get(f"{API_URL}/api/horario/lista")
         horarios = r.json().get("horarios", []) if r.status_code == 200 else []
     except:
         horarios = []
@@ -3017,7 +2796,7 @@ def editar_frecuencia(id):
                 "precio_recorrido": float(request.form["precio_recorrido"]),
                 "horario": {"id_horario": int(request.form["horario_id"])},
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/frecuencia/actualizar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -3030,9 +2809,9 @@ def editar_frecuencia(id):
         except requests.exceptions.RequestException as e:
             flash(f"Error de conexión: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/frecuencia/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/frecuencia/lista/{id}")
         frecuencia = r.json().get("frecuencia") if r.status_code == 200 else None
-        r_horarios = requests.get(f"{API_URL}/api/horario/lista")
+        r_horarios = cliente_backend.get(f"{API_URL}/api/horario/lista")
         horarios = r_horarios.json().get("horarios", []) if r_horarios.status_code == 200 else []
         if frecuencia:
             return render_template(
@@ -3052,7 +2831,7 @@ def editar_frecuencia(id):
 @router.route("/frecuencia/eliminar/<int:id>", methods=["POST"])
 def eliminar_frecuencia(id):
     try:
-        r = requests.delete(f"{API_URL}/api/frecuencia/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/frecuencia/eliminar/{id}")
         if r.status_code == 200:
             flash("Frecuencia eliminada correctamente", "success")
         else:
@@ -3065,7 +2844,7 @@ def eliminar_frecuencia(id):
 @router.route("/frecuencia/ordenar/<atributo>/<orden>")
 def ordenar_frecuencia(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/frecuencia/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/frecuencia/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -3078,7 +2857,7 @@ def ordenar_frecuencia(atributo, orden):
 @router.route("/frecuencia/buscar/<atributo>/<criterio>")
 def buscar_frecuencia(atributo, criterio):
     try:
-        response = requests.get(
+        response = cliente_backend.get(
             f"{API_URL}/api/frecuencia/buscar/{atributo}/{criterio}"
         )
         if response.status_code == 200:
@@ -3096,7 +2875,7 @@ def buscar_frecuencia(atributo, criterio):
 def lista_persona():
     try:
         usuario = obtener_info_usuario()
-        r = requests.get(f"{API_URL}/api/persona/lista")
+        r = cliente_backend.get(f"{API_URL}/api/persona/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -3116,63 +2895,63 @@ def crear_persona():
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_personas = requests.get(f"{API_URL}/api/persona/lista")
-            personas = r_personas.json().get("personas", [])
             numero_identificacion = request.form.get("numero_identificacion").strip()
             correo = request.form.get("correo").strip()
             telefono = request.form.get("telefono").strip()
-            for persona in personas:
-                if persona.get("numero_identificacion") == numero_identificacion:
-                    return render_template(
-                        "crud/persona/persona_crear.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este número de identificación",
-                    )
-                if persona.get("correo") == correo:
-                    return render_template(
-                        "crud/persona/persona_crear.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este correo electrónico",
-                    )
-                if persona.get("telefono") == telefono:
-                    return render_template(
-                        "crud/persona/persona_crear.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este número de teléfono",
-                    )
+            conflicto = indice_personas.conflicto(
+                numero_identificacion=numero_identificacion, correo=correo, telefono=telefono
+            )
+            if conflicto == "numero_identificacion":
+                return render_template(
+                    "crud/persona/persona_crear.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este número de identificación",
+                )
+            if conflicto == "correo":
+                return render_template(
+                    "crud/persona/persona_crear.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este correo electrónico",
+                )
+            if conflicto == "telefono":
+                return render_template(
+                    "crud/persona/persona_crear.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este número de teléfono",
+                )
             data = {
                 "tipo_identificacion": request.form["tipo_identificacion"],
                 "numero_identificacion": request.form["numero_identificacion"],
@@ -3211,7 +2990,7 @@ def crear_persona():
                             "saldo": request.form["saldo"],
                         }
                     )
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/persona/guardar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -3241,66 +3020,63 @@ def editar_persona(id):
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_personas = requests.get(f"{API_URL}/api/persona/lista")
-            personas = r_personas.json().get("personas", [])
             numero_identificacion = request.form.get("numero_identificacion").strip()
             correo = request.form.get("correo").strip()
             telefono = request.form.get("telefono").strip()
-            otras_personas = [p for p in personas if p.get("id_persona") != id]
-            for persona in otras_personas:
-                if persona.get("numero_identificacion") == numero_identificacion:
-                    return render_template(
-                        "crud/persona/persona_editar.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este número de identificación",
-                    )
-            for persona in otras_personas:
-                if persona.get("correo") == correo:
-                    return render_template(
-                        "crud/persona/persona_editar.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este correo electrónico",
-                    )
-            for persona in otras_personas:
-                if persona.get("telefono") == telefono:
-                    return render_template(
-                        "crud/persona/persona_editar.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este número de teléfono",
-                    )
+            conflicto = indice_personas.conflicto(
+                excluir_id=id, numero_identificacion=numero_identificacion, correo=correo, telefono=telefono
+            )
+            if conflicto == "numero_identificacion":
+                return render_template(
+                    "crud/persona/persona_editar.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este número de identificación",
+                )
+            if conflicto == "correo":
+                return render_template(
+                    "crud/persona/persona_editar.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este correo electrónico",
+                )
+            if conflicto == "telefono":
+                return render_template(
+                    "crud/persona/persona_editar.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este número de teléfono",
+                )
             fecha_nacimiento = request.form.get("fecha_nacimiento")
             if fecha_nacimiento:
                 fecha_parts = fecha_nacimiento.split("-")
@@ -3341,9 +3117,10 @@ def editar_persona(id):
                 if request.form.get("metodo_pago[id_pago]"):
                     metodo_pago["id_pago"] = int(request.form.get("metodo_pago[id_pago]"))
                 datos_actualizacion["metodo_pago"] = metodo_pago
-            response = requests.put(
+            response = cliente_backend.put(
                 f"{API_URL}/api/persona/actualizar", json=datos_actualizacion
             )
+            personas_sesion.invalidar(id)
             if response.status_code == 200:
                 flash("Persona actualizada exitosamente", "success")
                 return redirect(url_for("router.lista_persona"))
@@ -3352,7 +3129,7 @@ def editar_persona(id):
         except Exception as e:
             flash(f"Error: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/persona/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/persona/lista/{id}")
         if r.status_code == 200:
             persona = r.json().get("persona")
             return render_template(
@@ -3382,7 +3159,7 @@ def editar_persona(id):
 @router.route("/persona/eliminar/<int:id>", methods=["POST"])
 def eliminar_persona(id):
     try:
-        r = requests.delete(f"{API_URL}/api/persona/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/persona/eliminar/{id}")
         if r.status_code == 200:
             flash("Persona eliminada correctamente", "success")
         else:
@@ -3395,7 +3172,7 @@ def eliminar_persona(id):
 @router.route("/persona/ordenar/<atributo>/<orden>")
 def ordenar_persona(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/persona/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/persona/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -3408,7 +3185,7 @@ def ordenar_persona(atributo, orden):
 @router.route("/persona/buscar/<atributo>/<criterio>")
 def buscar_persona(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/persona/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/persona/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -3424,7 +3201,7 @@ def buscar_persona(atributo, criterio):
 def lista_cuenta():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/cuenta/lista")
+        r = cliente_backend.get(f"{API_URL}/api/cuenta/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -3443,7 +3220,7 @@ def crear_cuenta():
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_cuenta = requests.get(f"{API_URL}/api/cuenta/lista")
+            r_cuenta = cliente_backend.get(f"{API_URL}/api/cuenta/lista")
             cuentas = r_cuenta.json().get("cuentas", [])
             correo = request.form.get("correo")
             for cuenta in cuentas:
@@ -3465,7 +3242,7 @@ def crear_cuenta():
             if not all(data.values()):
                 flash("Todos los campos son requeridos", "error")
                 return redirect(url_for("router.crear_cuenta"))
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/cuenta/guardar",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -3480,13 +3257,13 @@ def crear_cuenta():
             flash(f"Error de conexión: {str(e)}", "error")
             return redirect(url_for("router.crear_cuenta"))
     try:
-        r_tipos = requests.get(f"{API_URL}/api/cuenta/tipos")
+        r_tipos = cliente_backend.get(f"{API_URL}/api/cuenta/tipos")
         tipos = (
             r_tipos.json()["tipos_cuenta"]
             if r_tipos.status_code == 200
             else ["Administrador", "Cliente"]
         )
-        r_estados = requests.get(f"{API_URL}/api/cuenta/estados")
+        r_estados = cliente_backend.get(f"{API_URL}/api/cuenta/estados")
         estados = (
             r_estados.json()["estados_cuenta"]
             if r_estados.status_code == 200
@@ -3514,15 +3291,15 @@ def editar_cuenta(id):
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_cuentas = requests.get(f"{API_URL}/api/cuenta/lista")
+            r_cuentas = cliente_backend.get(f"{API_URL}/api/cuenta/lista")
             cuentas = r_cuentas.json().get("cuentas", [])
             correo = request.form["correo"]
             for cuenta in cuentas:
                 if cuenta["id_cuenta"] != id and cuenta["correo"].lower() == correo.lower():
-                    r = requests.get(f"{API_URL}/api/cuenta/lista/{id}")
+                    r = cliente_backend.get(f"{API_URL}/api/cuenta/lista/{id}")
                     cuenta_actual = r.json().get("cuenta")
-                    r_tipos = requests.get(f"{API_URL}/api/cuenta/tipos")
-                    r_estados = requests.get(f"{API_URL}/api/cuenta/estados")
+                    r_tipos = cliente_backend.get(f"{API_URL}/api/cuenta/tipos")
+                    r_estados = cliente_backend.get(f"{API_URL}/api/cuenta/estados")
                     tipos = r_tipos.json().get("tipos_cuenta", ["Administrador", "Cliente"])
                     estados = r_estados.json().get("estados_cuenta", ["Activo", "Inactivo"])
                     return render_template(
@@ -3542,7 +3319,7 @@ def editar_cuenta(id):
             }
             if request.form.get("contrasenia") and request.form["contrasenia"].strip():
                 data["contrasenia"] = request.form["contrasenia"]
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/cuenta/actualizar",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -3550,7 +3327,7 @@ def editar_cuenta(id):
             if r.status_code == 200:
                 flash("Cuenta actualizada exitosamente", "success")
                 try:
-                    r_sync = requests.post(f"{API_URL}/api/cuenta/sincronizar")
+                    r_sync = cliente_backend.post(f"{API_URL}/api/cuenta/sincronizar")
                     if r_sync.status_code != 200:
                         flash("Advertencia: Error al sincronizar los datos", "warning")
                 except:
@@ -3564,18 +3341,18 @@ def editar_cuenta(id):
         except requests.exceptions.RequestException as e:
             flash(f"Error de conexión: {str(e)}", "error")
     try:
-        r_cuenta = requests.get(f"{API_URL}/api/cuenta/lista/{id}")
+        r_cuenta = cliente_backend.get(f"{API_URL}/api/cuenta/lista/{id}")
         if r_cuenta.status_code != 200:
             flash("Cuenta no encontrada", "error")
             return redirect(url_for("router.lista_cuenta"))
         cuenta = r_cuenta.json()["cuenta"]
-        r_tipos = requests.get(f"{API_URL}/api/cuenta/tipos")
+        r_tipos = cliente_backend.get(f"{API_URL}/api/cuenta/tipos")
         tipos = (
             r_tipos.json()["tipos_cuenta"]
             if r_tipos.status_code == 200
             else ["Administrador", "Cliente"]
         )
-        r_estados = requests.get(f"{API_URL}/api/cuenta/estados")
+        r_estados = cliente_backend.get(f"{API_URL}/api/cuenta/estados")
         estados = (
             r_estados.json()["estados_cuenta"]
             if r_estados.status_code == 200
@@ -3596,11 +3373,11 @@ def editar_cuenta(id):
 @router.route("/cuenta/eliminar/<int:id>", methods=["POST"])
 def eliminar_cuenta(id):
     try:
-        r_verificar = requests.get(f"{API_URL}/api/cuenta/lista/{id}")
+        r_verificar = cliente_backend.get(f"{API_URL}/api/cuenta/lista/{id}")
         if r_verificar.status_code != 200:
             flash("Cuenta no encontrada", "error")
             return redirect(url_for("router.lista_cuenta"))
-        r = requests.delete(f"{API_URL}/api/cuenta/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/cuenta/eliminar/{id}")
         if r.status_code == 200:
             flash("Cuenta eliminada exitosamente", "success")
         else:
@@ -3613,7 +3390,7 @@ def eliminar_cuenta(id):
 @router.route("/cuenta/ordenar/<atributo>/<orden>")
 def ordenar_cuentas(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/cuenta/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/cuenta/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -3627,7 +3404,7 @@ def ordenar_cuentas(atributo, orden):
 @router.route("/cuenta/buscar/<atributo>/<criterio>")
 def buscar_cuentas(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/cuenta/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/cuenta/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -3643,7 +3420,7 @@ def buscar_cuentas(atributo, criterio):
 def lista_pago():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/pago/lista")
+        r = cliente_backend.get(f"{API_URL}/api/pago/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -3670,7 +3447,7 @@ def crear_pago():
                 "codigo_seguridad": request.form["codigo_seguridad"],
                 "saldo": request.form.get("saldo"),
             }
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/pago/guardar",
                 json=data,
             )
@@ -3690,7 +3467,7 @@ def crear_pago():
             flash("Error en los datos ingresados", "error")
             return redirect(url_for("router.crear_pago"))
     try:
-        r = requests.get(f"{API_URL}/api/pago/opciones")
+        r = cliente_backend.get(f"{API_URL}/api/pago/opciones")
         metodos_pago = (
             r.json()["metodos_pago"]
             if r.status_code == 200
@@ -3722,7 +3499,7 @@ def editar_pago(id):
                 "codigo_seguridad": request.form["codigo_seguridad"],
                 "saldo": float(request.form["saldo"]),
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/pago/actualizar",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -3739,12 +3516,12 @@ def editar_pago(id):
             flash(f"Error: {str(e)}", "error")
             return redirect(url_for("router.editar_pago", id=id))
     try:
-        r_pago = requests.get(f"{API_URL}/api/pago/lista/{id}")
+        r_pago = cliente_backend.get(f"{API_URL}/api/pago/lista/{id}")
         if r_pago.status_code != 200:
             flash("Método de pago no encontrado", "error")
             return redirect(url_for("router.lista_pago"))
         pago = r_pago.json()["pago"]
-        r_opciones = requests.get(f"{API_URL}/api/pago/opciones")
+        r_opciones = cliente_backend.get(f"{API_URL}/api/pago/opciones")
         metodos_pago = (
             r_opciones.json()["metodos_pago"]
             if r_opciones.status_code == 200
@@ -3761,7 +3538,7 @@ def editar_pago(id):
 @router.route("/pago/eliminar/<int:id>", methods=["POST"])
 def eliminar_pago(id):
     try:
-        r = requests.delete(f"{API_URL}/api/pago/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/pago/eliminar/{id}")
         if r.status_code == 200:
             flash("Pago eliminado correctamente", "success")
         else:
@@ -3774,7 +3551,7 @@ def eliminar_pago(id):
 @router.route("/pago/ordenar/<atributo>/<orden>")
 def ordenar_pago(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/pago/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/pago/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -3787,7 +3564,7 @@ def ordenar_pago(atributo, orden):
 @router.route("/pago/buscar/<atributo>/<criterio>")
 def buscar_pago(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/pago/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/pago/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -3804,7 +3581,7 @@ def buscar_pago(atributo, criterio):
 def lista_boleto():
     usuario = obtener_info_usuario()
     try:
-        response = requests.get(f"{API_URL}/api/boleto/lista")
+        response = cliente_backend.get(f"{API_URL}/api/boleto/lista")
         if response.status_code == 200:
             data = response.json()
             return render_template(
@@ -3835,8 +3612,11 @@ def crear_boleto():
                 "persona": {"id_persona": int(request.form.get("persona_id"))},
                 "turno": {"id_turno": int(request.form.get("turno_id"))},
             }
-            response = requests.post(f"{API_URL}/api/boleto/guardar", json=data)
+            response = cliente_backend.post(f"{API_URL}/api/boleto/guardar", json=data)
             if response.status_code == 200:
+                boletos_guardados = response.json().get("boletos")
+                indice_boletos.agregar(boletos_guardados)
+                estado_asientos.registrar(boletos_guardados)
                 flash("Boleto(s) creado(s) exitosamente", "success")
                 return redirect(url_for("router.lista_boleto"))
             else:
@@ -3847,8 +3627,7 @@ def crear_boleto():
         except ValueError as e:
             flash(f"Error en los datos del formulario: {str(e)}", "danger")
     try:
-        personas_response = requests.get(f"{API_URL}/api/persona/lista")
-        turnos_response = requests.get(f"{API_URL}/api/turno/lista")
+        personas_response, turnos_response = obtener_en_paralelo("/api/persona/lista", "/api/turno/lista")
         personas = (
             personas_response.json().get("personas", [])
             if personas_response.status_code == 200
@@ -3877,7 +3656,7 @@ def editar_boleto(id):
                 "persona_id": int(request.form.get("persona_id")),
                 "turno_id": int(request.form.get("turno_id")),
             }
-            response = requests.put(
+            response = cliente_backend.put(
                 f"{API_URL}/api/boleto/actualizar",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -3893,9 +3672,9 @@ def editar_boleto(id):
             flash(f"Error: {str(e)}", "danger")
             return redirect(url_for("router.editar_boleto", id=id))
     try:
-        boleto_response = requests.get(f"{API_URL}/api/boleto/lista/{id}")
-        personas_response = requests.get(f"{API_URL}/api/persona/lista")
-        turnos_response = requests.get(f"{API_URL}/api/turno/lista")
+        boleto_response, personas_response, turnos_response = obtener_en_paralelo(
+            f"/api/boleto/lista/{id}", "/api/persona/lista", "/api/turno/lista"
+        )
         boleto = boleto_response.json().get("boleto")
         estados_boleto = ["Vendido", "Reservado", "Disponible", "Cancelado"]
         if boleto_response.status_code == 200:
@@ -3921,7 +3700,7 @@ def editar_boleto(id):
 @router.route("/boleto/eliminar/<int:id>", methods=["POST"])
 def eliminar_boleto(id):
     try:
-        response = requests.delete(f"{API_URL}/api/boleto/eliminar/{id}")
+        response = cliente_backend.delete(f"{API_URL}/api/boleto/eliminar/{id}")
         if response.status_code == 200:
             flash("Boleto eliminado exitosamente", "success")
         else:
@@ -3934,7 +3713,7 @@ def eliminar_boleto(id):
 @router.route("/boleto/ordenar/<atributo>/<orden>")
 def ordenar_boletos(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/boleto/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/boleto/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -3947,7 +3726,7 @@ def ordenar_boletos(atributo, orden):
 @router.route("/boleto/buscar/<atributo>/<criterio>")
 def buscar_boletos(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/boleto/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/boleto/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -3963,7 +3742,7 @@ def buscar_boletos(atributo, criterio):
 def lista_descuento():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/descuento/lista")
+        r = cliente_backend.get(f"{API_URL}/api/descuento/lista")
         if r.status_code == 200:
             descuentos = r.json().get("descuentos", [])
             return render_template(
@@ -3982,7 +3761,7 @@ def crear_descuento():
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_descuento = requests.get(f"{API_URL}/api/descuento/lista")
+            r_descuento = cliente_backend.get(f"{API_URL}/api/descuento/lista")
             descuentos = r_descuento.json().get("descuentos", [])
             nombre_descuento = request.form.get("nombre_descuento")
             for descuento in descuentos:
@@ -4004,7 +3783,7 @@ def crear_descuento():
                 "fecha_inicio": datetime.now().strftime("%Y-%m-%d"),
                 "fecha_fin": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
             }
-            response = requests.post(f"{API_URL}/api/descuento/guardar", json=data)
+            response = cliente_backend.post(f"{API_URL}/api/descuento/guardar", json=data)
             if response.status_code == 200:
                 flash("Descuento creado exitosamente", "success")
                 return redirect(url_for("router.lista_descuento"))
@@ -4016,7 +3795,7 @@ def crear_descuento():
         except ValueError as e:
             flash(f"Error en los datos del formulario: {str(e)}", "danger")
     try:
-        descuento_response = requests.get(f"{API_URL}/api/descuento/estados")
+        descuento_response = cliente_backend.get(f"{API_URL}/api/descuento/estados")
         descuentos = (
             descuento_response.json().get("estados_descuento", [])
             if descuento_response.status_code == 200
@@ -4040,7 +3819,7 @@ def editar_descuento(id):
     estados_descuento = ["Activo", "Inactivo", "Expirado", "Agotado"]
     if request.method == "POST":
         try:
-            r_descuentos = requests.get(f"{API_URL}/api/descuento/lista")
+            r_descuentos = cliente_backend.get(f"{API_URL}/api/descuento/lista")
             descuentos = r_descuentos.json().get("descuentos", [])
             nombre_descuento = request.form.get("nombre_descuento")
             for descuento in descuentos:
@@ -4048,7 +3827,7 @@ def editar_descuento(id):
                     descuento["id_descuento"] != id
                     and descuento["nombre_descuento"].lower() == nombre_descuento.lower()
                 ):
-                    r = requests.get(f"{API_URL}/api/descuento/lista/{id}")
+                    r = cliente_backend.get(f"{API_URL}/api/descuento/lista/{id}")
                     descuento_actual = r.json().get("descuento")
                     return render_template(
                         "crud/descuento/descuento_editar.html",
@@ -4073,7 +3852,7 @@ def editar_descuento(id):
                 if fecha_fin:
                     fecha_fin_obj = datetime.strptime(fecha_fin, "%Y-%m-%d")
                     datos["fecha_fin"] = fecha_fin_obj.strftime("%d/%m/%Y")
-            r = requests.put(f"{API_URL}/api/descuento/actualizar", json=datos)
+            r = cliente_backend.put(f"{API_URL}/api/descuento/actualizar", json=datos)
             if r.status_code == 200:
                 flash("Descuento actualizado exitosamente", "success")
                 return redirect(url_for("router.lista_descuento"))
@@ -4083,7 +3862,7 @@ def editar_descuento(id):
         except Exception as e:
             flash(f"Error: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/descuento/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/descuento/lista/{id}")
         if r.status_code == 200:
             descuento = r.json().get("descuento")
             return render_template(
@@ -4102,7 +3881,7 @@ def editar_descuento(id):
 @router.route("/descuento/eliminar/<int:id>", methods=["POST"])
 def eliminar_descuento(id):
     try:
-        response = requests.delete(f"{API_URL}/api/descuento/eliminar/{id}")
+        response = cliente_backend.delete(f"{API_URL}/api/descuento/eliminar/{id}")
         if response.status_code == 200:
             flash("Descuento eliminado exitosamente", "success")
         else:
@@ -4115,7 +3894,7 @@ def eliminar_descuento(id):
 @router.route("/descuento/ordenar/<atributo>/<orden>")
 def ordenar_descuento(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/descuento/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/descuento/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -4128,7 +3907,7 @@ def ordenar_descuento(atributo, orden):
 @router.route("/descuento/buscar/<atributo>/<criterio>")
 def buscar_descuento(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/descuento/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/descuento/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -4269,7 +4048,7 @@ def api_cliente_dashboard():
             return jsonify({"error": "Usuario no autenticado"}), 401
         
         # Obtener datos del usuario
-        r_usuario = requests.get(f"{API_URL}/api/persona/lista/{usuario_id}", timeout=10)
+        r_usuario = cliente_backend.get(f"{API_URL}/api/persona/lista/{usuario_id}", timeout=10)
         usuario_data = {}
         if r_usuario.status_code == 200:
             persona = r_usuario.json().get("persona", {})
@@ -4296,38 +4075,33 @@ def api_cliente_dashboard():
         # Obtener boletos del usuario
         boletos_usuario = []
         try:
-            r_boletos = requests.get(f"{API_URL}/api/boleto/lista", timeout=10)
-            if r_boletos.status_code == 200:
-                todos_boletos = r_boletos.json().get("boletos", [])
-                # Filtrar boletos del usuario actual
-                for boleto in todos_boletos:
-                    persona_boleto = boleto.get("persona", {}) or {}
-                    if persona_boleto.get("id_persona") == usuario_id:
-                        turno = boleto.get("turno", {}) or {}
-                        horario = turno.get("horario", {}) or {}
-                        frecuencia = horario.get("frecuencia", {}) or {}
-                        ruta = frecuencia.get("ruta", {}) or {}
-                        bus = turno.get("bus", {}) or {}
-                        cooperativa = bus.get("cooperativa", {}) or {}
-                        
-                        boleto_formateado = {
-                            "id": str(boleto.get("id_boleto", "")),
-                            "fecha_compra": boleto.get("fecha_compra", ""),
-                            "asiento": boleto.get("numero_asiento", 0),
-                            "precio": float(boleto.get("precio_unitario", 0)),
-                            "origen": ruta.get("origen", ""),
-                            "destino": ruta.get("destino", ""),
-                            "hora_salida": horario.get("hora_salida", ""),
-                            "hora_llegada": horario.get("hora_llegada", ""),
-                            "fecha_salida": frecuencia.get("fecha_salida", ""),
-                            "operador": cooperativa.get("nombre_cooperativa", ""),
-                            "bus_placa": bus.get("placa", ""),
-                            "distancia": ruta.get("distancia_km", 0),
-                            "estado": "Activo"
-                        }
-                        boletos_usuario.append(boleto_formateado)
+            # Solo los boletos del usuario actual
+            for boleto in indice_boletos.de_persona(usuario_id):
+                turno = boleto.get("turno", {}) or {}
+                horario = turno.get("horario", {}) or {}
+                frecuencia = horario.get("frecuencia", {}) or {}
+                ruta = frecuencia.get("ruta", {}) or {}
+                bus = turno.get("bus", {}) or {}
+                cooperativa = bus.get("cooperativa", {}) or {}
+                
+                boleto_formateado = {
+                    "id": str(boleto.get("id_boleto", "")),
+                    "fecha_compra": boleto.get("fecha_compra", ""),
+                    "asiento": boleto.get("numero_asiento", 0),
+                    "precio": float(boleto.get("precio_unitario", 0)),
+                    "origen": ruta.get("origen", ""),
+                    "destino": ruta.get("destino", ""),
+                    "hora_salida": horario.get("hora_salida", ""),
+                    "hora_llegada": horario.get("hora_llegada", ""),
+                    "fecha_salida": frecuencia.get("fecha_salida", ""),
+                    "operador": cooperativa.get("nombre_cooperativa", ""),
+                    "bus_placa": bus.get("placa", ""),
+                    "distancia": ruta.get("distancia_km", 0),
+                    "estado": "Activo"
+                }
+                boletos_usuario.append(boleto_formateado)
         except Exception as e:
-            print(f"Error obteniendo boletos: {e}")
+            log.warning("dashboard_boletos", error=str(e))
         
         # Calcular estadísticas
         total_viajes = len(boletos_usuario)
@@ -4386,7 +4160,7 @@ def api_actualizar_perfil_cliente():
         data = request.get_json()
         
         # Obtener datos actuales para mantener campos que no se actualizan
-        r_usuario = requests.get(f"{API_URL}/api/persona/lista/{usuario_id}", timeout=10)
+        r_usuario = cliente_backend.get(f"{API_URL}/api/persona/lista/{usuario_id}", timeout=10)
         if r_usuario.status_code != 200:
             return jsonify({"success": False, "message": "Error al obtener datos del usuario"}), 400
         
@@ -4418,7 +4192,8 @@ def api_actualizar_perfil_cliente():
                 "contrasena": data.get("nueva_contrasena")
             }
         
-        response = requests.put(f"{API_URL}/api/persona/actualizar", json=datos_actualizacion, timeout=10)
+        response = cliente_backend.put(f"{API_URL}/api/persona/actualizar", json=datos_actualizacion, timeout=10)
+        personas_sesion.invalidar(usuario_id)
         
         if response.status_code == 200:
             return jsonify({"success": True, "message": "Perfil actualizado correctamente"})
@@ -4439,7 +4214,7 @@ def api_descargar_boleto_pdf(boleto_id):
             return jsonify({"error": "Usuario no autenticado"}), 401
         
         # Obtener información del boleto
-        response = requests.get(f"{API_URL}/api/boleto/lista/{boleto_id}", timeout=10)
+        response = cliente_backend.get(f"{API_URL}/api/boleto/lista/{boleto_id}", timeout=10)
         if response.status_code != 200:
             return jsonify({"error": "Boleto no encontrado"}), 404
         
@@ -4450,46 +4225,7 @@ def api_descargar_boleto_pdf(boleto_id):
         if persona_boleto.get("id_persona") != usuario_id:
             return jsonify({"error": "No autorizado"}), 403
         
-        # Generar PDF (similar a la función existente generar_boleto_pdf)
-        turno = boleto.get("turno", {}) or {}
-        horario = turno.get("horario", {}) or {}
-        frecuencia = horario.get("frecuencia", {}) or {}
-        ruta = frecuencia.get("ruta", {}) or {}
-        bus = turno.get("bus", {}) or {}
-        cooperativa = bus.get("cooperativa", {}) or {}
-        
-        from fpdf import FPDF
-        import tempfile
-        
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 16)
-        pdf.cell(0, 10, "BOLETO DE VIAJE - AVENTURABUS", ln=True, align="C")
-        pdf.ln(10)
-        
-        pdf.set_font("Arial", "", 12)
-        pdf.cell(0, 8, f"No. Boleto: {boleto.get('id_boleto', '')}", ln=True)
-        pdf.cell(0, 8, f"Pasajero: {persona_boleto.get('nombre', '')} {persona_boleto.get('apellido', '')}", ln=True)
-        pdf.cell(0, 8, f"Ruta: {ruta.get('origen', '')} - {ruta.get('destino', '')}", ln=True)
-        pdf.cell(0, 8, f"Fecha Salida: {frecuencia.get('fecha_salida', '')}", ln=True)
-        pdf.cell(0, 8, f"Hora: {horario.get('hora_salida', '')} - {horario.get('hora_llegada', '')}", ln=True)
-        pdf.cell(0, 8, f"Asiento: {boleto.get('numero_asiento', '')}", ln=True)
-        pdf.cell(0, 8, f"Cooperativa: {cooperativa.get('nombre_cooperativa', '')}", ln=True)
-        pdf.cell(0, 8, f"Bus: {bus.get('placa', '')}", ln=True)
-        pdf.cell(0, 8, f"Precio: ${boleto.get('precio_unitario', 0):.2f}", ln=True)
-        
-        # Crear archivo temporal
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-            pdf.output(tmp.name)
-            tmp_path = tmp.name
-        
-        from flask import send_file
-        return send_file(
-            tmp_path,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=f"boleto_{boleto_id}.pdf"
-        )
+        return enviar_pdf("cliente", boleto, f"boleto_{boleto_id}.pdf")
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -7,9 +7,16 @@ from os import getenv
 import requests
 import json
 from ..config import API_URL
+from ..servicios.asientos import estado_asientos
+from ..servicios.cliente_http import cliente_backend
+from ..servicios.indices import indice_boletos, indice_personas
+from ..servicios.paralelo import obtener_en_paralelo
+from ..servicios.personas_sesion import personas_sesion
+from ..servicios.registro import obtener_registro, resumen_respuesta
 import jwt
 
 router_admin = Blueprint("router_admin", __name__)
+log = obtener_registro("router_admin")
 
 
 load_dotenv()
@@ -105,8 +112,7 @@ def requiere_cliente(f):
 def obtener_info_usuario():
     try:
         usuario_id = session.get("user", {}).get("id")
-        r_usuario = requests.get(f"{API_URL}/api/persona/lista/{usuario_id}")
-        datos_usuario = r_usuario.json().get("persona", {}) if r_usuario.status_code == 200 else {}
+        datos_usuario = personas_sesion.obtener(usuario_id) or {}
         return {
             "nombre": datos_usuario.get("nombre", "Usuario"),
             "apellido": datos_usuario.get("apellido", ""),
@@ -121,7 +127,7 @@ def lista_cooperativa():
     try:
             token = session.get("token")
             headers = {"Authorization": f"Bearer {token}"} if token else {}
-            r = requests.get(f"{API_URL}/api/cooperativa/lista", headers=headers)
+            r = cliente_backend.get(f"{API_URL}/api/cooperativa/lista", headers=headers)
             if r.status_code == 200:
                 try:
                     data = r.json()
@@ -155,7 +161,7 @@ def crear_cooperativa():
             correo = request.form.get("correo_empresarial")
             token = session.get("token")
             headers = {"Authorization": f"Bearer {token}"} if token else {}
-            r_cooperativas = requests.get(f"{API_URL}/api/cooperativa/lista", headers=headers)
+            r_cooperativas = cliente_backend.get(f"{API_URL}/api/cooperativa/lista", headers=headers)
             cooperativas = r_cooperativas.json().get("cooperativas", [])
             for coop in cooperativas:
                 if coop["nombre_cooperativa"].lower() == nombre.lower():
@@ -191,7 +197,7 @@ def crear_cooperativa():
                 "telefono": telefono,
                 "correo_empresarial": correo,
             }
-            response = requests.post(f"{API_URL}/api/cooperativa/guardar", json=datos)
+            response = cliente_backend.post(f"{API_URL}/api/cooperativa/guardar", json=datos)
             if response.status_code == 200:
                 flash("Cooperativa creada exitosamente", "success")
                 return redirect(url_for("router_admin.lista_cooperativa"))
@@ -218,7 +224,7 @@ def editar_cooperativa(id):
             correo = request.form.get("correo_empresarial")
             token = session.get("token")
             headers = {"Authorization": f"Bearer {token}"} if token else {}
-            r_cooperativas = requests.get(f"{API_URL}/api/cooperativa/lista", headers=headers)
+            r_cooperativas = cliente_backend.get(f"{API_URL}/api/cooperativa/lista", headers=headers)
             cooperativas = r_cooperativas.json().get("cooperativas", [])
             for coop in cooperativas:
                 if coop["id_cooperativa"] != id:
@@ -290,7 +296,7 @@ def editar_cooperativa(id):
                 "telefono": telefono,
                 "correo_empresarial": correo,
             }
-            response = requests.put(f"{API_URL}/api/cooperativa/actualizar", json=datos)
+            response = cliente_backend.put(f"{API_URL}/api/cooperativa/actualizar", json=datos)
             if response.status_code == 200:
                 flash("Cooperativa actualizada exitosamente", "success")
                 return redirect(url_for("router_admin.lista_cooperativa"))
@@ -303,7 +309,7 @@ def editar_cooperativa(id):
     try:
         token = session.get("token")
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        r = requests.get(f"{API_URL}/api/cooperativa/lista/{id}", headers=headers)
+        r = cliente_backend.get(f"{API_URL}/api/cooperativa/lista/{id}", headers=headers)
         if r.status_code == 200:
             cooperativa = r.json().get("cooperativa")
             return render_template(
@@ -322,7 +328,7 @@ def eliminar_cooperativa(id):
     try:
         token = session.get("token")
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        r = requests.delete(f"{API_URL}/api/cooperativa/eliminar/{id}", headers=headers)
+        r = cliente_backend.delete(f"{API_URL}/api/cooperativa/eliminar/{id}", headers=headers)
         if r.status_code == 200:
             flash("Cooperativa eliminada correctamente", "success")
         else:
@@ -337,7 +343,7 @@ def eliminar_cooperativa(id):
 @router_admin.route("/cooperativa/ordenar/<atributo>/<orden>")
 def ordenar_cooperativa(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/cooperativa/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/cooperativa/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -350,7 +356,7 @@ def ordenar_cooperativa(atributo, orden):
 @router_admin.route("/cooperativa/buscar/<atributo>/<criterio>")
 def buscar_cooperativa(atributo, criterio):
     try:
-        response = requests.get(
+        response = cliente_backend.get(
             f"{API_URL}/api/cooperativa/buscar/{atributo}/{criterio}"
         )
         if response.status_code == 200:
@@ -366,17 +372,12 @@ def buscar_cooperativa(atributo, criterio):
 @router_admin.route("/bus/lista")
 #@requiere_administrador
 def lista_bus():
-    print("Entrando a lista_bus admin") 
     usuario = obtener_info_usuario()
     try:
         token = session.get("token")
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        r = requests.get(f"{API_URL}/api/bus/lista", headers=headers)
-        print("[lista_bus] status:", r.status_code)
-        try:
-            print("[lista_bus] json:", r.json())
-        except Exception as e:
-            print("[lista_bus] error json:", e)
+        r = cliente_backend.get(f"{API_URL}/api/bus/lista", headers=headers)
+        log.debug("lista_bus", estado=r.status_code, respuesta=resumen_respuesta(r))
         if r.status_code == 200:
             try:
                 data = r.json()
@@ -399,12 +400,12 @@ def lista_bus():
 def crear_bus():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/cooperativa/lista")
+        r = cliente_backend.get(f"{API_URL}/api/cooperativa/lista")
 
         cooperativas = r.json().get("cooperativas", []) if r.status_code == 200 else []
         token = session.get("token")
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        r_buses = requests.get(f"{API_URL}/api/bus/lista", headers=headers)
+        r_buses = cliente_backend.get(f"{API_URL}/api/bus/lista", headers=headers)
         buses = r_buses.json().get("buses", []) if r_buses.status_code == 200 else []
         ultimo_numero = max([bus.get("numero_bus", 0) for bus in buses], default=0)
         siguiente_numero = ultimo_numero + 1
@@ -415,8 +416,7 @@ def crear_bus():
         try:
             token = session.get("token")
             headers = {"Authorization": f"Bearer {token}"} if token else {}
-            r_buses = requests.get(f"{API_URL}/api/bus/lista", headers=headers)
-            print(r_buses.json())
+            r_buses = cliente_backend.get(f"{API_URL}/api/bus/lista", headers=headers)
             buses = r_buses.json().get("buses", [])
             numero = request.form.get("numero_bus")
             placa = request.form.get("placa")
@@ -450,8 +450,8 @@ def crear_bus():
                 "estado_bus": request.form["estado_bus"],
                 "cooperativa_id": request.form["cooperativa_id"],
             }
-            print(data)
-            r = requests.post(
+            log.debug("guardar_bus", datos=data)
+            r = cliente_backend.post(
                 f"{API_URL}/api/bus/guardar", headers=headers, json=data, timeout=5
             )
             if r.status_code == 200:
@@ -480,16 +480,15 @@ def editar_bus(id):
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_buses = requests.get(f"{API_URL}/api/bus/lista")
+            r_buses = cliente_backend.get(f"{API_URL}/api/bus/lista")
             buses = r_buses.json().get("buses", [])
             numero_bus = request.form["numero_bus"]
             placa = request.form["placa"].upper()
             for bus in buses:
                 if bus["id_bus"] != id:
                     if str(bus["numero_bus"]) == numero_bus:
-                        r = requests.get(f"{API_URL}/api/bus/lista/{id}")
+                        r, r_coop = obtener_en_paralelo(f"/api/bus/lista/{id}", "/api/cooperativa/lista")
                         bus_actual = r.json().get("bus")
-                        r_coop = requests.get(f"{API_URL}/api/cooperativa/lista")
                         cooperativas = r_coop.json().get("cooperativas", [])
                         return render_template(
                             "crud/bus/bus_editar.html",
@@ -499,9 +498,8 @@ def editar_bus(id):
                             error="El número de bus ya existe",
                         )
                     if bus["placa"].upper() == placa:
-                        r = requests.get(f"{API_URL}/api/bus/lista/{id}")
+                        r, r_coop = obtener_en_paralelo(f"/api/bus/lista/{id}", "/api/cooperativa/lista")
                         bus_actual = r.json().get("bus")
-                        r_coop = requests.get(f"{API_URL}/api/cooperativa/lista")
                         cooperativas = r_coop.json().get("cooperativas", [])
                         return render_template(
                             "crud/bus/bus_editar.html",
@@ -522,7 +520,7 @@ def editar_bus(id):
                 "estado_bus": request.form["estado_bus"],
                 "cooperativa_id": request.form["cooperativa_id"],
             }
-            r = requests.put(f"{API_URL}/api/bus/actualizar", headers=headers, json=data)
+            r = cliente_backend.put(f"{API_URL}/api/bus/actualizar", headers=headers, json=data)
             if r.status_code == 200:
                 flash("Bus actualizado correctamente", "success")
                 return redirect(url_for("router_admin.lista_bus"))
@@ -535,9 +533,8 @@ def editar_bus(id):
         try:
             token = session.get("token")
             headers = {"Authorization": f"Bearer {token}"} if token else {}
-            r = requests.get(f"{API_URL}/api/bus/lista/{id}", headers=headers)
+            r, r_coop = obtener_en_paralelo(f"/api/bus/lista/{id}", "/api/cooperativa/lista", headers=headers)
             bus = r.json().get("bus") if r.status_code == 200 else None
-            r_coop = requests.get(f"{API_URL}/api/cooperativa/lista")
             cooperativas = r_coop.json().get("cooperativas", []) if r_coop.status_code == 200 else []
             if bus:
                 return render_template(
@@ -555,7 +552,7 @@ def eliminar_bus(id):
     try:
         token = session.get("token")
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        r = requests.delete(f"{API_URL}/api/bus/eliminar/{id}", headers=headers)
+        r = cliente_backend.delete(f"{API_URL}/api/bus/eliminar/{id}", headers=headers)
         if r.status_code == 200:
             flash("Bus eliminado correctamente", "success")
         else:
@@ -570,7 +567,7 @@ def eliminar_bus(id):
 @router_admin.route("/bus/ordenar/<atributo>/<orden>")
 def ordenar_bus(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/bus/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/bus/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -583,7 +580,7 @@ def ordenar_bus(atributo, orden):
 @router_admin.route("/bus/buscar/<atributo>/<criterio>")
 def buscar_bus(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/bus/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/bus/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -599,12 +596,8 @@ def buscar_bus(atributo, criterio):
 def lista_ruta():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/ruta/lista")
-        print("[lista_ruta] status:", r.status_code)
-        try:
-            print("[lista_ruta] json:", r.json())
-        except Exception as e:
-            print("[lista_ruta] error json:", e)
+        r = cliente_backend.get(f"{API_URL}/api/ruta/lista")
+        log.debug("lista_ruta", estado=r.status_code, respuesta=resumen_respuesta(r))
         if r.status_code == 200:
             try:
                 data = r.json()
@@ -643,14 +636,14 @@ def lista_ruta():
 def crear_ruta():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/bus/lista")
+        r = cliente_backend.get(f"{API_URL}/api/bus/lista")
         buses = r.json().get("buses", []) if r.status_code == 200 else []
     except:
         buses = []
         flash("Error al cargar los buses", "error")
     if request.method == "POST":
         try:
-            r_rutas = requests.get(f"{API_URL}/api/ruta/lista")
+            r_rutas = cliente_backend.get(f"{API_URL}/api/ruta/lista")
             rutas = r_rutas.json().get("rutas", [])
             origen = request.form["origen"]
             destino = request.form["destino"]
@@ -692,7 +685,7 @@ def crear_ruta():
                     }
                     data["escalas"].append(escala)
                 i += 1
-            r = requests.post(f"{API_URL}/api/ruta/guardar", headers=headers, json=data)
+            r = cliente_backend.post(f"{API_URL}/api/ruta/guardar", headers=headers, json=data)
             if r.status_code == 200:
                 flash("Ruta creada correctamente", "success")
                 return redirect(url_for("router_admin.lista_ruta"))
@@ -711,9 +704,9 @@ def editar_ruta(id):
     usuario = obtener_info_usuario()
     if request.method == "GET":
         try:
-            r = requests.get(f"{API_URL}/api/ruta/lista/{id}")
+            r = cliente_backend.get(f"{API_URL}/api/ruta/lista/{id}")
             ruta = r.json().get("ruta") if r.status_code == 200 else None
-            r_bus = requests.get(f"{API_URL}/api/bus/lista")
+            r_bus = cliente_backend.get(f"{API_URL}/api/bus/lista")
             buses = r_bus.json().get("buses", []) if r_bus.status_code == 200 else []
             if ruta:
                 escalas = ruta.get("escalas", [])
@@ -735,13 +728,13 @@ def editar_ruta(id):
             return redirect(url_for("router_admin.lista_ruta"))
     elif request.method == "POST":
         try:
-            r = requests.get(f"{API_URL}/api/ruta/lista/{id}")
+            r = cliente_backend.get(f"{API_URL}/api/ruta/lista/{id}")
             ruta_actual = r.json().get("ruta") if r.status_code == 200 else None
-            r_bus = requests.get(f"{API_URL}/api/bus/lista")
+            r_bus = cliente_backend.get(f"{API_URL}/api/bus/lista")
             buses = r_bus.json().get("buses", []) if r_bus.status_code == 200 else []
 
             if request.method == "POST":
-                r_rutas = requests.get(f"{API_URL}/api/ruta/lista")
+                r_rutas = cliente_backend.get(f"{API_URL}/api/ruta/lista")
                 rutas = r_rutas.json().get("rutas", [])
                 origen = request.form.get("origen", "").strip()
                 destino = request.form.get("destino", "").strip()
@@ -789,7 +782,7 @@ def editar_ruta(id):
                         escalas.append(escala)
             if escalas:
                 datos_ruta["escalas"] = escalas
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/ruta/actualizar",
                 headers={"Content-Type": "application/json"},
                 json=datos_ruta,
@@ -809,7 +802,7 @@ def editar_ruta(id):
 @router_admin.route("/ruta/eliminar/<int:id>", methods=["POST"])
 def eliminar_ruta(id):
     try:
-        r = requests.delete(f"{API_URL}/api/ruta/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/ruta/eliminar/{id}")
         if r.status_code == 200:
             flash("Ruta eliminada correctamente", "success")
         else:
@@ -824,7 +817,7 @@ def eliminar_ruta(id):
 @router_admin.route("/ruta/ordenar/<atributo>/<orden>")
 def ordenar_ruta(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/ruta/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/ruta/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             rutas = response.json().get("rutas", [])
             for ruta in rutas:
@@ -851,7 +844,7 @@ def ordenar_ruta(atributo, orden):
 @router_admin.route("/ruta/buscar/<atributo>/<criterio>")
 def buscar_ruta(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/ruta/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/ruta/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -867,7 +860,7 @@ def buscar_ruta(atributo, criterio):
 def lista_escala():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/escala/lista")
+        r = cliente_backend.get(f"{API_URL}/api/escala/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -891,7 +884,7 @@ def crear_escala():
                 "lugar_escala": request.form["lugar_escala"],
                 "tiempo": request.form["tiempo"],
             }
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/escala/guardar", headers=headers, json=data, timeout=5
             )
             if r.status_code == 200:
@@ -907,7 +900,7 @@ def crear_escala():
             error_msg = f"Error en la petición: {str(e)}"
             flash(error_msg, "error")
     try:
-        r = requests.get(f"{API_URL}/api/ruta/lista")
+        r = cliente_backend.get(f"{API_URL}/api/ruta/lista")
         rutas = r.json().get("rutas", []) if r.status_code == 200 else []
     except:
         rutas = []
@@ -926,7 +919,7 @@ def editar_escala(id):
                 "lugar_escala": request.form["lugar_escala"],
                 "tiempo": request.form["tiempo"],
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/escala/actualizar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -939,7 +932,7 @@ def editar_escala(id):
         except requests.exceptions.RequestException as e:
             flash(f"Error de conexión: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/escala/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/escala/lista/{id}")
         escala = r.json().get("escala") if r.status_code == 200 else None
         if escala:
             return render_template("crud/escala/escala_editar.html", escala=escala, usuario=usuario)
@@ -953,7 +946,7 @@ def editar_escala(id):
 @router_admin.route("/escala/eliminar/<int:id>", methods=["POST"])
 def eliminar_escala(id):
     try:
-        r = requests.delete(f"{API_URL}/api/escala/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/escala/eliminar/{id}")
         if r.status_code == 200:
             flash("Escala eliminada correctamente", "success")
             return redirect(url_for("router_admin.lista_escala"))
@@ -967,7 +960,7 @@ def eliminar_escala(id):
 @router_admin.route("/escala/ordenar/<atributo>/<orden>")
 def ordenar_escala(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/escala/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/escala/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -980,7 +973,7 @@ def ordenar_escala(atributo, orden):
 @router_admin.route("/escala/buscar/<atributo>/<criterio>")
 def buscar_escala(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/escala/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/escala/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -996,12 +989,8 @@ def buscar_escala(atributo, criterio):
 def lista_horario():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/horario/lista")
-        print("[lista_horario] status:", r.status_code)
-        try:
-            print("[lista_horario] json:", r.json())
-        except Exception as e:
-            print("[lista_horario] error json:", e)
+        r = cliente_backend.get(f"{API_URL}/api/horario/lista")
+        log.debug("lista_horario", estado=r.status_code, respuesta=resumen_respuesta(r))
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -1020,7 +1009,7 @@ def lista_horario():
 def crear_horario():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/ruta/lista")
+        r = cliente_backend.get(f"{API_URL}/api/ruta/lista")
         rutas = r.json().get("rutas", []) if r.status_code == 200 else []
     except:
         rutas = []
@@ -1030,7 +1019,7 @@ def crear_horario():
             hora_salida = request.form["hora_salida"]
             hora_llegada = request.form["hora_llegada"]
             ruta_id = int(request.form["ruta_id"])
-            r_horarios = requests.get(f"{API_URL}/api/horario/lista")
+            r_horarios = cliente_backend.get(f"{API_URL}/api/horario/lista")
             horarios = r_horarios.json().get("horarios", [])
             hora_salida_nueva = sum(x * int(t) for x, t in zip([60, 1], hora_salida.split(":")))
             hora_llegada_nueva = sum(x * int(t) for x, t in zip([60, 1], hora_llegada.split(":")))
@@ -1064,7 +1053,7 @@ def crear_horario():
                 "estado_horario": request.form["estado_horario"],
                 "ruta": {"id_ruta": ruta_id},
             }
-            response = requests.post(f"{API_URL}/api/horario/guardar", json=data)
+            response = cliente_backend.post(f"{API_URL}/api/horario/guardar", json=data)
             if response.status_code == 200:
                 flash("Horario creado correctamente", "success")
                 return redirect(url_for("router_admin.lista_horario"))
@@ -1079,9 +1068,9 @@ def crear_horario():
 def editar_horario(id):
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/horario/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/horario/lista/{id}")
         horario = r.json().get("horario") if r.status_code == 200 else None
-        r_rutas = requests.get(f"{API_URL}/api/ruta/lista")
+        r_rutas = cliente_backend.get(f"{API_URL}/api/ruta/lista")
         rutas = r_rutas.json().get("rutas", []) if r_rutas.status_code == 200 else []
     except requests.exceptions.RequestException as e:
         flash(f"Error de conexión: {str(e)}", "error")
@@ -1091,7 +1080,7 @@ def editar_horario(id):
                 hora_salida = request.form["hora_salida"]
                 hora_llegada = request.form["hora_llegada"]
                 ruta_id = int(request.form["ruta_id"])
-                r_horarios = requests.get(f"{API_URL}/api/horario/lista")
+                r_horarios = cliente_backend.get(f"{API_URL}/api/horario/lista")
                 horarios = r_horarios.json().get("horarios", [])
                 hora_salida_nueva = sum(x * int(t) for x, t in zip([60, 1], hora_salida.split(":")))
                 hora_llegada_nueva = sum(
@@ -1131,7 +1120,7 @@ def editar_horario(id):
                         "estado_horario": request.form["estado_horario"],
                         "ruta": {"id_ruta": ruta_id},
                     }
-                    r = requests.put(
+                    r = cliente_backend.put(
                         f"{API_URL}/api/horario/actualizar",
                         headers={"Content-Type": "application/json"},
                         json=data,
@@ -1156,7 +1145,7 @@ def editar_horario(id):
 @router_admin.route("/horario/eliminar/<int:id>", methods=["POST"])
 def eliminar_horario(id):
     try:
-        r = requests.delete(f"{API_URL}/api/horario/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/horario/eliminar/{id}")
         if r.status_code == 200:
             flash("Horario eliminado correctamente", "success")
         else:
@@ -1169,7 +1158,7 @@ def eliminar_horario(id):
 @router_admin.route("/horario/ordenar/<atributo>/<orden>")
 def ordenar_horario(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/horario/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/horario/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -1182,7 +1171,7 @@ def ordenar_horario(atributo, orden):
 @router_admin.route("/horario/buscar/<atributo>/<criterio>")
 def buscar_horario(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/horario/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/horario/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -1199,12 +1188,8 @@ def buscar_horario(atributo, criterio):
 def lista_turno():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/turno/lista")
-        print("[lista_turno] status:", r.status_code)
-        try:
-            print("[lista_turno] json:", r.json())
-        except Exception as e:
-            print("[lista_turno] error json:", e)
+        r = cliente_backend.get(f"{API_URL}/api/turno/lista")
+        log.debug("lista_turno", estado=r.status_code, respuesta=resumen_respuesta(r))
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -1223,9 +1208,9 @@ def lista_turno():
 def crear_turno():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/horario/lista")
+        r = cliente_backend.get(f"{API_URL}/api/horario/lista")
         horarios = r.json().get("horarios", []) if r.status_code == 200 else []
-        r_turno = requests.get(f"{API_URL}/api/turno/lista")
+        r_turno = cliente_backend.get(f"{API_URL}/api/turno/lista")
         turnos = r_turno.json().get("turnos", []) if r_turno.status_code == 200 else []
         ultimo_numero = 0
         for turno in turnos:
@@ -1262,8 +1247,8 @@ def crear_turno():
                     "estado_turno": request.form.get("estado_turno", "Disponible"),
                     "horario": {"id_horario": horario_id},
                 }
-                print("data", data)
-                r = requests.post(
+                log.debug("guardar_turno", datos=data)
+                r = cliente_backend.post(
                     f"{API_URL}/api/turno/guardar",
                     headers={"Content-Type": "application/json"},
                     json=data,
@@ -1292,7 +1277,7 @@ def editar_turno(id):
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_turnos = requests.get(f"{API_URL}/api/turno/lista")
+            r_turnos = cliente_backend.get(f"{API_URL}/api/turno/lista")
             turnos = r_turnos.json().get("turnos", [])
             numero_turno = int(request.form["numero_turno"])
             fecha_salida = request.form.get("fecha_salida")
@@ -1300,9 +1285,8 @@ def editar_turno(id):
             for turno in turnos:
                 if turno.get("numero_turno") == numero_turno and turno.get("id_turno") != id:
                     estados_turno = ["Disponible", "Cancelado", "Agotado"]
-                    r = requests.get(f"{API_URL}/api/turno/lista/{id}")
+                    r, r_horarios = obtener_en_paralelo(f"/api/turno/lista/{id}", "/api/horario/lista")
                     turno = r.json().get("turno") if r.status_code == 200 else None
-                    r_horarios = requests.get(f"{API_URL}/api/horario/lista")
                     horarios = (
                         r_horarios.json().get("horarios", [])
                         if r_horarios.status_code == 200
@@ -1326,9 +1310,8 @@ def editar_turno(id):
                         and turno.get("horario", {}).get("id_horario") == horario_id
                     ):
                         estados_turno = ["Disponible", "Cancelado", "Agotado"]
-                        r = requests.get(f"{API_URL}/api/turno/lista/{id}")
+                        r, r_horarios = obtener_en_paralelo(f"/api/turno/lista/{id}", "/api/horario/lista")
                         turno = r.json().get("turno") if r.status_code == 200 else None
-                        r_horarios = requests.get(f"{API_URL}/api/horario/lista")
                         horarios = (
                             r_horarios.json().get("horarios", [])
                             if r_horarios.status_code == 200
@@ -1352,7 +1335,7 @@ def editar_turno(id):
                 "estado_turno": request.form["estado_turno"],
                 "horario": {"id_horario": horario_id},
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/turno/actualizar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -1366,9 +1349,8 @@ def editar_turno(id):
             flash(f"Error de conexión: {str(e)}", "error")
     try:
         estados_turno = ["Disponible", "Cancelado", "Agotado"]
-        r = requests.get(f"{API_URL}/api/turno/lista/{id}")
+        r, r_horarios = obtener_en_paralelo(f"/api/turno/lista/{id}", "/api/horario/lista")
         turno = r.json().get("turno") if r.status_code == 200 else None
-        r_horarios = requests.get(f"{API_URL}/api/horario/lista")
         horarios = r_horarios.json().get("horarios", []) if r_horarios.status_code == 200 else []
         if turno and turno.get("fecha_salida"):
             try:
@@ -1395,7 +1377,7 @@ def editar_turno(id):
 @router_admin.route("/turno/eliminar/<int:id>", methods=["POST"])
 def eliminar_turno(id):
     try:
-        r = requests.delete(f"{API_URL}/api/turno/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/turno/eliminar/{id}")
         if r.status_code == 200:
             flash("Turno eliminado correctamente", "success")
         else:
@@ -1408,7 +1390,7 @@ def eliminar_turno(id):
 @router_admin.route("/turno/ordenar/<atributo>/<orden>")
 def ordenar_turno(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/turno/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/turno/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -1420,7 +1402,7 @@ def ordenar_turno(atributo, orden):
 @router_admin.route("/turno/buscar/<atributo>/<criterio>")
 def buscar_turno(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/turno/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/turno/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -1436,7 +1418,7 @@ def buscar_turno(atributo, criterio):
 def lista_frecuencia():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/frecuencia/lista")
+        r = cliente_backend.get(f"{API_URL}/api/frecuencia/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -1463,7 +1445,7 @@ def crear_frecuencia():
                 "precio_recorrido": float(request.form["precio_recorrido"]),
                 "horario": {"id_horario": int(request.form["horario_id"])},
             }
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/frecuencia/guardar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -1476,7 +1458,7 @@ def crear_frecuencia():
         except requests.exceptions.RequestException as e:
             flash(f"Error de conexión: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/horario/lista")
+        r = cliente_backend.get(f"{API_URL}/api/horario/lista")
         horarios = r.json().get("horarios", []) if r.status_code == 200 else []
     except:
         horarios = []
@@ -1499,7 +1481,7 @@ def editar_frecuencia(id):
                 "precio_recorrido": float(request.form["precio_recorrido"]),
                 "horario": {"id_horario": int(request.form["horario_id"])},
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/frecuencia/actualizar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -1512,9 +1494,9 @@ def editar_frecuencia(id):
         except requests.exceptions.RequestException as e:
             flash(f"Error de conexión: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/frecuencia/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/frecuencia/lista/{id}")
         frecuencia = r.json().get("frecuencia") if r.status_code == 200 else None
-        r_horarios = requests.get(f"{API_URL}/api/horario/lista")
+        r_horarios = cliente_backend.get(f"{API_URL}/api/horario/lista")
         horarios = r_horarios.json().get("horarios", []) if r_horarios.status_code == 200 else []
         if frecuencia:
             return render_template(
@@ -1534,7 +1516,7 @@ def editar_frecuencia(id):
 @router_admin.route("/frecuencia/eliminar/<int:id>", methods=["POST"])
 def eliminar_frecuencia(id):
     try:
-        r = requests.delete(f"{API_URL}/api/frecuencia/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/frecuencia/eliminar/{id}")
         if r.status_code == 200:
             flash("Frecuencia eliminada correctamente", "success")
         else:
@@ -1546,7 +1528,7 @@ def eliminar_frecuencia(id):
 @router_admin.route("/frecuencia/ordenar/<atributo>/<orden>")
 def ordenar_frecuencia(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/frecuencia/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/frecuencia/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -1559,7 +1541,7 @@ def ordenar_frecuencia(atributo, orden):
 @router_admin.route("/frecuencia/buscar/<atributo>/<criterio>")
 def buscar_frecuencia(atributo, criterio):
     try:
-        response = requests.get(
+        response = cliente_backend.get(
             f"{API_URL}/api/frecuencia/buscar/{atributo}/{criterio}"
         )
         if response.status_code == 200:
@@ -1577,7 +1559,7 @@ def buscar_frecuencia(atributo, criterio):
 def lista_persona():
     try:
         usuario = obtener_info_usuario()
-        r = requests.get(f"{API_URL}/api/persona/lista")
+        r = cliente_backend.get(f"{API_URL}/api/persona/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -1596,63 +1578,63 @@ def crear_persona():
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_personas = requests.get(f"{API_URL}/api/persona/lista")
-            personas = r_personas.json().get("personas", [])
             numero_identificacion = request.form.get("numero_identificacion").strip()
             correo = request.form.get("correo").strip()
             telefono = request.form.get("telefono").strip()
-            for persona in personas:
-                if persona.get("numero_identificacion") == numero_identificacion:
-                    return render_template(
-                        "crud/persona/persona_crear.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este número de identificación",
-                    )
-                if persona.get("correo") == correo:
-                    return render_template(
-                        "crud/persona/persona_crear.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este correo electrónico",
-                    )
-                if persona.get("telefono") == telefono:
-                    return render_template(
-                        "crud/persona/persona_crear.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este número de teléfono",
-                    )
+            conflicto = indice_personas.conflicto(
+                numero_identificacion=numero_identificacion, correo=correo, telefono=telefono
+            )
+            if conflicto == "numero_identificacion":
+                return render_template(
+                    "crud/persona/persona_crear.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este número de identificación",
+                )
+            if conflicto == "correo":
+                return render_template(
+                    "crud/persona/persona_crear.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este correo electrónico",
+                )
+            if conflicto == "telefono":
+                return render_template(
+                    "crud/persona/persona_crear.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este número de teléfono",
+                )
             data = {
                 "tipo_identificacion": request.form["tipo_identificacion"],
                 "numero_identificacion": request.form["numero_identificacion"],
@@ -1691,7 +1673,7 @@ def crear_persona():
                             "saldo": request.form["saldo"],
                         }
                     )
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/persona/guardar",
                 headers={"Content-Type": "application/json"},
                 json=data,
@@ -1721,66 +1703,63 @@ def editar_persona(id):
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_personas = requests.get(f"{API_URL}/api/persona/lista")
-            personas = r_personas.json().get("personas", [])
             numero_identificacion = request.form.get("numero_identificacion").strip()
             correo = request.form.get("correo").strip()
             telefono = request.form.get("telefono").strip()
-            otras_personas = [p for p in personas if p.get("id_persona") != id]
-            for persona in otras_personas:
-                if persona.get("numero_identificacion") == numero_identificacion:
-                    return render_template(
-                        "crud/persona/persona_editar.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este número de identificación",
-                    )
-            for persona in otras_personas:
-                if persona.get("correo") == correo:
-                    return render_template(
-                        "crud/persona/persona_editar.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este correo electrónico",
-                    )
-            for persona in otras_personas:
-                if persona.get("telefono") == telefono:
-                    return render_template(
-                        "crud/persona/persona_editar.html",
-                        tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
-                        generos=["No_definido", "Masculino", "Femenino", "Otro"],
-                        tipos_cuenta=["Administrador", "Cliente"],
-                        tipos_tarifa=[
-                            "General",
-                            "Menor_edad",
-                            "Tercera_edad",
-                            "Estudiante",
-                            "Discapacitado",
-                        ],
-                        estados_cuenta=["Activo", "Inactivo", "Suspendido"],
-                        usuario=usuario,
-                        error="Ya existe una persona registrada con este número de teléfono",
-                    )
+            conflicto = indice_personas.conflicto(
+                excluir_id=id, numero_identificacion=numero_identificacion, correo=correo, telefono=telefono
+            )
+            if conflicto == "numero_identificacion":
+                return render_template(
+                    "crud/persona/persona_editar.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este número de identificación",
+                )
+            if conflicto == "correo":
+                return render_template(
+                    "crud/persona/persona_editar.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este correo electrónico",
+                )
+            if conflicto == "telefono":
+                return render_template(
+                    "crud/persona/persona_editar.html",
+                    tipos_identificacion=["Cedula", "Pasaporte", "Licencia_conducir"],
+                    generos=["No_definido", "Masculino", "Femenino", "Otro"],
+                    tipos_cuenta=["Administrador", "Cliente"],
+                    tipos_tarifa=[
+                        "General",
+                        "Menor_edad",
+                        "Tercera_edad",
+                        "Estudiante",
+                        "Discapacitado",
+                    ],
+                    estados_cuenta=["Activo", "Inactivo", "Suspendido"],
+                    usuario=usuario,
+                    error="Ya existe una persona registrada con este número de teléfono",
+                )
             fecha_nacimiento = request.form.get("fecha_nacimiento")
             if fecha_nacimiento:
                 fecha_parts = fecha_nacimiento.split("-")
@@ -1821,9 +1800,10 @@ def editar_persona(id):
                 if request.form.get("metodo_pago[id_pago]"):
                     metodo_pago["id_pago"] = int(request.form.get("metodo_pago[id_pago]"))
                 datos_actualizacion["metodo_pago"] = metodo_pago
-            response = requests.put(
+            response = cliente_backend.put(
                 f"{API_URL}/api/persona/actualizar", json=datos_actualizacion
             )
+            personas_sesion.invalidar(id)
             if response.status_code == 200:
                 flash("Persona actualizada exitosamente", "success")
                 return redirect(url_for("router_admin.lista_persona"))
@@ -1832,7 +1812,7 @@ def editar_persona(id):
         except Exception as e:
             flash(f"Error: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/persona/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/persona/lista/{id}")
         if r.status_code == 200:
             persona = r.json().get("persona")
             return render_template(
@@ -1863,7 +1843,7 @@ def editar_persona(id):
 @router_admin.route("/persona/eliminar/<int:id>", methods=["POST"])
 def eliminar_persona(id):
     try:
-        r = requests.delete(f"{API_URL}/api/persona/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/persona/eliminar/{id}")
         if r.status_code == 200:
             flash("Persona eliminada correctamente", "success")
         else:
@@ -1876,7 +1856,7 @@ def eliminar_persona(id):
 @router_admin.route("/persona/ordenar/<atributo>/<orden>")
 def ordenar_persona(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/persona/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/persona/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -1889,7 +1869,7 @@ def ordenar_persona(atributo, orden):
 @router_admin.route("/persona/buscar/<atributo>/<criterio>")
 def buscar_persona(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/persona/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/persona/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -1905,7 +1885,7 @@ def buscar_persona(atributo, criterio):
 def lista_cuenta():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/cuenta/lista")
+        r = cliente_backend.get(f"{API_URL}/api/cuenta/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -1923,7 +1903,7 @@ def crear_cuenta():
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_cuenta = requests.get(f"{API_URL}/api/cuenta/lista")
+            r_cuenta = cliente_backend.get(f"{API_URL}/api/cuenta/lista")
             cuentas = r_cuenta.json().get("cuentas", [])
             correo = request.form.get("correo")
             for cuenta in cuentas:
@@ -1945,7 +1925,7 @@ def crear_cuenta():
             if not all(data.values()):
                 flash("Todos los campos son requeridos", "error")
                 return redirect(url_for("router_admin.crear_cuenta"))
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/cuenta/guardar",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -1960,13 +1940,13 @@ def crear_cuenta():
             flash(f"Error de conexión: {str(e)}", "error")
             return redirect(url_for("router_admin.crear_cuenta"))
     try:
-        r_tipos = requests.get(f"{API_URL}/api/cuenta/tipos")
+        r_tipos = cliente_backend.get(f"{API_URL}/api/cuenta/tipos")
         tipos = (
             r_tipos.json()["tipos_cuenta"]
             if r_tipos.status_code == 200
             else ["Administrador", "Cliente"]
         )
-        r_estados = requests.get(f"{API_URL}/api/cuenta/estados")
+        r_estados = cliente_backend.get(f"{API_URL}/api/cuenta/estados")
         estados = (
             r_estados.json()["estados_cuenta"]
             if r_estados.status_code == 200
@@ -1993,15 +1973,15 @@ def editar_cuenta(id):
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_cuentas = requests.get(f"{API_URL}/api/cuenta/lista")
+            r_cuentas = cliente_backend.get(f"{API_URL}/api/cuenta/lista")
             cuentas = r_cuentas.json().get("cuentas", [])
             correo = request.form["correo"]
             for cuenta in cuentas:
                 if cuenta["id_cuenta"] != id and cuenta["correo"].lower() == correo.lower():
-                    r = requests.get(f"{API_URL}/api/cuenta/lista/{id}")
+                    r = cliente_backend.get(f"{API_URL}/api/cuenta/lista/{id}")
                     cuenta_actual = r.json().get("cuenta")
-                    r_tipos = requests.get(f"{API_URL}/api/cuenta/tipos")
-                    r_estados = requests.get(f"{API_URL}/api/cuenta/estados")
+                    r_tipos = cliente_backend.get(f"{API_URL}/api/cuenta/tipos")
+                    r_estados = cliente_backend.get(f"{API_URL}/api/cuenta/estados")
                     tipos = r_tipos.json().get("tipos_cuenta", ["Administrador", "Cliente"])
                     estados = r_estados.json().get("estados_cuenta", ["Activo", "Inactivo"])
                     return render_template(
@@ -2021,7 +2001,7 @@ def editar_cuenta(id):
             }
             if request.form.get("contrasenia") and request.form["contrasenia"].strip():
                 data["contrasenia"] = request.form["contrasenia"]
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/cuenta/actualizar",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -2029,7 +2009,7 @@ def editar_cuenta(id):
             if r.status_code == 200:
                 flash("Cuenta actualizada exitosamente", "success")
                 try:
-                    r_sync = requests.post(f"{API_URL}/api/cuenta/sincronizar")
+                    r_sync = cliente_backend.post(f"{API_URL}/api/cuenta/sincronizar")
                     if r_sync.status_code != 200:
                         flash("Advertencia: Error al sincronizar los datos", "warning")
                 except:
@@ -2043,18 +2023,18 @@ def editar_cuenta(id):
         except requests.exceptions.RequestException as e:
             flash(f"Error de conexión: {str(e)}", "error")
     try:
-        r_cuenta = requests.get(f"{API_URL}/api/cuenta/lista/{id}")
+        r_cuenta = cliente_backend.get(f"{API_URL}/api/cuenta/lista/{id}")
         if r_cuenta.status_code != 200:
             flash("Cuenta no encontrada", "error")
             return redirect(url_for("router_admin.lista_cuenta"))
         cuenta = r_cuenta.json()["cuenta"]
-        r_tipos = requests.get(f"{API_URL}/api/cuenta/tipos")
+        r_tipos = cliente_backend.get(f"{API_URL}/api/cuenta/tipos")
         tipos = (
             r_tipos.json()["tipos_cuenta"]
             if r_tipos.status_code == 200
             else ["Administrador", "Cliente"]
         )
-        r_estados = requests.get(f"{API_URL}/api/cuenta/estados")
+        r_estados = cliente_backend.get(f"{API_URL}/api/cuenta/estados")
         estados = (
             r_estados.json()["estados_cuenta"]
             if r_estados.status_code == 200
@@ -2074,11 +2054,11 @@ def editar_cuenta(id):
 @router_admin.route("/cuenta/eliminar/<int:id>", methods=["POST"])
 def eliminar_cuenta(id):
     try:
-        r_verificar = requests.get(f"{API_URL}/api/cuenta/lista/{id}")
+        r_verificar = cliente_backend.get(f"{API_URL}/api/cuenta/lista/{id}")
         if r_verificar.status_code != 200:
             flash("Cuenta no encontrada", "error")
             return redirect(url_for("router_admin.lista_cuenta"))
-        r = requests.delete(f"{API_URL}/api/cuenta/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/cuenta/eliminar/{id}")
         if r.status_code == 200:
             flash("Cuenta eliminada exitosamente", "success")
         else:
@@ -2091,7 +2071,7 @@ def eliminar_cuenta(id):
 @router_admin.route("/cuenta/ordenar/<atributo>/<orden>")
 def ordenar_cuentas(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/cuenta/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/cuenta/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2104,7 +2084,7 @@ def ordenar_cuentas(atributo, orden):
 @router_admin.route("/cuenta/buscar/<atributo>/<criterio>")
 def buscar_cuentas(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/cuenta/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/cuenta/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2121,7 +2101,7 @@ def buscar_cuentas(atributo, criterio):
 def lista_pago():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/pago/lista")
+        r = cliente_backend.get(f"{API_URL}/api/pago/lista")
         if r.status_code == 200:
             data = r.json()
             return render_template(
@@ -2149,7 +2129,7 @@ def crear_pago():
                 "codigo_seguridad": request.form["codigo_seguridad"],
                 "saldo": request.form.get("saldo"),
             }
-            r = requests.post(
+            r = cliente_backend.post(
                 f"{API_URL}/api/pago/guardar",
                 json=data,
             )
@@ -2169,7 +2149,7 @@ def crear_pago():
             flash("Error en los datos ingresados", "error")
             return redirect(url_for("router_admin.crear_pago"))
     try:
-        r = requests.get(f"{API_URL}/api/pago/opciones")
+        r = cliente_backend.get(f"{API_URL}/api/pago/opciones")
         metodos_pago = (
             r.json()["metodos_pago"]
             if r.status_code == 200
@@ -2201,7 +2181,7 @@ def editar_pago(id):
                 "codigo_seguridad": request.form["codigo_seguridad"],
                 "saldo": float(request.form["saldo"]),
             }
-            r = requests.put(
+            r = cliente_backend.put(
                 f"{API_URL}/api/pago/actualizar",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -2218,12 +2198,12 @@ def editar_pago(id):
             flash(f"Error: {str(e)}", "error")
             return redirect(url_for("router_admin.editar_pago", id=id))
     try:
-        r_pago = requests.get(f"{API_URL}/api/pago/lista/{id}")
+        r_pago = cliente_backend.get(f"{API_URL}/api/pago/lista/{id}")
         if r_pago.status_code != 200:
             flash("Método de pago no encontrado", "error")
             return redirect(url_for("router_admin.lista_pago"))
         pago = r_pago.json()["pago"]
-        r_opciones = requests.get(f"{API_URL}/api/pago/opciones")
+        r_opciones = cliente_backend.get(f"{API_URL}/api/pago/opciones")
         metodos_pago = (
             r_opciones.json()["metodos_pago"]
             if r_opciones.status_code == 200
@@ -2240,7 +2220,7 @@ def editar_pago(id):
 @router_admin.route("/pago/eliminar/<int:id>", methods=["POST"])
 def eliminar_pago(id):
     try:
-        r = requests.delete(f"{API_URL}/api/pago/eliminar/{id}")
+        r = cliente_backend.delete(f"{API_URL}/api/pago/eliminar/{id}")
         if r.status_code == 200:
             flash("Pago eliminado correctamente", "success")
         else:
@@ -2253,7 +2233,7 @@ def eliminar_pago(id):
 @router_admin.route("/pago/ordenar/<atributo>/<orden>")
 def ordenar_pago(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/pago/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/pago/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -2266,7 +2246,7 @@ def ordenar_pago(atributo, orden):
 @router_admin.route("/pago/buscar/<atributo>/<criterio>")
 def buscar_pago(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/pago/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/pago/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2283,7 +2263,7 @@ def buscar_pago(atributo, criterio):
 def lista_boleto():
     usuario = obtener_info_usuario()
     try:
-        response = requests.get(f"{API_URL}/api/boleto/lista")
+        response = cliente_backend.get(f"{API_URL}/api/boleto/lista")
         if response.status_code == 200:
             data = response.json()
             return render_template(
@@ -2314,8 +2294,11 @@ def crear_boleto():
                 "persona": {"id_persona": int(request.form.get("persona_id"))},
                 "turno": {"id_turno": int(request.form.get("turno_id"))},
             }
-            response = requests.post(f"{API_URL}/api/boleto/guardar", json=data)
+            response = cliente_backend.post(f"{API_URL}/api/boleto/guardar", json=data)
             if response.status_code == 200:
+                boletos_guardados = response.json().get("boletos")
+                indice_boletos.agregar(boletos_guardados)
+                estado_asientos.registrar(boletos_guardados)
                 flash("Boleto(s) creado(s) exitosamente", "success")
                 return redirect(url_for("router_admin.lista_boleto"))
             else:
@@ -2326,8 +2309,7 @@ def crear_boleto():
         except ValueError as e:
             flash(f"Error en los datos del formulario: {str(e)}", "danger")
     try:
-        personas_response = requests.get(f"{API_URL}/api/persona/lista")
-        turnos_response = requests.get(f"{API_URL}/api/turno/lista")
+        personas_response, turnos_response = obtener_en_paralelo("/api/persona/lista", "/api/turno/lista")
         personas = (
             personas_response.json().get("personas", [])
             if personas_response.status_code == 200
@@ -2357,7 +2339,7 @@ def editar_boleto(id):
                 "persona_id": int(request.form.get("persona_id")),
                 "turno_id": int(request.form.get("turno_id")),
             }
-            response = requests.put(
+            response = cliente_backend.put(
                 f"{API_URL}/api/boleto/actualizar",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -2373,9 +2355,9 @@ def editar_boleto(id):
             flash(f"Error: {str(e)}", "danger")
             return redirect(url_for("router_admin.editar_boleto", id=id))
     try:
-        boleto_response = requests.get(f"{API_URL}/api/boleto/lista/{id}")
-        personas_response = requests.get(f"{API_URL}/api/persona/lista")
-        turnos_response = requests.get(f"{API_URL}/api/turno/lista")
+        boleto_response, personas_response, turnos_response = obtener_en_paralelo(
+            f"/api/boleto/lista/{id}", "/api/persona/lista", "/api/turno/lista"
+        )
         boleto = boleto_response.json().get("boleto")
         estados_boleto = ["Vendido", "Reservado", "Disponible", "Cancelado"]
         if boleto_response.status_code == 200:
@@ -2400,7 +2382,7 @@ def editar_boleto(id):
 @router_admin.route("/boleto/eliminar/<int:id>", methods=["POST"])
 def eliminar_boleto(id):
     try:
-        response = requests.delete(f"{API_URL}/api/boleto/eliminar/{id}")
+        response = cliente_backend.delete(f"{API_URL}/api/boleto/eliminar/{id}")
         if response.status_code == 200:
             flash("Boleto eliminado exitosamente", "success")
         else:
@@ -2413,7 +2395,7 @@ def eliminar_boleto(id):
 @router_admin.route("/boleto/ordenar/<atributo>/<orden>")
 def ordenar_boletos(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/boleto/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/boleto/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -2425,7 +2407,7 @@ def ordenar_boletos(atributo, orden):
 @router_admin.route("/boleto/buscar/<atributo>/<criterio>")
 def buscar_boletos(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/boleto/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/boleto/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -2442,7 +2424,7 @@ def buscar_boletos(atributo, criterio):
 def lista_descuento():
     usuario = obtener_info_usuario()
     try:
-        r = requests.get(f"{API_URL}/api/descuento/lista")
+        r = cliente_backend.get(f"{API_URL}/api/descuento/lista")
         if r.status_code == 200:
             descuentos = r.json().get("descuentos", [])
             return render_template(
@@ -2460,7 +2442,7 @@ def crear_descuento():
     usuario = obtener_info_usuario()
     if request.method == "POST":
         try:
-            r_descuento = requests.get(f"{API_URL}/api/descuento/lista")
+            r_descuento = cliente_backend.get(f"{API_URL}/api/descuento/lista")
             descuentos = r_descuento.json().get("descuentos", [])
             nombre_descuento = request.form.get("nombre_descuento")
             for descuento in descuentos:
@@ -2482,7 +2464,7 @@ def crear_descuento():
                 "fecha_inicio": datetime.now().strftime("%Y-%m-%d"),
                 "fecha_fin": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
             }
-            response = requests.post(f"{API_URL}/api/descuento/guardar", json=data)
+            response = cliente_backend.post(f"{API_URL}/api/descuento/guardar", json=data)
             if response.status_code == 200:
                 flash("Descuento creado exitosamente", "success")
                 return redirect(url_for("router_admin.lista_descuento"))
@@ -2494,7 +2476,7 @@ def crear_descuento():
         except ValueError as e:
             flash(f"Error en los datos del formulario: {str(e)}", "danger")
     try:
-        descuento_response = requests.get(f"{API_URL}/api/descuento/estados")
+        descuento_response = cliente_backend.get(f"{API_URL}/api/descuento/estados")
         descuentos = (
             descuento_response.json().get("estados_descuento", [])
             if descuento_response.status_code == 200
@@ -2518,7 +2500,7 @@ def editar_descuento(id):
     estados_descuento = ["Activo", "Inactivo", "Expirado", "Agotado"]
     if request.method == "POST":
         try:
-            r_descuentos = requests.get(f"{API_URL}/api/descuento/lista")
+            r_descuentos = cliente_backend.get(f"{API_URL}/api/descuento/lista")
             descuentos = r_descuentos.json().get("descuentos", [])
             nombre_descuento = request.form.get("nombre_descuento")
             for descuento in descuentos:
@@ -2526,7 +2508,7 @@ def editar_descuento(id):
                     descuento["id_descuento"] != id
                     and descuento["nombre_descuento"].lower() == nombre_descuento.lower()
                 ):
-                    r = requests.get(f"{API_URL}/api/descuento/lista/{id}")
+                    r = cliente_backend.get(f"{API_URL}/api/descuento/lista/{id}")
                     descuento_actual = r.json().get("descuento")
                     return render_template(
                         "crud/descuento/descuento_editar.html",
@@ -2551,7 +2533,7 @@ def editar_descuento(id):
                 if fecha_fin:
                     fecha_fin_obj = datetime.strptime(fecha_fin, "%Y-%m-%d")
                     datos["fecha_fin"] = fecha_fin_obj.strftime("%d/%m/%Y")
-            r = requests.put(f"{API_URL}/api/descuento/actualizar", json=datos)
+            r = cliente_backend.put(f"{API_URL}/api/descuento/actualizar", json=datos)
             if r.status_code == 200:
                 flash("Descuento actualizado exitosamente", "success")
                 return redirect(url_for("router_admin.lista_descuento"))
@@ -2561,7 +2543,7 @@ def editar_descuento(id):
         except Exception as e:
             flash(f"Error: {str(e)}", "error")
     try:
-        r = requests.get(f"{API_URL}/api/descuento/lista/{id}")
+        r = cliente_backend.get(f"{API_URL}/api/descuento/lista/{id}")
         if r.status_code == 200:
             descuento = r.json().get("descuento")
             return render_template(
@@ -2580,7 +2562,7 @@ def editar_descuento(id):
 @router_admin.route("/descuento/eliminar/<int:id>", methods=["POST"])
 def eliminar_descuento(id):
     try:
-        response = requests.delete(f"{API_URL}/api/descuento/eliminar/{id}")
+        response = cliente_backend.delete(f"{API_URL}/api/descuento/eliminar/{id}")
         if response.status_code == 200:
             flash("Descuento eliminado exitosamente", "success")
         else:
@@ -2593,7 +2575,7 @@ def eliminar_descuento(id):
 @router_admin.route("/descuento/ordenar/<atributo>/<orden>")
 def ordenar_descuento(atributo, orden):
     try:
-        response = requests.get(f"{API_URL}/api/descuento/ordenar/{atributo}/{orden}")
+        response = cliente_backend.get(f"{API_URL}/api/descuento/ordenar/{atributo}/{orden}")
         if response.status_code == 200:
             return jsonify(response.json())
         else:
@@ -2606,7 +2588,7 @@ def ordenar_descuento(atributo, orden):
 @router_admin.route("/descuento/buscar/<atributo>/<criterio>")
 def buscar_descuento(atributo, criterio):
     try:
-        response = requests.get(f"{API_URL}/api/descuento/buscar/{atributo}/{criterio}")
+        response = cliente_backend.get(f"{API_URL}/api/descuento/buscar/{atributo}/{criterio}")
         if response.status_code == 200:
             return jsonify(response.json())
         return (
@@ -5,10 +5,16 @@ from dotenv import load_dotenv
 from functools import wraps
 from os import getenv
 from ..config import API_URL
-import requests
+from ..servicios.asientos import estado_asientos
+from ..servicios.cliente_http import cliente_backend
+from ..servicios.indices import indice_turnos
+from ..servicios.personas_sesion import personas_sesion
+from ..servicios.refresco_catalogo import agregar_edad, refresco_catalogo
+from ..servicios.registro import obtener_registro
 import jwt
 
 router_bus = Blueprint("router_bus", __name__)
+log = obtener_registro("router_bus")
 
 
 load_dotenv()
@@ -106,8 +112,7 @@ def requiere_cliente(f):
 def obtener_info_usuario():
     try:
         usuario_id = session.get("user", {}).get("id")
-        r_usuario = requests.get(f"{API_URL}/api/persona/lista/{usuario_id}")
-        datos_usuario = r_usuario.json().get("persona", {}) if r_usuario.status_code == 200 else {}
+        datos_usuario = personas_sesion.obtener(usuario_id) or {}
         return {
             "nombre": datos_usuario.get("nombre", "Usuario"),
             "apellido": datos_usuario.get("apellido", ""),
@@ -119,20 +124,22 @@ def obtener_info_usuario():
 @router_bus.route("/api/rutas/opciones")
 def turnos_disponibles():
     try:
-        r = requests.get(f"{API_URL}/api/turno/lista")
-        if r.status_code == 200:
-            turnos = r.json().get("turnos", [])
-            turnos_activos = [t for t in turnos if t.get("estado_turno") == "Disponible"]
-            origenes = list(
-                {
-                    t.get("horario", {}).get("ruta", {}).get("origen")
-                    for t in turnos_activos
-                    if t.get("horario", {}).get("ruta", {}).get("origen")
-                }
-            )
-            return jsonify({"turnos": turnos, "origenes": sorted(origenes)})
+        datos, edad = refresco_catalogo.leer("turno")
+        agregar_edad(edad)
+        turnos = datos.get("turnos", [])
+        turnos_activos = [t for t in turnos if t.get("estado_turno") == "Disponible"]
+        origenes = list(
+            {
+                t.get("horario", {}).get("ruta", {}).get("origen")
+                for t in turnos_activos
+                if t.get("horario", {}).get("ruta", {}).get("origen")
+            }
+        )
+        return jsonify({"turnos": turnos, "origenes": sorted(origenes)})
+    except RuntimeError:
         return jsonify({"error": "Error al obtener datos"}), 500
     except Exception as e:
+        log.exception("turnos_disponibles", error=str(e))
         return jsonify({"error": str(e)}), 500
 
 
@@ -145,22 +152,14 @@ def buscar_cooperativas():
         if not all([origen, destino, fecha]):
             flash("Por favor complete todos los campos", "error")
             return redirect(url_for("router_bus.index"))
-        r = requests.get(f"{API_URL}/api/turno/lista")
-        if r.status_code == 200:
-            turnos = r.json()
+        if indice_turnos.refrescar():
             cooperativas_set = set()
             cooperativas_lista = []
-            for turno in turnos["turnos"]:
-                ruta = turno["horario"]["ruta"]
-                if (
-                    ruta["origen"] == origen
-                    and ruta["destino"] == destino
-                    and turno["fecha_salida"] == fecha
-                ):
-                    cooperativa = ruta["bus"]["cooperativa"]
-                    if cooperativa["id_cooperativa"] not in cooperativas_set:
-                        cooperativas_set.add(cooperativa["id_cooperativa"])
-                        cooperativas_lista.append(cooperativa)
+            for turno in indice_turnos.buscar(origen, destino, fecha):
+                cooperativa = turno["horario"]["ruta"]["bus"]["cooperativa"]
+                if cooperativa["id_cooperativa"] not in cooperativas_set:
+                    cooperativas_set.add(cooperativa["id_cooperativa"])
+                    cooperativas_lista.append(cooperativa)
             return render_template(
                 "seleccion_boleto/cooperativa_disponible.html",
                 cooperativas=cooperativas_lista,
@@ -183,24 +182,16 @@ def buses_disponibles():
         origen = request.args.get("origen")
         destino = request.args.get("destino")
         fecha = request.args.get("fecha")
-        r = requests.get(f"{API_URL}/api/turno/lista")
-        if r.status_code == 200:
-            turnos = r.json().get("turnos", [])
+        if indice_turnos.refrescar():
             buses_disponibles = []
-            for turno in turnos:
-                ruta = turno["horario"]["ruta"]
-                bus = ruta["bus"]
-                if (
-                    ruta["origen"] == origen
-                    and ruta["destino"] == destino
-                    and turno["fecha_salida"] == fecha
-                    and bus["cooperativa"]["id_cooperativa"] == int(cooperativa_id)
-                ):
+            for turno in indice_turnos.buscar(origen, destino, fecha):
+                bus = turno["horario"]["ruta"]["bus"]
+                if bus["cooperativa"]["id_cooperativa"] == int(cooperativa_id):
                     buses_disponibles.append(
                         {
                             "id_bus": bus["id_bus"],
                             "numero_bus": bus["numero_bus"],
-                            "velocidad": bus["velocidad"],
+                            "velocidad": bus.get("velocidad", bus.get("Velocidad")),
                             "modelo": bus["modelo"],
                             "placa": bus["placa"],
                             "capacidad_pasajeros": bus["capacidad_pasajeros"],
@@ -210,6 +201,7 @@ def buses_disponibles():
             return jsonify({"buses": buses_disponibles})
         return jsonify({"error": "Error al obtener datos"}), 500
     except Exception as e:
+        log.exception("buses_disponibles", error=str(e))
         return jsonify({"error": str(e)}), 500
 
 
@@ -225,37 +217,18 @@ def mostrar_asientos(bus_id):
             )
             flash("Por favor inicie sesión para continuar", "warning")
             return redirect(url_for("router.iniciar_sesion"))
-        r_bus = requests.get(f"{API_URL}/api/bus/lista/{bus_id}")
-        r_turnos = requests.get(f"{API_URL}/api/turno/lista")
-        r_boletos = requests.get(f"{API_URL}/api/boleto/lista")
+        r_bus = cliente_backend.get(f"{API_URL}/api/bus/lista/{bus_id}")
         if r_bus.status_code == 200:
             bus = r_bus.json().get("bus")
-            turnos = r_turnos.json().get("turnos", []) if r_turnos.status_code == 200 else []
-            turno = next(
-                (
-                    t
-                    for t in turnos
-                    if t["horario"]["ruta"]["bus"]["id_bus"] == bus_id
-                    and t["horario"]["ruta"]["origen"] == origen
-                    and t["horario"]["ruta"]["destino"] == destino
-                    and t["fecha_salida"] == fecha
-                ),
-                None,
-            )
+            indice_turnos.refrescar()
+            turno = indice_turnos.turno_de_bus(bus_id, origen, destino, fecha)
             if not turno:
                 flash("No se encontró el turno especificado", "error")
                 return redirect(url_for("router_bus.index"))
             ruta = turno["horario"]["ruta"]
             hora_salida = turno["horario"]["hora_salida"]
             precio_unitario = ruta["precio_unitario"]
-            boletos = r_boletos.json().get("boletos", []) if r_boletos.status_code == 200 else []
-            estados_asientos = ["disponible"] * bus["capacidad_pasajeros"]
-            for boleto in boletos:
-                if boleto["turno"]["id_turno"] == turno["id_turno"] and boleto["estado_boleto"] in [
-                    "Vendido",
-                    "Reservado",
-                ]:
-                    estados_asientos[boleto["numero_asiento"] - 1] = boleto["estado_boleto"].lower()
+            estados_asientos = estado_asientos.estados(turno["id_turno"], bus["capacidad_pasajeros"])
             return render_template(
                 "seleccion_boleto/asientos_disponibles.html",
                 bus=bus,
@@ -270,4 +243,5 @@ def mostrar_asientos(bus_id):
             )
         return jsonify({"error": "Bus no encontrado"}), 404
     except Exception as e:
+        log.exception("mostrar_asientos", bus_id=bus_id, error=str(e))
         return jsonify({"error": str(e)}), 500
@@ -1,215 +1,306 @@
-from flask import Blueprint, jsonify, request
-from ..config import API_URL
+from flask import Blueprint, Response, jsonify, make_response, request, send_file, session, url_for
+from ..config import API_URL, BACKEND_TIMEOUT
+from ..servicios.cache_catalogo import cache_catalogo
+from ..servicios.cliente_http import cliente_backend
+from ..servicios.cotizaciones import cache_cotizaciones
+from ..servicios.personas_sesion import personas_sesion
+from ..servicios.pdf_boleto import cache_pdf
+from ..servicios.refresco_catalogo import refresco_catalogo
+from ..servicios.registro import obtener_registro, resumen_respuesta
+from ..servicios.trabajos_pdf import cola_pdf
+from collections import namedtuple
+from functools import wraps
+from werkzeug.exceptions import RequestEntityTooLarge
 import requests
+import gzip
+import io
 
 router_api = Blueprint("router_api", __name__)
-
-def proxy_request(method, endpoint, data=None):
+log = obtener_registro("router_api")
+
+# Bytes que se leen del backend por vuelta al reenviar una respuesta
+TAMANO_BLOQUE_PROXY = 64 * 1024
+
+# Cabeceras de la respuesta del backend que se copian tal cual al cliente
+CABECERAS_REENVIADAS = ("Content-Type", "Content-Encoding", "Content-Length", "ETag", "Last-Modified",
+                        "Cache-Control", "X-Cache")
+
+# Por debajo de este tamaño no compensa comprimir la respuesta
+MIN_BYTES_COMPRIMIR = 1024
+
+# Política de rendimiento de una ruta del proxy:
+#   ttl: segundos en la caché de catálogo (None = CATALOGO_CACHE_TTL; solo aplica a colecciones de catálogo)
+#   timeout: segundos de espera al backend
+#   reintentos: veces que se repite un GET ante un error de conexión o timeout (las escrituras no se repiten)
+#   max_bytes: tamaño máximo del cuerpo JSON recibido (413 si se supera)
+#   comprimir: gzip de las respuestas ya en memoria si el cliente lo acepta
+PoliticaProxy = namedtuple(
+    "PoliticaProxy", "ttl timeout reintentos max_bytes comprimir",
+    defaults=(None, BACKEND_TIMEOUT, 0, 1024 * 1024, True),
+)
+
+def cabeceras_proxy():
+    headers = {'Content-Type': 'application/json'}
+    # Forward Authorization header from incoming request to backend
+    if 'Authorization' in request.headers:
+        headers['Authorization'] = request.headers['Authorization']
+    return headers
+
+def comprimir_respuesta(cuerpo, headers):
+    """Comprime con gzip un cuerpo en memoria si el cliente lo acepta y es suficientemente grande"""
+    if len(cuerpo) < MIN_BYTES_COMPRIMIR or not request.accept_encodings["gzip"]:
+        return cuerpo
+    headers["Content-Encoding"] = "gzip"
+    headers["Vary"] = "Accept-Encoding"
+    return gzip.compress(cuerpo, compresslevel=5)
+
+def proxy_passthrough(endpoint, politica=PoliticaProxy()):
+    """GET al backend cuyo cuerpo se reenvía sin decodificar ni volver a serializar.
+
+    Las listas de catálogo vienen de la caché (ya están en memoria como bytes);
+    el resto se transmite por bloques desde el socket del backend, con su
+    Content-Encoding original, así que la memoria usada no depende del tamaño.
+    """
+    url = f"{API_URL}{endpoint}"
+    en_cache = cache_catalogo.coleccion_de(endpoint) is not None
+    headers = cabeceras_proxy()
+    if not en_cache:
+        # El cuerpo llega comprimido solo si el cliente acepta esa codificación
+        headers['Accept-Encoding'] = request.headers.get('Accept-Encoding', 'identity')
+    for intento in range(politica.reintentos + 1):
+        try:
+            response = cliente_backend.get(url, headers=headers, stream=not en_cache, timeout=politica.timeout)
+            break
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            log.warning("proxy_error", metodo="GET", url=url, intento=intento + 1, error=str(e))
+            if intento == politica.reintentos:
+                return jsonify({"error": str(e)}), 500
+        except requests.exceptions.RequestException as e:
+            log.error("proxy_error", metodo="GET", url=url, error=str(e))
+            return jsonify({"error": str(e)}), 500
+    log.frecuente("proxy", metodo="GET", url=url, estado=response.status_code, passthrough=True)
+    headers = {k: response.headers[k] for k in CABECERAS_REENVIADAS if k in response.headers}
+    if en_cache:
+        # Cuerpo ya leído y descomprimido: Flask calcula su longitud
+        headers.pop("Content-Encoding", None)
+        headers.pop("Content-Length", None)
+        cuerpo = response.content
+        if politica.comprimir:
+            cuerpo = comprimir_respuesta(cuerpo, headers)
+        return Response(cuerpo, status=response.status_code, headers=headers)
+
+    def bloques():
+        try:
+            yield from response.raw.stream(TAMANO_BLOQUE_PROXY, decode_content=False)
+        finally:
+            # Devuelve la conexión al pool aunque el cliente corte la descarga
+            response.close()
+
+    respuesta = Response(bloques(), status=response.status_code, headers=headers, direct_passthrough=True)
+    # Si el cliente corta antes del primer bloque el generador no llega a su finally
+    respuesta.call_on_close(response.close)
+    return respuesta
+
+def proxy_request(method, endpoint, data=None, politica=PoliticaProxy()):
     try:
         url = f"{API_URL}{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        # Forward Authorization header from incoming request to backend
-        if 'Authorization' in request.headers:
-            headers['Authorization'] = request.headers['Authorization']
-            print(f"[PROXY] Forwarding Authorization header")
-        
-        print(f"[PROXY] {method} {url}")
-        if data:
-            print(f"[PROXY] Data: {data}")
+        headers = cabeceras_proxy()
         
-        if method == 'GET':
-            response = requests.get(url, headers=headers, timeout=10)
-        elif method == 'POST':
-            response = requests.post(url, json=data, headers=headers, timeout=10)
-        elif method == 'PUT':
-            response = requests.put(url, json=data, headers=headers, timeout=10)
-        elif method == 'DELETE':
-            response = requests.delete(url, headers=headers, timeout=10)
+        if method in ('GET', 'DELETE'):
+            response = cliente_backend.request(method, url, headers=headers, timeout=politica.timeout)
+        elif method in ('POST', 'PUT'):
+            response = cliente_backend.request(method, url, json=data, headers=headers, timeout=politica.timeout)
         else:
-            return jsonify({"error": "Método no soportado"}), 400
+            return {"error": "Método no soportado"}, 400
         
-        print(f"[PROXY] Response status: {response.status_code}")
         if response.status_code >= 400:
-            print(f"[PROXY] Response text: {response.text}")
-            
+            log.warning("proxy", metodo=method, url=url, estado=response.status_code, datos=data,
+                        respuesta=resumen_respuesta(response))
+        else:
+            log.frecuente("proxy", metodo=method, url=url, estado=response.status_code)
+        log.debug("proxy_datos", metodo=method, url=url, datos=data)
+
         return response.json(), response.status_code
     except requests.exceptions.RequestException as e:
-        print(f"[PROXY] Exception: {str(e)}")
-        return jsonify({"error": str(e)}), 500
-
-
-# ========== COOPERATIVAS ==========
-@router_api.route("/api/cooperativa/lista", methods=["GET"])
-def get_cooperativas():
-    result, status = proxy_request('GET', '/api/cooperativa/lista')
-    return jsonify(result), status
-
-@router_api.route("/api/cooperativa/guardar", methods=["POST"])
-def save_cooperativa():
-    result, status = proxy_request('POST', '/api/cooperativa/guardar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/cooperativa/actualizar", methods=["PUT"])
-def update_cooperativa():
-    result, status = proxy_request('PUT', '/api/cooperativa/actualizar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/cooperativa/eliminar/<int:id>", methods=["DELETE"])
-def delete_cooperativa(id):
-    result, status = proxy_request('DELETE', f'/api/cooperativa/eliminar/{id}')
-    return jsonify(result), status
-
-
-# ========== BUSES ==========
-@router_api.route("/api/bus/lista", methods=["GET"])
-def get_buses():
-    result, status = proxy_request('GET', '/api/bus/lista')
-    return jsonify(result), status
-
-@router_api.route("/api/bus/guardar", methods=["POST"])
-def save_bus():
-    result, status = proxy_request('POST', '/api/bus/guardar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/bus/actualizar", methods=["PUT"])
-def update_bus():
-    result, status = proxy_request('PUT', '/api/bus/actualizar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/bus/eliminar/<int:id>", methods=["DELETE"])
-def delete_bus(id):
-    result, status = proxy_request('DELETE', f'/api/bus/eliminar/{id}')
-    return jsonify(result), status
-
-
-# ========== RUTAS ==========
-@router_api.route("/api/ruta/lista", methods=["GET"])
-def get_rutas():
-    result, status = proxy_request('GET', '/api/ruta/lista')
-    return jsonify(result), status
-
-@router_api.route("/api/ruta/guardar", methods=["POST"])
-def save_ruta():
-    result, status = proxy_request('POST', '/api/ruta/guardar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/ruta/actualizar", methods=["PUT"])
-def update_ruta():
-    result, status = proxy_request('PUT', '/api/ruta/actualizar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/ruta/eliminar/<int:id>", methods=["DELETE"])
-def delete_ruta(id):
-    result, status = proxy_request('DELETE', f'/api/ruta/eliminar/{id}')
-    return jsonify(result), status
-
-
-# ========== HORARIOS ==========
-@router_api.route("/api/horario/lista", methods=["GET"])
-def get_horarios():
-    result, status = proxy_request('GET', '/api/horario/lista')
-    return jsonify(result), status
-
-@router_api.route("/api/horario/guardar", methods=["POST"])
-def save_horario():
-    result, status = proxy_request('POST', '/api/horario/guardar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/horario/actualizar", methods=["PUT"])
-def update_horario():
-    result, status = proxy_request('PUT', '/api/horario/actualizar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/horario/eliminar/<int:id>", methods=["DELETE"])
-def delete_horario(id):
-    result, status = proxy_request('DELETE', f'/api/horario/eliminar/{id}')
-    return jsonify(result), status
-
-
-# ========== ESCALAS ==========
-@router_api.route("/api/escala/lista", methods=["GET"])
-def get_escalas():
-    result, status = proxy_request('GET', '/api/escala/lista')
-    return jsonify(result), status
-
-@router_api.route("/api/escala/guardar", methods=["POST"])
-def save_escala():
-    result, status = proxy_request('POST', '/api/escala/guardar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/escala/actualizar", methods=["PUT"])
-def update_escala():
-    result, status = proxy_request('PUT', '/api/escala/actualizar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/escala/eliminar/<int:id>", methods=["DELETE"])
-def delete_escala(id):
-    result, status = proxy_request('DELETE', f'/api/escala/eliminar/{id}')
-    return jsonify(result), status
-
-
-# ========== DESCUENTOS ==========
-@router_api.route("/api/descuento/lista", methods=["GET"])
-def get_descuentos():
-    result, status = proxy_request('GET', '/api/descuento/lista')
-    return jsonify(result), status
-
-@router_api.route("/api/descuento/guardar", methods=["POST"])
-def save_descuento():
-    result, status = proxy_request('POST', '/api/descuento/guardar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/descuento/actualizar", methods=["PUT"])
-def update_descuento():
-    result, status = proxy_request('PUT', '/api/descuento/actualizar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/descuento/eliminar/<int:id>", methods=["DELETE"])
-def delete_descuento(id):
-    result, status = proxy_request('DELETE', f'/api/descuento/eliminar/{id}')
-    return jsonify(result), status
-
-
-# ========== PERSONAS/CLIENTES ==========
-@router_api.route("/api/persona/lista", methods=["GET"])
-def get_personas():
-    result, status = proxy_request('GET', '/api/persona/lista')
-    return jsonify(result), status
-
-@router_api.route("/api/persona/guardar", methods=["POST"])
-def save_persona():
-    result, status = proxy_request('POST', '/api/persona/guardar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/persona/actualizar", methods=["PUT"])
-def update_persona():
-    result, status = proxy_request('PUT', '/api/persona/actualizar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/persona/eliminar/<int:id>", methods=["DELETE"])
-def delete_persona(id):
-    result, status = proxy_request('DELETE', f'/api/persona/eliminar/{id}')
-    return jsonify(result), status
-
-
-# ========== BOLETOS ==========
-@router_api.route("/api/boleto/lista", methods=["GET"])
-def get_boletos():
-    result, status = proxy_request('GET', '/api/boleto/lista')
-    return jsonify(result), status
-
-@router_api.route("/api/boleto/guardar", methods=["POST"])
-def save_boleto():
-    result, status = proxy_request('POST', '/api/boleto/guardar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/boleto/comprar", methods=["POST"])
-def comprar_boleto():
-    result, status = proxy_request('POST', '/api/boleto/comprar', request.json)
-    return jsonify(result), status
-
-@router_api.route("/api/boleto/actualizar", methods=["PUT"])
-def update_boleto():
-    result, status = proxy_request('PUT', '/api/boleto/actualizar', request.json)
-    return jsonify(result), status
+        log.error("proxy_error", metodo=method, url=url, error=str(e))
+        return {"error": str(e)}, 500
+
+
+# ========== RUTAS DEL PROXY ==========
+def invalidar_comprador(data):
+    """Descarta la persona y cotizaciones guardadas del comprador de un boleto"""
+    id_persona = ((data or {}).get("persona") or {}).get("id_persona")
+    if id_persona is not None:
+        cache_cotizaciones.invalidar_usuario(id_persona)
+
+def despues_guardar_boleto(data, result, status):
+    invalidar_comprador(data)
+    # Los PDFs se generan en segundo plano y el cliente consulta el trabajo con su
+    # sesión; sin sesión no podría consultarlo, así que no se encola
+    propietario = (session.get("user") or {}).get("id")
+    if status == 200 and isinstance(result, dict) and result.get("boletos") and propietario is not None:
+        id_trabajo = cola_pdf.encolar(result["boletos"], propietario=propietario)
+        result["trabajo_pdf"] = id_trabajo
+        result["estado_pdf"] = url_for("router_api.estado_trabajo_pdf", id_trabajo=id_trabajo)
+    return result
+
+def despues_comprar_boleto(data, result, status):
+    invalidar_comprador(data)
+    return result
+
+# Acción -> (método HTTP, regla de la ruta). La ruta del backend es la misma que la del frontend.
+ACCIONES = {
+    "lista": ("GET", "/api/{entidad}/lista"),
+    "guardar": ("POST", "/api/{entidad}/guardar"),
+    "comprar": ("POST", "/api/{entidad}/comprar"),
+    "actualizar": ("PUT", "/api/{entidad}/actualizar"),
+    "eliminar": ("DELETE", "/api/{entidad}/eliminar/<int:id>"),
+}
+CRUD = ("lista", "guardar", "actualizar", "eliminar")
+
+# Catálogo: listas pequeñas que salen de la caché, se comprimen y se reintentan
+CATALOGO = PoliticaProxy(timeout=5, reintentos=1, max_bytes=64 * 1024)
+# Personas y boletos: listas grandes que se transmiten desde el backend
+VOLUMINOSA = PoliticaProxy(reintentos=1, max_bytes=256 * 1024)
+
+# Entidad -> (política, acciones expuestas, {acción: post-proceso(data, result, status) -> result})
+RUTAS_PROXY = {
+    "cooperativa": (CATALOGO, CRUD, {}),
+    "bus": (CATALOGO, CRUD, {}),
+    "ruta": (CATALOGO, CRUD, {}),
+    "horario": (CATALOGO, CRUD, {}),
+    "escala": (CATALOGO, CRUD, {}),
+    "descuento": (CATALOGO, CRUD, {}),
+    "persona": (VOLUMINOSA, CRUD, {}),
+    "boleto": (
+        VOLUMINOSA,
+        ("lista", "guardar", "comprar", "actualizar"),
+        {"guardar": despues_guardar_boleto, "comprar": despues_comprar_boleto},
+    ),
+}
+
+def vista_proxy(metodo, politica, despues=None):
+    def vista(**_):
+        if metodo == "GET":
+            return proxy_passthrough(request.path, politica)
+        data = None
+        if metodo in ("POST", "PUT"):
+            # El límite vale también para cuerpos chunked, sin Content-Length. Werkzeug deja
+            # de leer al llegar al máximo, así que se lee un byte más para saber si lo pasó.
+            request.max_content_length = politica.max_bytes + 1
+            try:
+                excedido = len(request.get_data()) > politica.max_bytes
+            except RequestEntityTooLarge:
+                excedido = True
+            if excedido:
+                return jsonify({"error": f"El cuerpo supera {politica.max_bytes} bytes"}), 413
+            data = request.json
+        result, status = proxy_request(metodo, request.path, data, politica)
+        if despues is not None:
+            result = despues(data, result, status)
+        return jsonify(result), status
+    return vista
+
+def registrar_rutas_proxy(rutas=RUTAS_PROXY):
+    for entidad, (politica, acciones, despues) in rutas.items():
+        if politica.ttl is not None:
+            cache_catalogo.configurar_ttl(entidad, politica.ttl)
+        for accion in acciones:
+            metodo, regla = ACCIONES[accion]
+            router_api.add_url_rule(
+                regla.format(entidad=entidad),
+                endpoint=f"{accion}_{entidad}",
+                view_func=vista_proxy(metodo, politica, despues.get(accion)),
+                methods=[metodo],
+            )
+
+registrar_rutas_proxy()
+
+
+# ========== ESTADO DEL CLIENTE BACKEND ==========
+def solo_administrador_o_local(f):
+    """Las estadísticas internas solo se ven desde el propio servidor o con sesión de administrador"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        local = request.remote_addr in ("127.0.0.1", "::1")
+        if not local and (session.get("user") or {}).get("tipo_cuenta") != "Administrador":
+            return jsonify({"error": "Acceso no autorizado"}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+@router_api.route("/api/backend/pool", methods=["GET"])
+@solo_administrador_o_local
+def estado_pool_backend():
+    """Utilización del pool de conexiones hacia el backend (por worker)"""
+    return jsonify(cliente_backend.estadisticas())
+
+@router_api.route("/api/backend/cache", methods=["GET"])
+@solo_administrador_o_local
+def estado_cache_catalogo():
+    """Aciertos e invalidaciones de la caché de catálogo, edad de las listas en memoria, cotizaciones y personas de sesión"""
+    return jsonify(
+        {
+            **cache_catalogo.estadisticas(),
+            "refresco": refresco_catalogo.estadisticas(),
+            "cotizaciones": cache_cotizaciones.estadisticas(),
+            "personas_sesion": personas_sesion.estadisticas(),
+        }
+    )
+
+@router_api.route("/api/backend/pdf", methods=["GET"])
+@solo_administrador_o_local
+def estado_cache_pdf():
+    """Aciertos y ocupación de la caché de PDFs de boletos"""
+    return jsonify(cache_pdf.estadisticas())
+
+
+# ========== PDFs EN SEGUNDO PLANO ==========
+def requiere_dueno_trabajo(f):
+    """Solo la persona que compró (o un administrador) ve el trabajo; a los demás se les responde 404"""
+    @wraps(f)
+    def decorated_function(id_trabajo, *args, **kwargs):
+        usuario = session.get("user") or {}
+        if not usuario:
+            return jsonify({"error": "Usuario no autenticado"}), 401
+        propietario = cola_pdf.propietario(id_trabajo)
+        if usuario.get("tipo_cuenta") != "Administrador" and (
+            propietario is None or propietario != str(usuario.get("id"))
+        ):
+            return jsonify({"error": "Trabajo no encontrado"}), 404
+        return f(id_trabajo, *args, **kwargs)
+    return decorated_function
+
+@router_api.route("/api/pdf/trabajos/<id_trabajo>", methods=["GET"])
+@requiere_dueno_trabajo
+def estado_trabajo_pdf(id_trabajo):
+    """Estado de los PDFs encolados tras una compra, con la URL de descarga de cada boleto"""
+    estado = cola_pdf.estado(id_trabajo)
+    if estado is None:
+        return jsonify({"error": "Trabajo no encontrado"}), 404
+    estado["descargas"] = {
+        id_boleto: url_for("router_api.descargar_trabajo_pdf", id_trabajo=id_trabajo, id_boleto=id_boleto)
+        for id_boleto in estado["boletos"]
+    }
+    return jsonify(estado)
+
+@router_api.route("/api/pdf/trabajos/<id_trabajo>/<int:id_boleto>", methods=["GET"])
+@requiere_dueno_trabajo
+def descargar_trabajo_pdf(id_trabajo, id_boleto):
+    """PDF de un boleto del trabajo; si aún no está listo se espera o se genera aquí"""
+    resultado = cola_pdf.contenido(id_trabajo, id_boleto)
+    if resultado is None:
+        return jsonify({"error": "Trabajo no encontrado"}), 404
+    etag, contenido = resultado
+    if etag in request.if_none_match:
+        response = make_response("", 304)
+        response.set_etag(etag)
+        return response
+    response = send_file(
+        io.BytesIO(contenido),
+        mimetype="application/pdf",
+        as_attachment=True,
+        download_name=f"boleto_{id_boleto}.pdf",
+        etag=etag,
+    )
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,122 @@
+import threading
+import time
+
+from ..config import ASIENTOS_TTL
+from .cache_catalogo import cache_catalogo
+from .cliente_http import cliente_backend
+
+
+# Un byte por asiento: el índice en ESTADOS es el valor guardado
+ESTADOS = ("disponible", "reservado", "vendido")
+_CODIGOS = {"Reservado": 1, "Vendido": 2}
+
+
+class EstadoAsientos:
+    """Ocupación de asientos por id_turno en un bytearray del tamaño del bus.
+
+    Cada turno se carga con /api/boleto/buscar/turno.id_turno/<id> y luego se
+    actualiza con los boletos que guarda este worker. Se recarga si otra
+    escritura de boletos cambió la generación "boleto" o si pasaron
+    ASIENTOS_TTL segundos, porque las compras de la app móvil y de otros
+    workers no cambian la generación local. Antes de confirmar una compra,
+    ocupados() consulta siempre al backend.
+    """
+
+    def __init__(self, cliente=cliente_backend, cache=cache_catalogo, ttl=ASIENTOS_TTL):
+        self.cliente = cliente
+        self.cache = cache
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._mapas = {}
+        self._generaciones = {}
+        self._cargados = {}
+
+    @staticmethod
+    def _id_turno(boleto):
+        return str((boleto.get("turno") or {}).get("id_turno"))
+
+    @staticmethod
+    def _marcar(mapa, boleto):
+        codigo = _CODIGOS.get(boleto.get("estado_boleto"))
+        asiento = boleto.get("numero_asiento")
+        if codigo and isinstance(asiento, int) and 0 < asiento <= len(mapa):
+            mapa[asiento - 1] = codigo
+
+    def _cargar(self, id_turno, capacidad):
+        r = self.cliente.get(f"/api/boleto/buscar/turno.id_turno/{id_turno}")
+        r.raise_for_status()
+        mapa = bytearray(capacidad)
+        for boleto in r.json().get("boletos", []):
+            # La búsqueda del backend es por "contiene": filtrar el turno exacto
+            if self._id_turno(boleto) == str(id_turno):
+                self._marcar(mapa, boleto)
+        return mapa
+
+    def _recargar(self, id_turno, capacidad):
+        clave = str(id_turno)
+        generacion = self.cache.generacion("boleto")
+        mapa = self._cargar(id_turno, capacidad)
+        with self._lock:
+            self._mapas[clave] = mapa
+            self._generaciones[clave] = generacion
+            self._cargados[clave] = time.monotonic()
+            return bytes(mapa)
+
+    def mapa(self, id_turno, capacidad):
+        """Copia del bytearray de ocupación del turno"""
+        clave = str(id_turno)
+        generacion = self.cache.generacion("boleto")
+        with self._lock:
+            mapa = self._mapas.get(clave)
+            if (
+                mapa is not None
+                and len(mapa) == capacidad
+                and self._generaciones.get(clave) == generacion
+                and time.monotonic() - self._cargados.get(clave, 0.0) < self.ttl
+            ):
+                return bytes(mapa)
+        return self._recargar(id_turno, capacidad)
+
+    def ocupados(self, id_turno, capacidad, asientos):
+        """Asientos de la lista ya reservados o vendidos según el backend, sin usar el mapa en memoria"""
+        mapa = self._recargar(id_turno, capacidad)
+        ocupados = []
+        for asiento in asientos:
+            try:
+                numero = int(asiento)
+            except (TypeError, ValueError):
+                continue
+            if 0 < numero <= len(mapa) and mapa[numero - 1]:
+                ocupados.append(numero)
+        return ocupados
+
+    def estados(self, id_turno, capacidad):
+        """Lista de "disponible"/"reservado"/"vendido" por asiento, como la espera la plantilla"""
+        return [ESTADOS[codigo] for codigo in self.mapa(id_turno, capacidad)]
+
+    def registrar(self, boletos):
+        """Marca los asientos de boletos recién guardados por este worker.
+
+        Igual que IndiceBoletos.agregar: solo se confía en el mapa si la única
+        escritura desde la carga fue la propia; si no, se recarga al leerlo.
+        """
+        generacion = self.cache.generacion("boleto")
+        agotado = False
+        with self._lock:
+            for boleto in boletos or ():
+                clave = self._id_turno(boleto)
+                mapa = self._mapas.get(clave)
+                if mapa is None:
+                    continue
+                if self._generaciones.get(clave) in (generacion, generacion - 1):
+                    self._marcar(mapa, boleto)
+                    self._generaciones[clave] = generacion
+                    agotado = agotado or mapa.count(2) == len(mapa)
+                else:
+                    self._generaciones.pop(clave, None)
+        if agotado:
+            # El backend marca el turno como Agotado al vender el último asiento
+            self.cache.invalidar("turno")
+
+
+estado_asientos = EstadoAsientos()
@@ -0,0 +1,228 @@
+import re
+import threading
+import time
+
+try:
+    import redis
+except ImportError:  # dependencia opcional, solo para el backend compartido
+    redis = None
+
+from ..config import CATALOGO_CACHE_TTL, CATALOGO_CACHE_URL
+from .registro import obtener_registro
+
+log = obtener_registro("cache_catalogo")
+
+
+# Colecciones de catálogo que solo cambian cuando un administrador guarda algo
+COLECCIONES = ("cooperativa", "bus", "ruta", "horario", "turno", "escala", "descuento")
+
+# Los objetos viajan anidados (turno.horario.ruta.bus.cooperativa), así que una
+# escritura invalida también las colecciones que la contienen.
+DEPENDENCIAS = {
+    "cooperativa": ("cooperativa", "bus", "ruta", "horario", "turno"),
+    "bus": ("bus", "ruta", "horario", "turno"),
+    "ruta": ("ruta", "horario", "turno"),
+    "escala": ("escala", "ruta", "horario", "turno"),
+    "horario": ("horario", "turno"),
+    "turno": ("turno",),
+    "descuento": ("descuento",),
+    # Un boleto solo cambia su turno cuando vende el último asiento (estado
+    # Agotado); ese caso lo invalida EstadoAsientos.registrar al ver el bus lleno
+    "boleto": ("boleto",),
+    # Personas y boletos no se cachean, pero su generación invalida sus índices
+    "persona": ("persona",),
+    "cuenta": ("persona",),
+    # El método de pago viaja anidado en la persona
+    "pago": ("persona",),
+}
+
+_PATRON_LECTURA = re.compile(r"^/api/(?P<coleccion>[a-z_]+)/lista(?:/\d+)?/?$")
+_PATRON_ESCRITURA = re.compile(r"^/api/(?P<entidad>[a-z_]+)/(?:guardar|actualizar|eliminar|comprar)\b")
+
+
+class BackendMemoria:
+    """Almacenamiento en memoria del proceso (un estado por worker).
+
+    Las claves de generaciones viejas no se vuelven a leer, así que las
+    entradas vencidas se purgan al escribir, como mucho una vez por segundo.
+    """
+
+    INTERVALO_PURGA = 1.0
+
+    def __init__(self):
+        self._datos = {}
+        self._lock = threading.Lock()
+        self._proxima_purga = 0.0
+
+    def leer(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            valor, expira = entrada
+            if expira is not None and expira < time.monotonic():
+                del self._datos[clave]
+                return None
+            return valor
+
+    def escribir(self, clave, valor, ttl=None):
+        ahora = time.monotonic()
+        expira = ahora + ttl if ttl else None
+        with self._lock:
+            if ahora >= self._proxima_purga:
+                self._purgar(ahora)
+            self._datos[clave] = (valor, expira)
+
+    def _purgar(self, ahora):
+        vencidas = [clave for clave, (_, expira) in self._datos.items() if expira is not None and expira < ahora]
+        for clave in vencidas:
+            del self._datos[clave]
+        self._proxima_purga = ahora + self.INTERVALO_PURGA
+
+    def incrementar(self, clave):
+        with self._lock:
+            valor = int(self._datos.get(clave, (0, None))[0]) + 1
+            self._datos[clave] = (valor, None)
+            return valor
+
+    def leer_entero(self, clave):
+        with self._lock:
+            return int(self._datos.get(clave, (0, None))[0])
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+
+class BackendRedis:
+    """Almacenamiento compartido entre workers de gunicorn."""
+
+    def __init__(self, url):
+        self._cliente = redis.Redis.from_url(url)
+
+    def leer(self, clave):
+        return self._cliente.get(clave)
+
+    def escribir(self, clave, valor, ttl=None):
+        self._cliente.set(clave, valor, ex=int(ttl) if ttl else None)
+
+    def incrementar(self, clave):
+        return int(self._cliente.incr(clave))
+
+    def leer_entero(self, clave):
+        valor = self._cliente.get(clave)
+        return int(valor) if valor else 0
+
+    def limpiar(self):
+        for clave in self._cliente.scan_iter("catalogo:*"):
+            self._cliente.delete(clave)
+
+
+def crear_backend(url=CATALOGO_CACHE_URL):
+    if url and url.startswith(("redis://", "rediss://", "unix://")):
+        if redis is None:
+            log.warning("redis_no_disponible", detalle="CATALOGO_CACHE_URL requiere el paquete 'redis'; se usa memoria local")
+            return BackendMemoria()
+        return BackendRedis(url)
+    return BackendMemoria()
+
+
+class CacheCatalogo:
+    """Caché read-through de las listas de catálogo con TTL e invalidación por escritura.
+
+    Las claves incluyen una generación por colección: invalidar es incrementar
+    la generación, de modo que las entradas viejas dejan de leerse al instante
+    en todos los workers que comparten el backend.
+    """
+
+    def __init__(self, backend=None, ttl=CATALOGO_CACHE_TTL):
+        self.backend = backend if backend is not None else crear_backend()
+        self.ttl = ttl
+        self._ttls = {}
+        self._lock = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._invalidaciones = 0
+
+    @staticmethod
+    def coleccion_de(path):
+        """Colección de catálogo a la que pertenece una ruta GET, o None"""
+        coincidencia = _PATRON_LECTURA.match(path)
+        if coincidencia and coincidencia.group("coleccion") in COLECCIONES:
+            return coincidencia.group("coleccion")
+        return None
+
+    def generacion(self, coleccion):
+        """Número de escrituras registradas para la colección (compartido entre workers)"""
+        return self.backend.leer_entero(f"catalogo:gen:{coleccion}")
+
+    def _clave(self, coleccion, path, generacion=None):
+        if generacion is None:
+            generacion = self.generacion(coleccion)
+        return f"catalogo:{coleccion}:{generacion}:{path}"
+
+    def generacion_de(self, path):
+        """Generación de la colección de la ruta; se lee antes de pedirla al backend para pasarla a guardar()"""
+        coleccion = self.coleccion_de(path)
+        return None if coleccion is None else self.generacion(coleccion)
+
+    def obtener(self, path):
+        coleccion = self.coleccion_de(path)
+        if coleccion is None:
+            return None
+        valor = self.backend.leer(self._clave(coleccion, path))
+        with self._lock:
+            if valor is None:
+                self._fallos += 1
+            else:
+                self._aciertos += 1
+        return valor
+
+    def configurar_ttl(self, coleccion, ttl):
+        """TTL propio de una colección en lugar del general"""
+        self._ttls[coleccion] = ttl
+
+    def guardar(self, path, contenido, generacion=None):
+        """Guarda la respuesta bajo la generación leída al pedirla.
+
+        Si hubo una escritura mientras la petición estaba en curso, el cuerpo
+        puede ser anterior a ella y se descarta en lugar de quedar como vigente.
+        """
+        coleccion = self.coleccion_de(path)
+        if coleccion is None:
+            return
+        if generacion is not None and generacion != self.generacion(coleccion):
+            return
+        self.backend.escribir(
+            self._clave(coleccion, path, generacion), contenido, self._ttls.get(coleccion, self.ttl)
+        )
+
+    def invalidar(self, *colecciones):
+        for coleccion in colecciones:
+            self.backend.incrementar(f"catalogo:gen:{coleccion}")
+        with self._lock:
+            self._invalidaciones += len(colecciones)
+
+    def invalidar_por_escritura(self, path):
+        """Invalida las colecciones afectadas por un guardar/actualizar/eliminar"""
+        coincidencia = _PATRON_ESCRITURA.match(path)
+        if coincidencia:
+            colecciones = DEPENDENCIAS.get(coincidencia.group("entidad"), ())
+            if colecciones:
+                self.invalidar(*colecciones)
+
+    def estadisticas(self):
+        with self._lock:
+            total = self._aciertos + self._fallos
+            return {
+                "backend": type(self.backend).__name__,
+                "ttl": self.ttl,
+                "ttl_por_coleccion": dict(self._ttls),
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "invalidaciones": self._invalidaciones,
+                "ratio_aciertos": round(self._aciertos / total, 3) if total else 0,
+            }
+
+
+cache_catalogo = CacheCatalogo()
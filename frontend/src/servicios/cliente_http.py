@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import API_URL, BACKEND_POOL_BLOCK, BACKEND_POOL_SIZE, BACKEND_SINGLEFLIGHT_MS, BACKEND_TIMEOUT
+from .cache_catalogo import cache_catalogo
+from .instrumentacion import registrar_llamada
+from .singleflight import Singleflight
+
+
+class _SinCookies(DefaultCookiePolicy):
+    # La sesión HTTP es compartida por todos los usuarios del worker: nunca
+    # debe guardar cookies que el backend devuelva a un usuario concreto.
+    def set_ok(self, cookie, request):
+        return False
+
+
+def _respuesta_desde_cache(url, contenido):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = contenido
+    resp.encoding = "utf-8"
+    resp.url = url
+    resp.headers["Content-Type"] = "application/json"
+    resp.headers["X-Cache"] = "HIT"
+    return resp
+
+
+class ClienteBackend:
+    """Cliente HTTP compartido hacia el backend Java con pool de conexiones keep-alive."""
+
+    def __init__(self, base_url=API_URL, pool_size=BACKEND_POOL_SIZE, pool_block=BACKEND_POOL_BLOCK,
+                 timeout=BACKEND_TIMEOUT, cache=cache_catalogo, singleflight_ms=BACKEND_SINGLEFLIGHT_MS):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.singleflight = Singleflight(singleflight_ms / 1000)
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.timeout = timeout
+        self._sesion = None
+        self._adaptador = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._en_uso = 0
+        self._max_en_uso = 0
+        self._peticiones = 0
+        self._errores = 0
+
+    def _obtener_sesion(self):
+        # Un pool por proceso: si gunicorn hizo fork después de crear la sesión,
+        # los sockets heredados no se comparten y se crea una sesión nueva.
+        pid = os.getpid()
+        if self._sesion is None or self._pid != pid:
+            with self._lock:
+                if self._sesion is None or self._pid != pid:
+                    sesion = requests.Session()
+                    sesion.cookies.set_policy(_SinCookies())
+                    sesion.headers["Connection"] = "keep-alive"
+                    adaptador = HTTPAdapter(
+                        pool_connections=self.pool_size,
+                        pool_maxsize=self.pool_size,
+                        pool_block=self.pool_block,
+                    )
+                    sesion.mount("http://", adaptador)
+                    sesion.mount("https://", adaptador)
+                    self._sesion = sesion
+                    self._adaptador = adaptador
+                    self._pid = pid
+        return self._sesion
+
+    def url(self, path):
+        if str(path).startswith("http"):
+            return path
+        if str(path).startswith("/"):
+            return self.base_url + path
+        return self.base_url + "/" + path
+
+    def _ruta_backend(self, url):
+        # Ruta relativa al backend (sin query) o None si la URL es de otro servicio
+        if not url.startswith(self.base_url):
+            return None
+        partes = urlsplit(url)
+        if partes.query:
+            return None
+        return partes.path
+
+    def request(self, method, path, **kwargs):
+        url = self.url(path)
+        ruta = self._ruta_backend(url) if self.cache is not None else None
+        if ruta is None:
+            return self._enviar(method, url, **kwargs)
+        if method.upper() != "GET":
+            try:
+                return self._enviar(method, url, **kwargs)
+            finally:
+                self.cache.invalidar_por_escritura(ruta)
+                self.singleflight.olvidar()
+        if kwargs.get("params") or not self.cache.coleccion_de(ruta):
+            return self._get_compartido(url, kwargs)
+        contenido = self.cache.obtener(ruta)
+        if contenido is not None:
+            return _respuesta_desde_cache(url, contenido)
+        return self._get_compartido(url, kwargs, ruta)
+
+    def recargar(self, path):
+        """GET de una lista de catálogo saltando la caché; la respuesta 200 la reemplaza"""
+        url = self.url(path)
+        ruta = self._ruta_backend(url)
+        if ruta is None or self.cache is None or not self.cache.coleccion_de(ruta):
+            return self._get_compartido(url, {})
+        return self._get_compartido(url, {}, ruta)
+
+    def _get_compartido(self, url, kwargs, ruta_cache=None):
+        # Los GET simultáneos a la misma URL (y mismas cabeceras) comparten la
+        # respuesta, que ya viene leída completa y se puede leer desde varios hilos.
+        if kwargs.get("params") or kwargs.get("stream"):
+            return self._enviar("GET", url, **kwargs)
+        cabeceras = tuple(sorted((k.lower(), v) for k, v in (kwargs.get("headers") or {}).items()))
+
+        def llamar():
+            # La generación se lee antes de pedir: así una escritura que llegue
+            # mientras la respuesta viaja no deja guardado el cuerpo anterior
+            generacion = self.cache.generacion_de(ruta_cache) if ruta_cache is not None else None
+            resp = self._enviar("GET", url, **kwargs)
+            if ruta_cache is not None and resp.status_code == 200:
+                self.cache.guardar(ruta_cache, resp.content, generacion)
+            return resp
+
+        return self.singleflight.hacer((url, cabeceras), llamar)
+
+    def _enviar(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        sesion = self._obtener_sesion()
+        with self._lock:
+            self._en_uso += 1
+            self._peticiones += 1
+            self._max_en_uso = max(self._max_en_uso, self._en_uso)
+        inicio = time.perf_counter()
+        transmitida = False
+        try:
+            resp = sesion.request(method, url, **kwargs)
+            # Con stream=True el cuerpo aún no se leyó: se usa Content-Length si viene
+            tamano = int(resp.headers.get("Content-Length", 0)) if kwargs.get("stream") else len(resp.content)
+            registrar_llamada(method, url, resp.status_code, tamano, (time.perf_counter() - inicio) * 1000)
+            if kwargs.get("stream"):
+                self._liberar_al_cerrar(resp)
+                transmitida = True
+            return resp
+        except requests.exceptions.RequestException as e:
+            registrar_llamada(method, url, type(e).__name__, 0, (time.perf_counter() - inicio) * 1000)
+            with self._lock:
+                self._errores += 1
+            raise
+        finally:
+            if not transmitida:
+                with self._lock:
+                    self._en_uso -= 1
+
+    def _liberar_al_cerrar(self, resp):
+        # Con stream=True la conexión sigue ocupada mientras se lee el cuerpo:
+        # cuenta como en uso hasta que se cierre la respuesta (una sola vez)
+        cerrar = resp.close
+        pendiente = [True]
+
+        def close():
+            try:
+                cerrar()
+            finally:
+                with self._lock:
+                    if pendiente:
+                        pendiente.pop()
+                        self._en_uso -= 1
+
+        resp.close = close
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def estadisticas(self):
+        """Utilización del pool de conexiones del worker actual"""
+        conexiones_creadas = 0
+        conexiones_libres = 0
+        if self._adaptador is not None and self._pid == os.getpid():
+            pools = self._adaptador.poolmanager.pools
+            for clave in pools.keys():
+                try:
+                    pool = pools[clave]
+                except KeyError:
+                    continue
+                conexiones_creadas += getattr(pool, "num_connections", 0)
+                if pool.pool is not None:
+                    conexiones_libres += sum(1 for c in list(pool.pool.queue) if c is not None)
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "pool_size": self.pool_size,
+                "pool_block": self.pool_block,
+                "en_uso": self._en_uso,
+                "max_en_uso": self._max_en_uso,
+                "utilizacion": round(self._en_uso / self.pool_size, 3) if self.pool_size else 0,
+                "peticiones": self._peticiones,
+                "errores": self._errores,
+                "conexiones_creadas": conexiones_creadas,
+                "conexiones_libres": conexiones_libres,
+                "conexiones_reutilizadas": max(self._peticiones - conexiones_creadas, 0),
+                "singleflight": self.singleflight.estadisticas(),
+            }
+
+
+cliente_backend = ClienteBackend()
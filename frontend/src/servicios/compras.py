@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from ..config import COMPRA_MAX_PARALELO
+from .cliente_http import cliente_backend
+from .registro import obtener_registro
+
+log = obtener_registro("comprar_asientos")
+
+
+# Respuestas con las que el backend indica que /api/boleto/guardar no acepta lotes
+_SIN_LOTES = (404, 405, 501)
+
+
+def _mensaje(response):
+    try:
+        return response.json().get("msg") or response.text
+    except ValueError:
+        return response.text
+
+
+def _guardar(cliente, datos, asientos):
+    """POST /api/boleto/guardar; devuelve (boletos, saldo_restante, error, status)"""
+    try:
+        response = cliente.post(
+            "/api/boleto/guardar",
+            headers={"Content-Type": "application/json"},
+            json={**datos, "asientos": asientos},
+        )
+    except requests.exceptions.RequestException as e:
+        return [], None, f"Error de conexión: {e}", None
+    if response.status_code != 200:
+        return [], None, _mensaje(response), response.status_code
+    cuerpo = response.json()
+    boletos = cuerpo.get("boletos")
+    if boletos is None:
+        boletos = [cuerpo["boleto"]] if cuerpo.get("boleto") else []
+    return boletos, cuerpo.get("saldo_restante"), None, 200
+
+
+def comprar_asientos(datos, asientos, cliente=cliente_backend, max_paralelo=COMPRA_MAX_PARALELO):
+    """Guarda todos los asientos en una sola llamada al backend.
+
+    Si el backend no acepta lotes, guarda un asiento por llamada en paralelo.
+    Devuelve {"boletos", "asientos": [{"asiento", "success", ...}], "saldo_restante"}.
+    """
+    boletos, saldo_restante, error, status = _guardar(cliente, datos, list(asientos))
+    por_asiento = {}
+    if status in _SIN_LOTES:
+        log.info("compra_sin_lotes", estado=status, asientos=len(asientos))
+        with ThreadPoolExecutor(max_workers=max(1, min(len(asientos), max_paralelo))) as executor:
+            resultados = list(executor.map(lambda a: (a, _guardar(cliente, datos, [a])), asientos))
+        boletos, saldos = [], []
+        for asiento, (creados, saldo, error_asiento, _) in resultados:
+            boletos.extend(creados)
+            if saldo is not None:
+                saldos.append(saldo)
+            if error_asiento:
+                por_asiento[asiento] = error_asiento
+        saldo_restante = min(saldos) if saldos else None
+        error = None
+    creados = {str(b.get("numero_asiento")): b for b in boletos}
+    detalle = []
+    for asiento in asientos:
+        boleto = creados.get(str(asiento))
+        if boleto is not None:
+            detalle.append({"asiento": asiento, "success": True, "id_boleto": boleto.get("id_boleto")})
+        else:
+            mensaje = error or por_asiento.get(asiento) or "El backend no confirmó el asiento"
+            detalle.append({"asiento": asiento, "success": False, "message": mensaje})
+    return {"boletos": boletos, "asientos": detalle, "saldo_restante": saldo_restante}
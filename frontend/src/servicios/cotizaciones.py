@@ -0,0 +1,79 @@
+import threading
+import time
+
+from ..config import COTIZACION_CACHE_TTL
+from .descuentos import motor_descuentos
+from .personas_sesion import personas_sesion
+
+
+# A partir de este tamaño cada inserción limpia las entradas vencidas
+_MAX_ENTRADAS = 1000
+
+
+class CacheCotizaciones:
+    """Cotizaciones de /api/metodos-pago/usuario, válidas unos segundos.
+
+    Mientras el usuario marca y desmarca asientos, el checkout pide lo mismo
+    muchas veces. Las cotizaciones se guardan por (usuario_id, tipo_tarifa,
+    asientos, precio_unitario, fecha) y dejan de valer cuando se recompilan
+    los descuentos. La persona sale de personas_sesion. Las compras y
+    transferencias de saldo del usuario invalidan ambas explícitamente; el TTL
+    acota lo que otro worker pudiera haber cambiado.
+    """
+
+    def __init__(self, ttl=COTIZACION_CACHE_TTL, motor=motor_descuentos, personas=personas_sesion):
+        self.ttl = ttl
+        self.motor = motor
+        self.personas = personas
+        self._lock = threading.Lock()
+        self._cotizaciones = {}
+        self._aciertos = 0
+        self._fallos = 0
+
+    def _leer(self, tabla, clave, etiqueta):
+        with self._lock:
+            entrada = tabla.get(clave)
+            if entrada is not None and entrada[1] > time.monotonic() and entrada[2] == etiqueta:
+                self._aciertos += 1
+                return entrada[0]
+            self._fallos += 1
+            return None
+
+    def _guardar(self, tabla, clave, valor, etiqueta):
+        ahora = time.monotonic()
+        with self._lock:
+            if len(tabla) >= _MAX_ENTRADAS:
+                for vencida in [c for c, e in tabla.items() if e[1] <= ahora]:
+                    del tabla[vencida]
+            tabla[clave] = (valor, ahora + self.ttl, etiqueta)
+
+    def cotizacion(self, usuario_id, tipo_tarifa, asientos, precio_unitario, fecha, calcular):
+        clave = (str(usuario_id), tipo_tarifa, asientos, precio_unitario, fecha)
+        version = self.motor.version
+        cotizacion = self._leer(self._cotizaciones, clave, version)
+        if cotizacion is None:
+            cotizacion = calcular()
+            self._guardar(self._cotizaciones, clave, cotizacion, version)
+        return cotizacion
+
+    def invalidar_usuario(self, usuario_id):
+        """Descarta lo guardado del usuario (tras una compra o un movimiento de saldo)"""
+        self.personas.invalidar(usuario_id)
+        usuario_id = str(usuario_id)
+        with self._lock:
+            for clave in [c for c in self._cotizaciones if c[0] == usuario_id]:
+                del self._cotizaciones[clave]
+
+    def estadisticas(self):
+        with self._lock:
+            total = self._aciertos + self._fallos
+            return {
+                "ttl": self.ttl,
+                "cotizaciones": len(self._cotizaciones),
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "ratio_aciertos": round(self._aciertos / total, 3) if total else 0,
+            }
+
+
+cache_cotizaciones = CacheCotizaciones()
@@ -0,0 +1,104 @@
+import threading
+from bisect import bisect_right
+from datetime import date, datetime
+
+from .refresco_catalogo import refresco_catalogo
+from .registro import obtener_registro
+
+log = obtener_registro("descuentos")
+
+
+def _fecha(texto):
+    return datetime.strptime(texto, "%d/%m/%Y").date()
+
+
+class MotorDescuentos:
+    """Reglas de descuento compiladas a partir de /api/descuento/lista.
+
+    Los descuentos activos se agrupan por tipo_tarifa y las promociones se
+    convierten en un índice de intervalos: las fechas de inicio y fin parten
+    el calendario en tramos y cada tramo guarda ya las promociones vigentes.
+    Una cotización es una búsqueda por tarifa más una bisección por fecha, sin
+    parsear fechas. Se recompila cuando cambia la lista en memoria, es decir,
+    después de cualquier escritura de descuentos.
+    """
+
+    def __init__(self, refresco=refresco_catalogo):
+        self.refresco = refresco
+        self._lock = threading.Lock()
+        self._origen = None
+        self._por_tarifa = {}
+        self._limites = []
+        self._tramos = [()]
+        self.version = 0
+
+    def _compilar(self, descuentos):
+        por_tarifa = {}
+        promociones = []
+        for d in descuentos:
+            if d.get("estado_descuento") != "Activo":
+                continue
+            if d.get("tipo_descuento") == "Promocional":
+                if "fecha_inicio" not in d or "fecha_fin" not in d:
+                    continue
+                try:
+                    # fecha_fin es exclusiva: la promoción deja de aplicarse al iniciar ese día
+                    inicio, fin = _fecha(d["fecha_inicio"]), _fecha(d["fecha_fin"])
+                except (TypeError, ValueError):
+                    log.warning("fechas_invalidas", id_descuento=d.get("id_descuento"))
+                    continue
+                if inicio < fin:
+                    regla = {
+                        "nombre": d["nombre_descuento"],
+                        "porcentaje": d["porcentaje"],
+                        "tipo": "Promocional",
+                        "vigencia": f"Válido hasta {d['fecha_fin']}",
+                    }
+                    promociones.append((inicio, fin, regla))
+            else:
+                regla = {"nombre": d["nombre_descuento"], "porcentaje": d["porcentaje"], "tipo": "Tarifa Base"}
+                por_tarifa.setdefault(d.get("tipo_descuento"), []).append(regla)
+        limites = sorted({f for inicio, fin, _ in promociones for f in (inicio, fin)})
+        # Tramo i = [limites[i-1], limites[i]); el tramo 0 es todo lo anterior al primer límite
+        tramos = [()]
+        for limite in limites:
+            tramos.append(tuple(r for inicio, fin, r in promociones if inicio <= limite < fin))
+        self._por_tarifa = {tarifa: tuple(reglas) for tarifa, reglas in por_tarifa.items()}
+        self._limites = limites
+        self._tramos = tramos
+        self.version += 1
+
+    def actualizar(self):
+        """Recompila si la lista de descuentos cambió; devuelve su edad en segundos o None si no hay datos"""
+        try:
+            datos, edad = self.refresco.leer("descuento")
+        except RuntimeError:
+            return None
+        if datos is not self._origen:
+            with self._lock:
+                if datos is not self._origen:
+                    self._compilar(datos.get("descuentos", []))
+                    self._origen = datos
+        return edad
+
+    def aplicables(self, tipo_tarifa, fecha=None):
+        """Reglas que aplican a la tarifa en la fecha (hoy por defecto), tarifa base primero"""
+        fecha = fecha or date.today()
+        with self._lock:
+            tramo = self._tramos[bisect_right(self._limites, fecha)]
+            return self._por_tarifa.get(tipo_tarifa, ()) + tramo
+
+    def cotizar(self, tipo_tarifa, precio_original, fecha=None):
+        reglas = self.aplicables(tipo_tarifa, fecha)
+        porcentaje_total = sum(r["porcentaje"] for r in reglas)
+        descuento_monto = precio_original * (porcentaje_total / 100)
+        return {
+            "descuentos_aplicables": [dict(r) for r in reglas],
+            "porcentaje_descuento_total": porcentaje_total,
+            "ahorro_total": descuento_monto,
+            "precio_original": precio_original,
+            "precio_final": precio_original - descuento_monto,
+        }
+
+
+motor_descuentos = MotorDescuentos()
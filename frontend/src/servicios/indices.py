@@ -0,0 +1,336 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+from ..config import BOLETOS_PERSONA_TTL, CATALOGO_CACHE_TTL
+from .cache_catalogo import cache_catalogo
+from .cliente_http import cliente_backend
+
+
+def _normalizar_fecha(fecha):
+    # "1/2/2025" y "01/02/2025" son el mismo día; si no se puede interpretar
+    # se compara el texto tal cual, como hacían las búsquedas originales.
+    try:
+        return datetime.strptime(str(fecha).strip(), "%d/%m/%Y").date()
+    except (TypeError, ValueError):
+        return fecha
+
+
+class IndiceTurnos:
+    """Índice en memoria de turnos por (origen, destino, fecha_salida).
+
+    Se construye una vez a partir de /api/turno/lista y se refresca de forma
+    incremental: solo los turnos nuevos, modificados o eliminados se vuelven a
+    indexar. Las claves secundarias permiten buscar por id_bus y hora_salida.
+    """
+
+    def __init__(self, cliente=cliente_backend):
+        self.cliente = cliente
+        self._lock = threading.Lock()
+        self._contenido = None
+        self._firma = None
+        self._por_id = {}
+        self._por_viaje = {}
+        self._por_bus = {}
+        self._por_salida = {}
+
+    @staticmethod
+    def _claves(turno):
+        horario = turno.get("horario") or {}
+        ruta = horario.get("ruta") or {}
+        bus = ruta.get("bus") or {}
+        viaje = (ruta.get("origen"), ruta.get("destino"), _normalizar_fecha(turno.get("fecha_salida")))
+        return viaje, bus.get("id_bus"), viaje + (horario.get("hora_salida"),)
+
+    def _agregar(self, turno):
+        id_turno = turno.get("id_turno")
+        viaje, id_bus, salida = self._claves(turno)
+        self._por_id[id_turno] = turno
+        self._por_viaje.setdefault(viaje, {})[id_turno] = turno
+        self._por_bus.setdefault(id_bus, set()).add(id_turno)
+        self._por_salida.setdefault(salida, {})[id_turno] = turno
+
+    def _quitar(self, id_turno):
+        turno = self._por_id.pop(id_turno, None)
+        if turno is None:
+            return
+        viaje, id_bus, salida = self._claves(turno)
+        for indice, clave in ((self._por_viaje, viaje), (self._por_salida, salida)):
+            grupo = indice.get(clave)
+            if grupo is not None:
+                grupo.pop(id_turno, None)
+                if not grupo:
+                    del indice[clave]
+        ids_bus = self._por_bus.get(id_bus)
+        if ids_bus is not None:
+            ids_bus.discard(id_turno)
+            if not ids_bus:
+                del self._por_bus[id_bus]
+
+    def actualizar(self, turnos):
+        """Aplica al índice solo las diferencias con la lista recibida"""
+        recibidos = {t.get("id_turno"): t for t in turnos}
+        with self._lock:
+            for id_turno in [i for i in self._por_id if i not in recibidos]:
+                self._quitar(id_turno)
+            for id_turno, turno in recibidos.items():
+                actual = self._por_id.get(id_turno)
+                if actual is None or actual != turno:
+                    self._quitar(id_turno)
+                    self._agregar(turno)
+
+    def refrescar(self):
+        """Sincroniza con el backend; devuelve False si nunca se pudo cargar"""
+        try:
+            r = self.cliente.get("/api/turno/lista")
+        except Exception:
+            return self._contenido is not None
+        if r.status_code != 200:
+            return self._contenido is not None
+        contenido = r.content
+        if contenido is self._contenido:
+            return True
+        firma = hashlib.blake2b(contenido, digest_size=16).digest()
+        if firma != self._firma:
+            self.actualizar(json.loads(contenido).get("turnos", []))
+        self._contenido = contenido
+        self._firma = firma
+        return True
+
+    def buscar(self, origen, destino, fecha):
+        with self._lock:
+            return list(self._por_viaje.get((origen, destino, _normalizar_fecha(fecha)), {}).values())
+
+    def buscar_salida(self, origen, destino, fecha, hora_salida):
+        with self._lock:
+            clave = (origen, destino, _normalizar_fecha(fecha), hora_salida)
+            return list(self._por_salida.get(clave, {}).values())
+
+    def por_bus(self, id_bus):
+        with self._lock:
+            return [self._por_id[i] for i in self._por_bus.get(id_bus, ())]
+
+    def turno_de_bus(self, id_bus, origen, destino, fecha):
+        with self._lock:
+            grupo = self._por_viaje.get((origen, destino, _normalizar_fecha(fecha)), {})
+            ids_bus = self._por_bus.get(id_bus, set())
+            return next((t for i, t in grupo.items() if i in ids_bus), None)
+
+
+def _normalizar_correo(correo):
+    return str(correo or "").strip().lower()
+
+
+def _correos_de(persona):
+    # Algunos registros guardan el correo dentro de persona['cuenta']
+    cuenta = persona.get("cuenta") or {}
+    return {c for c in (_normalizar_correo(persona.get("correo")), _normalizar_correo(cuenta.get("correo"))) if c}
+
+
+class IndicePersonas:
+    """Búsqueda de personas por correo, número de identificación y teléfono.
+
+    Cada consulta usa /api/persona/buscar/<campo>/<valor> y filtra la
+    coincidencia exacta (la búsqueda del backend es por "contiene"). Solo si
+    esa búsqueda falla se recurre a un índice en memoria armado con
+    /api/persona/lista, que guarda clave -> id_persona (nunca contraseñas ni
+    datos de pago) y se reconstruye cuando cambia la generación "persona" o
+    vence el TTL.
+    """
+
+    CAMPOS = ("numero_identificacion", "correo", "telefono")
+
+    def __init__(self, cliente=cliente_backend, cache=cache_catalogo, ttl=CATALOGO_CACHE_TTL):
+        self.cliente = cliente
+        self.cache = cache
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._generacion = None
+        self._cargado_en = 0.0
+        self._indices = {campo: {} for campo in self.CAMPOS}
+
+    @staticmethod
+    def _normalizar(campo, valor):
+        if campo == "correo":
+            return _normalizar_correo(valor)
+        return str(valor or "").strip()
+
+    def _vigente(self, generacion):
+        return self._generacion == generacion and time.monotonic() - self._cargado_en < self.ttl
+
+    def refrescar(self):
+        """Reconstruye el índice si hubo escrituras de personas; False si no está disponible"""
+        generacion = self.cache.generacion("persona")
+        if self._vigente(generacion):
+            return True
+        try:
+            r = self.cliente.get("/api/persona/lista")
+        except Exception:
+            return self._generacion is not None
+        if r.status_code != 200:
+            return self._generacion is not None
+        indices = {campo: {} for campo in self.CAMPOS}
+        for persona in r.json().get("personas", []):
+            id_persona = persona.get("id_persona")
+            claves = {
+                "numero_identificacion": {self._normalizar("numero_identificacion", persona.get("numero_identificacion"))},
+                "correo": _correos_de(persona),
+                "telefono": {self._normalizar("telefono", persona.get("telefono"))},
+            }
+            for campo, valores in claves.items():
+                for valor in valores:
+                    if valor:
+                        indices[campo].setdefault(valor, []).append(id_persona)
+        with self._lock:
+            self._indices = indices
+            self._generacion = generacion
+            self._cargado_en = time.monotonic()
+        return True
+
+    def _coincide(self, campo, valor, persona):
+        if campo == "correo":
+            return valor in _correos_de(persona)
+        return self._normalizar(campo, persona.get(campo)) == valor
+
+    def _buscar(self, campo, valor):
+        """Personas con ese valor exacto según la búsqueda del backend; None si la búsqueda falló"""
+        # El correo puede estar en la persona o solo en su cuenta
+        atributos = ("correo", "cuenta.correo") if campo == "correo" else (campo,)
+        encontradas = {}
+        for atributo in atributos:
+            try:
+                r = self.cliente.get(f"/api/persona/buscar/{atributo}/{quote(valor, safe='')}")
+            except Exception:
+                return None
+            if r.status_code != 200:
+                return None
+            for persona in r.json().get("cuentas", []):
+                if self._coincide(campo, valor, persona):
+                    encontradas[persona.get("id_persona")] = persona
+        return list(encontradas.values())
+
+    def _desde_indice(self, campo, valor):
+        self.refrescar()
+        with self._lock:
+            return list(self._indices[campo].get(valor, ()))
+
+    def buscar_ids(self, campo, valor):
+        valor = self._normalizar(campo, valor)
+        if not valor:
+            return []
+        personas = self._buscar(campo, valor)
+        if personas is None:
+            return self._desde_indice(campo, valor)
+        return [p.get("id_persona") for p in personas]
+
+    def conflicto(self, excluir_id=None, **valores):
+        """Primer campo (identificación, correo, teléfono) ya usado por otra persona, o None"""
+        for campo in self.CAMPOS:
+            if campo not in valores:
+                continue
+            if any(str(i) != str(excluir_id) for i in self.buscar_ids(campo, valores[campo])):
+                return campo
+        return None
+
+    def obtener(self, id_persona):
+        """Persona completa desde /api/persona/lista/<id>, o None"""
+        try:
+            r = self.cliente.get(f"/api/persona/lista/{id_persona}")
+        except Exception:
+            return None
+        if r.status_code != 200:
+            return None
+        return r.json().get("persona")
+
+    def buscar_por_correo(self, correo):
+        """Persona dueña de la cuenta con ese correo, sin descargar toda la tabla"""
+        correo = _normalizar_correo(correo)
+        if not correo:
+            return None
+        personas = self._buscar("correo", correo)
+        if personas is None:
+            personas = [p for p in map(self.obtener, self._desde_indice("correo", correo)) if p]
+        # Manda la cuenta con ese correo (la que inició sesión); el correo de la
+        # persona solo se usa si ninguna cuenta lo tiene
+        de_cuenta = (p for p in personas if _normalizar_correo((p.get("cuenta") or {}).get("correo")) == correo)
+        return next(de_cuenta, personas[0] if personas else None)
+
+
+class IndiceBoletos:
+    """Boletos agrupados por id_persona, cargados bajo demanda para cada usuario.
+
+    Cada persona se consulta con /api/boleto/buscar/persona.id_persona/<id>, así
+    que el costo depende de los boletos del usuario y no del total vendido. Las
+    compras hechas desde este worker se agregan sin volver a consultar. Se
+    recarga con cualquier otra escritura de boletos (generación "boleto") y,
+    como las compras de la app móvil o de otros workers no la cambian con la
+    caché en memoria, también a los BOLETOS_PERSONA_TTL segundos.
+    """
+
+    def __init__(self, cliente=cliente_backend, cache=cache_catalogo, ttl=BOLETOS_PERSONA_TTL):
+        self.cliente = cliente
+        self.cache = cache
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._por_persona = {}
+        self._generaciones = {}
+        self._cargados = {}
+
+    @staticmethod
+    def _id_persona(boleto):
+        return str((boleto.get("persona") or {}).get("id_persona"))
+
+    def _consultar(self, id_persona):
+        r = self.cliente.get(f"/api/boleto/buscar/persona.id_persona/{id_persona}")
+        if r.status_code == 200:
+            # La búsqueda del backend es por "contiene": el id 1 también trae 10, 11...
+            boletos = r.json().get("boletos", [])
+        else:
+            r = self.cliente.get("/api/boleto/lista")
+            r.raise_for_status()
+            boletos = r.json().get("boletos", [])
+        return [b for b in boletos if self._id_persona(b) == str(id_persona)]
+
+    def de_persona(self, id_persona):
+        """Boletos del usuario, consultando al backend si hubo otras escrituras o venció el TTL"""
+        clave = str(id_persona)
+        generacion = self.cache.generacion("boleto")
+        with self._lock:
+            if (
+                self._generaciones.get(clave) == generacion
+                and time.monotonic() - self._cargados.get(clave, 0.0) < self.ttl
+            ):
+                return list(self._por_persona[clave].values())
+        boletos = self._consultar(id_persona)
+        with self._lock:
+            self._por_persona[clave] = {b.get("id_boleto"): b for b in boletos}
+            self._generaciones[clave] = generacion
+            self._cargados[clave] = time.monotonic()
+        return boletos
+
+    def agregar(self, boletos):
+        """Agrega boletos recién creados por este worker a las personas ya cargadas.
+
+        Debe llamarse justo después de la escritura: si desde la última carga
+        hubo más escrituras que la propia, la persona se recarga en la próxima
+        consulta en lugar de confiar en el índice.
+        """
+        generacion = self.cache.generacion("boleto")
+        with self._lock:
+            for boleto in boletos or ():
+                clave = self._id_persona(boleto)
+                if clave not in self._por_persona:
+                    continue
+                if self._generaciones.get(clave) in (generacion, generacion - 1):
+                    self._por_persona[clave][boleto.get("id_boleto")] = boleto
+                    self._generaciones[clave] = generacion
+                else:
+                    self._generaciones.pop(clave, None)
+
+
+indice_turnos = IndiceTurnos()
+indice_personas = IndicePersonas()
+indice_boletos = IndiceBoletos()
@@ -0,0 +1,152 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from flask import before_render_template, g, request, template_rendered
+
+from ..config import INSTRUMENTACION
+from .metricas import metricas, normalizar_ruta
+from .registro import obtener_registro
+
+log = obtener_registro("peticion")
+
+
+_actual = contextvars.ContextVar("medicion", default=None)
+
+
+class Medicion:
+    """Tiempos de una petición: total, cada llamada al backend, plantillas y PDFs.
+
+    Las llamadas al backend pueden venir de los hilos de obtener_en_paralelo,
+    que heredan la medición con contextvars.copy_context(); por eso se
+    registran con un lock.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.llamadas = []
+        self.tiempos = {}
+        self._lock = threading.Lock()
+
+    def llamada(self, metodo, url, estado, tamano, ms):
+        with self._lock:
+            self.llamadas.append(
+                {"metodo": metodo, "ruta": urlsplit(url).path, "estado": estado, "bytes": tamano, "ms": round(ms, 1)}
+            )
+
+    def sumar(self, tipo, ms):
+        with self._lock:
+            self.tiempos[tipo] = self.tiempos.get(tipo, 0.0) + ms
+
+    def resumen(self):
+        with self._lock:
+            return {
+                "total_ms": round((time.perf_counter() - self.inicio) * 1000, 1),
+                "backend_ms": round(sum(l["ms"] for l in self.llamadas), 1),
+                **{f"{tipo}_ms": round(ms, 1) for tipo, ms in self.tiempos.items()},
+                "backend": list(self.llamadas),
+            }
+
+
+def registrar_llamada(metodo, url, estado, tamano, ms):
+    """Anota una llamada al backend en las métricas y en la petición en curso, si la hay"""
+    etiquetas = (("metodo", metodo), ("ruta", normalizar_ruta(urlsplit(url).path)))
+    metricas.observar("frontend_backend_segundos", etiquetas, ms / 1000)
+    metricas.contar("frontend_backend_respuestas_total", etiquetas + (("estado", str(estado)),))
+    medicion = _actual.get()
+    if medicion is not None:
+        medicion.llamada(metodo, url, estado, tamano, ms)
+
+
+def registrar_externa(servicio, estado, ms):
+    """Anota una llamada a un servicio externo (p. ej. Gemini) con su estado HTTP o el nombre del error"""
+    metricas.observar("frontend_externo_segundos", (("servicio", servicio),), ms / 1000)
+    metricas.contar("frontend_externo_respuestas_total", (("servicio", servicio), ("estado", str(estado))))
+    medicion = _actual.get()
+    if medicion is not None:
+        medicion.sumar(servicio, ms)
+
+
+def _render(tipo, ms):
+    metricas.observar("frontend_render_segundos", (("tipo", tipo),), ms / 1000)
+    medicion = _actual.get()
+    if medicion is not None:
+        medicion.sumar(tipo, ms)
+
+
+@contextmanager
+def medir(tipo):
+    """Mide el render del bloque (p. ej. "pdf") en las métricas y en la petición en curso"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _render(tipo, (time.perf_counter() - inicio) * 1000)
+
+
+def server_timing(resumen):
+    partes = [f"total;dur={resumen['total_ms']}"]
+    if resumen["backend"]:
+        partes.append(f'backend;dur={resumen["backend_ms"]};desc="{len(resumen["backend"])} llamadas"')
+    for clave, valor in resumen.items():
+        if clave.endswith("_ms") and clave not in ("total_ms", "backend_ms"):
+            partes.append(f"{clave[:-3]};dur={valor}")
+    return ", ".join(partes)
+
+
+def _antes_de_plantilla(sender, template, context, **extra):
+    g._plantilla_inicio = time.perf_counter()
+
+
+def _plantilla_renderizada(sender, template, context, **extra):
+    inicio = g.pop("_plantilla_inicio", None)
+    if inicio is not None:
+        _render("plantilla", (time.perf_counter() - inicio) * 1000)
+
+
+def instrumentar(app, activo=INSTRUMENTACION):
+    """Mide cada petición para /metrics y, si está activo, añade Server-Timing y una línea JSON por petición"""
+
+    @app.before_request
+    def _iniciar_medicion():
+        _actual.set(Medicion())
+
+    @app.after_request
+    def _cerrar_medicion(response):
+        medicion = _actual.get()
+        if medicion is None:
+            return response
+        endpoint = request.endpoint or "sin_endpoint"
+        metricas.contar(
+            "frontend_peticiones_total",
+            (("endpoint", endpoint), ("metodo", request.method), ("estado", str(response.status_code))),
+        )
+        metricas.observar(
+            "frontend_peticion_segundos", (("endpoint", endpoint),), time.perf_counter() - medicion.inicio
+        )
+        if not activo:
+            return response
+        resumen = medicion.resumen()
+        response.headers["Server-Timing"] = server_timing(resumen)
+        linea = {
+            "metodo": request.method,
+            "ruta": request.path,
+            "endpoint": request.endpoint,
+            "estado": response.status_code,
+            **resumen,
+        }
+        # Las peticiones con error se escriben siempre; el resto según LOG_MUESTREO
+        if response.status_code >= 500:
+            log.warning("peticion", **linea)
+        else:
+            log.frecuente("peticion", **linea)
+        return response
+
+    @app.teardown_request
+    def _limpiar_medicion(error=None):
+        _actual.set(None)
+
+    before_render_template.connect(_antes_de_plantilla, app)
+    template_rendered.connect(_plantilla_renderizada, app)
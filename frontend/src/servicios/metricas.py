@@ -0,0 +1,198 @@
+import re
+import threading
+from bisect import bisect_left
+
+from flask import Response
+
+from .registro import obtener_registro
+
+log = obtener_registro("metricas")
+
+
+# Límites (segundos) de los histogramas de latencia
+LIMITES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NUMERO = re.compile(r"/\d+(?=/|$)")
+_BUSQUEDA = re.compile(r"(/buscar/[^/]+)/[^/]+")
+
+
+def normalizar_ruta(ruta):
+    """Ruta del backend sin ids ni valores de búsqueda, para no crear una serie por registro"""
+    return _NUMERO.sub("/:id", _BUSQUEDA.sub(r"\1/:valor", ruta))
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def medidor_caches(caches):
+    """Medidor de aciertos y fallos; caches es {nombre: función estadisticas() con "aciertos" y "fallos"}"""
+
+    def leer():
+        for nombre, estadisticas in caches.items():
+            datos = estadisticas()
+            etiquetas = (("cache", nombre),)
+            total = datos["aciertos"] + datos["fallos"]
+            yield "frontend_cache_aciertos_total", etiquetas, datos["aciertos"]
+            yield "frontend_cache_fallos_total", etiquetas, datos["fallos"]
+            yield "frontend_cache_ratio_aciertos", etiquetas, round(datos["aciertos"] / total, 4) if total else 0
+
+    return leer
+
+
+def vista_metricas():
+    return Response(metricas.exponer(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class _Fragmento:
+    __slots__ = ("hilo", "contadores", "histogramas")
+
+    def __init__(self, hilo):
+        self.hilo = hilo
+        self.contadores = {}
+        self.histogramas = {}
+
+
+class Metricas:
+    """Contadores e histogramas en formato de texto de Prometheus.
+
+    Cada hilo escribe en su propio fragmento sin locks; /metrics suma los
+    fragmentos al leerlos. Los fragmentos de hilos terminados se acumulan en
+    uno base para que el servidor de desarrollo, que usa un hilo por
+    petición, no los haga crecer sin límite. Los valores que ya existen en
+    otros servicios (aciertos de cachés) se leen con medidores al exponer.
+    """
+
+    def __init__(self, limites=LIMITES):
+        self.limites = limites
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._fragmentos = []
+        self._base = _Fragmento(None)
+        self._tipos = {}
+        self._ayudas = {}
+        self._medidores = []
+
+    def _fragmento(self):
+        fragmento = getattr(self._local, "fragmento", None)
+        if fragmento is None:
+            fragmento = _Fragmento(threading.current_thread())
+            with self._lock:
+                self._fragmentos.append(fragmento)
+            self._local.fragmento = fragmento
+        return fragmento
+
+    def describir(self, nombre, tipo, ayuda):
+        self._tipos[nombre] = tipo
+        self._ayudas[nombre] = ayuda
+
+    def contar(self, nombre, etiquetas=(), valor=1):
+        """Suma al contador; etiquetas es una tupla de pares (nombre, valor) en orden fijo"""
+        contadores = self._fragmento().contadores
+        clave = (nombre, etiquetas)
+        contadores[clave] = contadores.get(clave, 0) + valor
+
+    def observar(self, nombre, etiquetas, segundos):
+        histogramas = self._fragmento().histogramas
+        clave = (nombre, etiquetas)
+        datos = histogramas.get(clave)
+        if datos is None:
+            # Un contador por límite más el de +Inf, luego suma y total
+            datos = histogramas[clave] = [0] * (len(self.limites) + 1) + [0.0, 0]
+        datos[bisect_left(self.limites, segundos)] += 1
+        datos[-2] += segundos
+        datos[-1] += 1
+
+    def medidor(self, funcion):
+        """funcion() devuelve [(nombre, etiquetas, valor)] con valores leídos al exponer"""
+        self._medidores.append(funcion)
+
+    @staticmethod
+    def _sumar(destino, fragmento):
+        for clave, valor in list(fragmento.contadores.items()):
+            destino.contadores[clave] = destino.contadores.get(clave, 0) + valor
+        for clave, datos in list(fragmento.histogramas.items()):
+            acumulado = destino.histogramas.get(clave)
+            if acumulado is None:
+                destino.histogramas[clave] = list(datos)
+            else:
+                for i, valor in enumerate(list(datos)):
+                    acumulado[i] += valor
+
+    def _agregar(self):
+        total = _Fragmento(None)
+        with self._lock:
+            vivos = []
+            for fragmento in self._fragmentos:
+                if fragmento.hilo.is_alive():
+                    vivos.append(fragmento)
+                else:
+                    self._sumar(self._base, fragmento)
+            self._fragmentos = vivos
+            self._sumar(total, self._base)
+            for fragmento in vivos:
+                self._sumar(total, fragmento)
+        return total
+
+    @staticmethod
+    def _etiquetas(etiquetas, extra=()):
+        pares = tuple(etiquetas) + tuple(extra)
+        if not pares:
+            return ""
+        return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+    def _cabecera(self, lineas, nombre, tipo):
+        if nombre in self._ayudas:
+            lineas.append(f"# HELP {nombre} {self._ayudas[nombre]}")
+        lineas.append(f"# TYPE {nombre} {self._tipos.get(nombre, tipo)}")
+
+    def exponer(self):
+        """Texto de exposición de Prometheus (versión 0.0.4)"""
+        total = self._agregar()
+        lineas = []
+        por_nombre = {}
+        for (nombre, etiquetas), valor in total.contadores.items():
+            por_nombre.setdefault(nombre, []).append((etiquetas, valor))
+        for nombre in sorted(por_nombre):
+            self._cabecera(lineas, nombre, "counter")
+            for etiquetas, valor in sorted(por_nombre[nombre]):
+                lineas.append(f"{nombre}{self._etiquetas(etiquetas)} {valor}")
+        por_nombre = {}
+        for (nombre, etiquetas), datos in total.histogramas.items():
+            por_nombre.setdefault(nombre, []).append((etiquetas, datos))
+        for nombre in sorted(por_nombre):
+            self._cabecera(lineas, nombre, "histogram")
+            for etiquetas, datos in sorted(por_nombre[nombre]):
+                acumulado = 0
+                for limite, cantidad in zip(self.limites + ("+Inf",), datos):
+                    acumulado += cantidad
+                    lineas.append(f"{nombre}_bucket{self._etiquetas(etiquetas, (('le', limite),))} {acumulado}")
+                lineas.append(f"{nombre}_sum{self._etiquetas(etiquetas)} {round(datos[-2], 6)}")
+                lineas.append(f"{nombre}_count{self._etiquetas(etiquetas)} {datos[-1]}")
+        por_nombre = {}
+        for funcion in self._medidores:
+            try:
+                for nombre, etiquetas, valor in funcion():
+                    por_nombre.setdefault(nombre, []).append((etiquetas, valor))
+            except Exception as e:
+                log.warning("medidor_fallido", medidor=getattr(funcion, "__name__", str(funcion)), error=str(e))
+        for nombre in sorted(por_nombre):
+            self._cabecera(lineas, nombre, "gauge")
+            for etiquetas, valor in por_nombre[nombre]:
+                lineas.append(f"{nombre}{self._etiquetas(etiquetas)} {valor}")
+        return "\n".join(lineas) + "\n"
+
+
+metricas = Metricas()
+
+metricas.describir("frontend_peticiones_total", "counter", "Peticiones atendidas por endpoint, método y estado")
+metricas.describir("frontend_peticion_segundos", "histogram", "Duración de las peticiones por endpoint")
+metricas.describir("frontend_backend_segundos", "histogram", "Duración de las llamadas al backend por método y ruta")
+metricas.describir("frontend_backend_respuestas_total", "counter", "Llamadas al backend por método, ruta y estado")
+metricas.describir("frontend_render_segundos", "histogram", "Duración del render de plantillas y PDFs")
+metricas.describir("frontend_externo_segundos", "histogram", "Duración de las llamadas a servicios externos")
+metricas.describir("frontend_externo_respuestas_total", "counter",
+                   "Respuestas de servicios externos por estado (429 = límite de cuota)")
+metricas.describir("frontend_cache_aciertos_total", "counter", "Aciertos acumulados por caché")
+metricas.describir("frontend_cache_fallos_total", "counter", "Fallos acumulados por caché")
+metricas.describir("frontend_cache_ratio_aciertos", "gauge", "Aciertos / (aciertos + fallos) por caché")
@@ -0,0 +1,59 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import FANOUT_MAX_PARALELO
+from .cliente_http import cliente_backend
+from .registro import obtener_registro
+
+log = obtener_registro("fanout")
+
+
+_executor = None
+_pid = None
+_lock = threading.Lock()
+
+
+def _obtener_executor():
+    # Igual que el pool HTTP: los hilos no sobreviven a un fork de gunicorn
+    global _executor, _pid
+    pid = os.getpid()
+    if _executor is None or _pid != pid:
+        with _lock:
+            if _executor is None or _pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_PARALELO, thread_name_prefix="fanout")
+                _pid = pid
+    return _executor
+
+
+def _get_medido(cliente, path, kwargs):
+    inicio = time.perf_counter()
+    try:
+        response = cliente.get(path, **kwargs)
+    except Exception as e:
+        log.warning("fanout_error", ruta=path, error=type(e).__name__, ms=round((time.perf_counter() - inicio) * 1000, 1))
+        raise
+    log.frecuente("fanout_get", ruta=path, estado=response.status_code, ms=round((time.perf_counter() - inicio) * 1000, 1))
+    return response
+
+
+def obtener_en_paralelo(*paths, cliente=cliente_backend, **kwargs):
+    """GET concurrentes al backend; devuelve las respuestas en el mismo orden que los paths.
+
+    La vista tarda lo que la llamada más lenta en lugar de la suma. Si alguna
+    llamada lanza una excepción, se propaga igual que con una llamada directa.
+    Los kwargs (headers, timeout...) se aplican a todas las llamadas.
+    """
+    if len(paths) < 2:
+        return [_get_medido(cliente, path, kwargs) for path in paths]
+    inicio = time.perf_counter()
+    # Cada hilo hereda el contexto de la petición para que sus llamadas cuenten en su medición
+    futuros = [
+        _obtener_executor().submit(contextvars.copy_context().run, _get_medido, cliente, path, kwargs)
+        for path in paths
+    ]
+    respuestas = [futuro.result() for futuro in futuros]
+    log.frecuente("fanout", llamadas=len(paths), ms=round((time.perf_counter() - inicio) * 1000, 1))
+    return respuestas
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import qrcode
+
+from ..config import PDF_CACHE_MAX_MB
+from .instrumentacion import medir
+from .plantillas_pdf import Campo, PlantillaPdf
+
+
+# Únicos datos de la persona que se imprimen; el resto (saldo, cuenta, métodos de
+# pago) cambia con cada compra o recarga y no debe invalidar los PDFs ya generados
+_CAMPOS_PERSONA = ("nombre", "apellido", "numero_identificacion", "telefono")
+
+
+def dibujar_qr(pdf, datos, x, y, lado):
+    """Dibuja el código QR como rectángulos vectoriales, sin generar una imagen"""
+    qr = qrcode.QRCode(version=1)
+    qr.add_data(datos)
+    qr.make(fit=True)
+    matriz = qr.get_matrix()
+    modulo = lado / len(matriz)
+    pdf.set_fill_color(0, 0, 0)
+    for fila, valores in enumerate(matriz):
+        columna = 0
+        while columna < len(valores):
+            if not valores[columna]:
+                columna += 1
+                continue
+            # Un solo rectángulo por cada tramo horizontal de módulos oscuros
+            inicio = columna
+            while columna < len(valores) and valores[columna]:
+                columna += 1
+            pdf.rect(x + inicio * modulo, y + fila * modulo, (columna - inicio) * modulo, modulo, "F")
+
+
+def _salida(pdf):
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def _datos(boleto):
+    turno = boleto.get("turno", {})
+    horario = turno.get("horario", {})
+    ruta = horario.get("ruta", {})
+    bus = ruta.get("bus", {})
+    return turno, horario, ruta, bus, bus.get("cooperativa", {}), boleto.get("persona", {})
+
+
+_VERDE = (122, 183, 48)
+_BLANCO = (255, 255, 255)
+
+
+def _estatico_boleto(pdf):
+    pdf.set_fill_color(*_VERDE)
+    pdf.rect(0, 0, 148, 20, "F")
+    pdf.set_font("Arial", "B", 16)
+    pdf.set_text_color(*_BLANCO)
+    pdf.cell(130, 12, "BOLETO", 0, 1, "C")
+    pdf.set_draw_color(*_VERDE)
+    pdf.rect(5, 25, 138, 155)
+    pdf.line(5, 38, 143, 38)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font("Arial", "B", 9)
+    pdf.set_xy(10, 40)
+    pdf.cell(60, 5, "DETALLES DEL VIAJE", 0, 1)
+    pdf.set_xy(75, 40)
+    pdf.cell(65, 5, "INFORMACIÓN DEL BUS", 0, 1)
+    pdf.set_xy(10, 85)
+    pdf.cell(128, 5, "DATOS DEL PASAJERO", 0, 1)
+
+
+def _valores_boleto(boleto):
+    turno, horario, ruta, bus, cooperativa, persona = _datos(boleto)
+    return (
+        f'Boleto N° {boleto.get("id_boleto", "N/A")}',
+        f'Fecha de compra: {boleto.get("fecha_compra")}',
+        f'Fecha de viaje: {turno.get("fecha_salida")}',
+        f'Hora de salida: {horario.get("hora_salida")}',
+        f'Origen: {ruta.get("origen")}',
+        f'Destino: {ruta.get("destino")}',
+        f'Estado: {boleto.get("estado_boleto")}',
+        f'Cooperativa: {cooperativa.get("nombre_cooperativa")}',
+        f'N° de Bus: {bus.get("numero_bus")}',
+        f'Placa: {bus.get("placa")}',
+        f'N° de Asiento: {boleto.get("numero_asiento")}',
+        f'Precio: $ {boleto.get("precio_final", "0.00")}',
+        f'Modelo: {bus.get("modelo")}',
+        f'Nombre: {persona.get("nombre", "")} {persona.get("apellido", "")}\nIdentificación: {persona.get("numero_identificacion", "")}\nTeléfono: {persona.get("telefono", "")}',
+        f"Este documento es válido únicamente para la fecha y hora indicadas.\nCooperativa de Transportes {cooperativa.get('nombre_cooperativa')}\nDirección: {cooperativa.get('direccion')}\nTeléfono: {cooperativa.get('telefono')}",
+    )
+
+
+def _qr_boleto(pdf, boleto):
+    _, _, ruta, _, _, persona = _datos(boleto)
+    qr_data = f'Boleto #{boleto.get("id_boleto")}\nPasajero: {persona.get("nombre")} {persona.get("apellido")}\nRuta: {ruta.get("origen")} - {ruta.get("destino")}'
+    dibujar_qr(pdf, qr_data, x=55, y=110, lado=35)
+
+
+PLANTILLA_BOLETO = PlantillaPdf(
+    ("P", "mm", "A5"),
+    (("Arial", "B"), ("Arial", ""), ("Arial", "I")),
+    _estatico_boleto,
+    [Campo(10, 27, 120, 8, ("Arial", "B", 11), "C")]
+    + [Campo(12, 46 + 6 * i, 65, 5, ("Arial", "", 8)) for i in range(6)]
+    + [Campo(77, 46 + 6 * i, 65, 5, ("Arial", "", 8)) for i in range(6)]
+    + [
+        Campo(12, 91, 130, 5, ("Arial", "", 8), "J", True),
+        Campo(10, 155, 130, 3, ("Arial", "I", 7), "C", True),
+    ],
+    _valores_boleto,
+    _qr_boleto,
+)
+
+
+def _estatico_ticket(pdf):
+    pdf.set_fill_color(*_VERDE)
+    pdf.rect(0, 0, 80, 15, "F")
+    pdf.set_draw_color(*_VERDE)
+    for y in (24, 49, 66):
+        pdf.line(5, y, 75, y)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font("Arial", "B", 9)
+    for y, titulo in ((26, "DETALLES DEL VIAJE:"), (51, "PASAJERO:"), (68, "DETALLES DEL SERVICIO:")):
+        pdf.set_xy(10, y)
+        pdf.cell(80, 5, titulo, 0, 1, "L")
+
+
+def _valores_ticket(boleto):
+    turno, horario, ruta, bus, cooperativa, persona = _datos(boleto)
+    return (
+        f'{cooperativa.get("nombre_cooperativa", "").upper()}',
+        f'TICKET #{boleto.get("id_boleto", "N/A")}',
+        f'Fecha: {turno.get("fecha_salida")}',
+        f'Hora: {horario.get("hora_salida")}',
+        f'Origen: {ruta.get("origen")}',
+        f'Destino: {ruta.get("destino")}',
+        f'Nombre: {persona.get("nombre")} {persona.get("apellido")}',
+        f'ID: {persona.get("numero_identificacion")}',
+        f'Bus #: {bus.get("numero_bus")}',
+        f'Asiento: {boleto.get("numero_asiento")}',
+        f'Precio: $ {boleto.get("precio_final")}',
+        f'Tel: {cooperativa.get("telefono")}\n'
+        f'{cooperativa.get("direccion")}\n'
+        f"¡Gracias por viajar con nosotros!\n"
+        f"Válido solo para la fecha y hora indicadas",
+    )
+
+
+def _qr_ticket(pdf, boleto):
+    turno, _, ruta, _, _, _ = _datos(boleto)
+    qr_data = (
+        f'Ticket #{boleto.get("id_boleto")}\n'
+        f'Ruta: {ruta.get("origen")} - {ruta.get("destino")}\n'
+        f'Fecha: {turno.get("fecha_salida")}'
+    )
+    dibujar_qr(pdf, qr_data, x=25, y=95, lado=30)
+
+
+PLANTILLA_TICKET = PlantillaPdf(
+    ("P", "mm", (80, 160)),
+    (("Arial", "B"), ("Arial", ""), ("Arial", "I")),
+    _estatico_ticket,
+    [
+        Campo(10, 10, 55, 2, ("Arial", "B", 12), "C", color=_BLANCO),
+        Campo(10, 12, 55, 12, ("Arial", "B", 11), "C"),
+    ]
+    + [Campo(10, y, 80, 4, ("Arial", "", 8)) for y in (31, 35, 39, 43, 56, 60, 73, 77, 81)]
+    + [Campo(10, 125, 60, 2, ("Arial", "I", 4), "C", True)],
+    _valores_ticket,
+    _qr_ticket,
+)
+
+
+def _estatico_cliente(pdf):
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, "BOLETO DE VIAJE - AVENTURABUS", ln=True, align="C")
+
+
+def _valores_cliente(boleto):
+    turno = boleto.get("turno", {}) or {}
+    horario = turno.get("horario", {}) or {}
+    frecuencia = horario.get("frecuencia", {}) or {}
+    ruta = frecuencia.get("ruta", {}) or {}
+    bus = turno.get("bus", {}) or {}
+    cooperativa = bus.get("cooperativa", {}) or {}
+    persona = boleto.get("persona", {}) or {}
+    return (
+        f"No. Boleto: {boleto.get('id_boleto', '')}",
+        f"Pasajero: {persona.get('nombre', '')} {persona.get('apellido', '')}",
+        f"Ruta: {ruta.get('origen', '')} - {ruta.get('destino', '')}",
+        f"Fecha Salida: {frecuencia.get('fecha_salida', '')}",
+        f"Hora: {horario.get('hora_salida', '')} - {horario.get('hora_llegada', '')}",
+        f"Asiento: {boleto.get('numero_asiento', '')}",
+        f"Cooperativa: {cooperativa.get('nombre_cooperativa', '')}",
+        f"Bus: {bus.get('placa', '')}",
+        f"Precio: ${boleto.get('precio_unitario', 0):.2f}",
+    )
+
+
+PLANTILLA_CLIENTE = PlantillaPdf(
+    ("P", "mm", "A4"),
+    (("Arial", "B"), ("Arial", "")),
+    _estatico_cliente,
+    [Campo(10, 30 + 8 * i, 0, 8, ("Arial", "", 12)) for i in range(9)],
+    _valores_cliente,
+)
+
+
+PLANTILLAS = {
+    "boleto": PLANTILLA_BOLETO,
+    "ticket": PLANTILLA_TICKET,
+    "cliente": PLANTILLA_CLIENTE,
+}
+
+
+def pdf_lote(formato, boletos, compilado=True):
+    """Un solo documento con una página por boleto; devuelve los bytes del PDF.
+
+    Todas las páginas comparten el formato y las fuentes, que se incrustan una
+    vez. Con compilado=False la parte fija se vuelve a dibujar en cada página
+    (solo para medir lo que aportan las plantillas).
+    """
+    plantilla = PLANTILLAS[formato]
+    pdf = plantilla.documento()
+    for boleto in boletos:
+        pdf.add_page()
+        plantilla.dibujar(pdf, boleto, compilado)
+    return _salida(pdf)
+
+
+def pdf_boleto(boleto):
+    """Boleto A5 con QR; devuelve los bytes del PDF"""
+    return pdf_lote("boleto", [boleto])
+
+
+def pdf_ticket(boleto):
+    """Ticket térmico de 80 mm con QR; devuelve los bytes del PDF"""
+    return pdf_lote("ticket", [boleto])
+
+
+def pdf_boleto_cliente(boleto):
+    """Boleto A4 del panel del cliente; devuelve los bytes del PDF"""
+    return pdf_lote("cliente", [boleto])
+
+
+FORMATOS = {
+    "boleto": pdf_boleto,
+    "ticket": pdf_ticket,
+    "cliente": pdf_boleto_cliente,
+}
+
+
+def huella(formato, boleto):
+    """Hash de los datos que determinan el PDF; sirve como clave de caché y ETag"""
+    persona = {k: v for k, v in (boleto.get("persona") or {}).items() if k in _CAMPOS_PERSONA}
+    datos = json.dumps([formato, {**boleto, "persona": persona}], sort_keys=True, default=str)
+    return hashlib.blake2b(datos.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def huella_lote(formato, boletos):
+    """Huella de un documento con varios boletos, en el orden en que se imprimen"""
+    datos = "|".join(huella(formato, boleto) for boleto in boletos)
+    return hashlib.blake2b(f"lote|{datos}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CachePdf:
+    """LRU en memoria de PDFs generados, limitado por tamaño total en bytes."""
+
+    def __init__(self, max_bytes=int(PDF_CACHE_MAX_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+
+    def obtener(self, clave):
+        with self._lock:
+            contenido = self._entradas.get(clave)
+            if contenido is None:
+                self._fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self._aciertos += 1
+            return contenido
+
+    def guardar(self, clave, contenido):
+        if len(contenido) > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._entradas[clave] = contenido
+            self._bytes += len(contenido)
+            while self._bytes > self.max_bytes:
+                _, expulsado = self._entradas.popitem(last=False)
+                self._bytes -= len(expulsado)
+
+    def estadisticas(self):
+        with self._lock:
+            total = self._aciertos + self._fallos
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "ratio_aciertos": round(self._aciertos / total, 3) if total else 0,
+            }
+
+
+cache_pdf = CachePdf()
+
+
+def renderizar(formato, boleto):
+    """Punto de entrada para procesos externos: solo renderiza, sin caché"""
+    return FORMATOS[formato](boleto)
+
+
+def generar_pdf(formato, boleto, clave=None):
+    """Bytes del PDF en el formato pedido, renderizando solo si no está en caché"""
+    clave = clave or huella(formato, boleto)
+    contenido = cache_pdf.obtener(clave)
+    if contenido is None:
+        with medir("pdf"):
+            contenido = renderizar(formato, boleto)
+        cache_pdf.guardar(clave, contenido)
+    return contenido
+
+
+def generar_pdf_lote(formato, boletos, clave=None):
+    """Bytes del PDF con todos los boletos, renderizando solo si no está en caché"""
+    clave = clave or huella_lote(formato, boletos)
+    contenido = cache_pdf.obtener(clave)
+    if contenido is None:
+        with medir("pdf"):
+            contenido = pdf_lote(formato, boletos)
+        cache_pdf.guardar(clave, contenido)
+    return contenido
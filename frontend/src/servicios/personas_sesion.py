@@ -0,0 +1,79 @@
+import threading
+import time
+
+from ..config import SESION_PERSONA_TTL
+from .cache_catalogo import cache_catalogo
+from .indices import indice_personas
+
+
+# A partir de este tamaño cada inserción limpia las entradas vencidas
+_MAX_ENTRADAS = 1000
+
+
+class PersonasSesion:
+    """Persona de cada usuario con sesión, guardada unos segundos por id.
+
+    Las páginas de administración y /api/session solo necesitan nombre,
+    correo y tarifa del usuario, y antes los pedían al backend en cada vista.
+    La entrada se llena al iniciar sesión y deja de valer al vencer el TTL o
+    cuando cambia la generación "persona" de este worker. Las vistas que
+    editan una persona la invalidan explícitamente.
+    """
+
+    def __init__(self, ttl=SESION_PERSONA_TTL, cache=cache_catalogo, indice=indice_personas):
+        self.ttl = ttl
+        self.cache = cache
+        self.indice = indice
+        self._lock = threading.Lock()
+        self._personas = {}
+        self._aciertos = 0
+        self._fallos = 0
+
+    def guardar(self, persona, generacion=None):
+        """Guarda la persona (p. ej. la obtenida al iniciar sesión) hasta que venza el TTL"""
+        if not persona or persona.get("id_persona") is None:
+            return
+        if generacion is None:
+            generacion = self.cache.generacion("persona")
+        entrada = (persona, time.monotonic() + self.ttl, generacion)
+        with self._lock:
+            if len(self._personas) >= _MAX_ENTRADAS:
+                ahora = time.monotonic()
+                for vencida in [i for i, e in self._personas.items() if e[1] <= ahora]:
+                    del self._personas[vencida]
+            self._personas[str(persona["id_persona"])] = entrada
+
+    def obtener(self, usuario_id):
+        """Persona del usuario, pedida a /api/persona/lista/<id> si no está guardada; None si falla"""
+        if usuario_id is None:
+            return None
+        generacion = self.cache.generacion("persona")
+        with self._lock:
+            entrada = self._personas.get(str(usuario_id))
+            if entrada is not None and entrada[1] > time.monotonic() and entrada[2] == generacion:
+                self._aciertos += 1
+                return entrada[0]
+            self._fallos += 1
+        persona = self.indice.obtener(usuario_id)
+        if persona is not None:
+            # Con la generación de antes de la consulta, una escritura concurrente la invalida
+            self.guardar(persona, generacion)
+        return persona
+
+    def invalidar(self, usuario_id):
+        with self._lock:
+            self._personas.pop(str(usuario_id), None)
+
+    def estadisticas(self):
+        with self._lock:
+            total = self._aciertos + self._fallos
+            return {
+                "ttl": self.ttl,
+                "personas": len(self._personas),
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "ratio_aciertos": round(self._aciertos / total, 3) if total else 0,
+            }
+
+
+personas_sesion = PersonasSesion()
@@ -0,0 +1,67 @@
+import threading
+from collections import namedtuple
+
+from fpdf import FPDF
+
+
+# Posición y estilo de un texto variable; con multi=True se dibuja con multi_cell
+Campo = namedtuple("Campo", "x y w h fuente align multi color", defaults=("L", False, (0, 0, 0)))
+
+
+class PlantillaPdf:
+    """Diseño de página con la parte fija compilada una sola vez.
+
+    La primera vez se dibuja la parte estática (franjas, bordes, títulos) en
+    un documento de prueba y se guardan las operaciones PDF resultantes. En
+    cada página solo se copian esas operaciones y se escriben los campos
+    variables en posiciones ya calculadas. Las fuentes se registran siempre en
+    el mismo orden para que las referencias /F<n> compiladas sigan siendo válidas.
+    dinamico(pdf, boleto) dibuja lo que no es texto, como el QR.
+    """
+
+    def __init__(self, formato_pagina, fuentes, estatico, campos, valores, dinamico=None):
+        self.formato_pagina = formato_pagina
+        self.fuentes = fuentes
+        self.estatico = estatico
+        self.campos = campos
+        self.valores = valores
+        self.dinamico = dinamico
+        self._operaciones = None
+        self._lock = threading.Lock()
+
+    def documento(self):
+        """FPDF vacío con el formato de página y las fuentes ya registradas"""
+        pdf = FPDF(*self.formato_pagina)
+        for familia, estilo in self.fuentes:
+            pdf.set_font(familia, estilo)
+        return pdf
+
+    def _compilar(self):
+        with self._lock:
+            if self._operaciones is None:
+                pdf = self.documento()
+                pdf.add_page()
+                inicio = len(pdf.pages[1])
+                self.estatico(pdf)
+                if len(pdf.fonts) != len(self.fuentes):
+                    raise ValueError("La parte estática usa fuentes que no están en la plantilla")
+                self._operaciones = pdf.pages[1][inicio:]
+        return self._operaciones
+
+    def dibujar(self, pdf, boleto, compilado=True):
+        """Dibuja el boleto en la página actual de un documento creado con documento()"""
+        if compilado:
+            # q/Q aísla colores y fuente de la parte fija del estado que lleva FPDF
+            pdf._out(f"q\n{self._compilar()}Q")
+        else:
+            self.estatico(pdf)
+        for campo, texto in zip(self.campos, self.valores(boleto)):
+            pdf.set_font(*campo.fuente)
+            pdf.set_text_color(*campo.color)
+            pdf.set_xy(campo.x, campo.y)
+            if campo.multi:
+                pdf.multi_cell(campo.w, campo.h, texto, 0, campo.align)
+            else:
+                pdf.cell(campo.w, campo.h, texto, 0, 0, campo.align)
+        if self.dinamico:
+            self.dinamico(pdf, boleto)
@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+import time
+
+from flask import after_this_request
+
+from ..config import CATALOGO_REFRESCO_INTERVALO
+from .cache_catalogo import cache_catalogo
+from .cliente_http import cliente_backend
+from .registro import obtener_registro
+
+log = obtener_registro("refresco_catalogo")
+
+
+# Listas que se mantienen calientes en memoria
+LISTAS = {
+    "turno": "/api/turno/lista",
+    "ruta": "/api/ruta/lista",
+    "horario": "/api/horario/lista",
+    "cooperativa": "/api/cooperativa/lista",
+    "descuento": "/api/descuento/lista",
+}
+
+
+class _Instantanea:
+    __slots__ = ("contenido", "obtenida", "generacion", "_datos")
+
+    def __init__(self, contenido, generacion):
+        self.contenido = contenido
+        self.obtenida = time.monotonic()
+        self.generacion = generacion
+        self._datos = None
+
+    def datos(self):
+        # Se decodifica una sola vez por instantánea
+        if self._datos is None:
+            self._datos = json.loads(self.contenido)
+        return self._datos
+
+
+class RefrescoCatalogo:
+    """Última copia buena de las listas de catálogo, refrescada en segundo plano.
+
+    Un hilo por worker vuelve a pedir cada lista cuando pasa el intervalo o
+    cuando una escritura cambia la generación de su colección. Las vistas leen
+    siempre la instantánea en memoria: si hay un refresco en curso o el
+    backend está lento o caído, reciben la copia anterior y su edad en lugar
+    de esperar. Solo la primera lectura de cada lista espera al backend.
+    """
+
+    def __init__(self, cliente=cliente_backend, cache=cache_catalogo, intervalo=CATALOGO_REFRESCO_INTERVALO,
+                 listas=LISTAS):
+        self.cliente = cliente
+        self.cache = cache
+        self.intervalo = intervalo
+        self.listas = listas
+        self._instantaneas = {}
+        self._errores = {}
+        self._lock = threading.Lock()
+        self._despertar = threading.Event()
+        self._hilo = None
+        self._pid = None
+
+    def _iniciar(self):
+        # Los hilos no sobreviven a un fork de gunicorn: uno por proceso, y uno
+        # nuevo si el anterior terminó por un error
+        pid = os.getpid()
+        if self._hilo is None or self._pid != pid or not self._hilo.is_alive():
+            with self._lock:
+                if self._hilo is None or self._pid != pid or not self._hilo.is_alive():
+                    self._hilo = threading.Thread(target=self._ciclo, name="refresco-catalogo", daemon=True)
+                    self._pid = pid
+                    self._hilo.start()
+
+    def _vencida(self, coleccion, instantanea):
+        if time.monotonic() - instantanea.obtenida >= self.intervalo:
+            return True
+        try:
+            return instantanea.generacion != self.cache.generacion(coleccion)
+        except Exception:
+            # Sin acceso a las generaciones (p. ej. Redis caído) vale solo el intervalo;
+            # el refresco registra el error cuando llegue
+            return False
+
+    def _ciclo(self):
+        while True:
+            self._despertar.wait(timeout=1)
+            self._despertar.clear()
+            for coleccion in self.listas:
+                # Un error inesperado (p. ej. Redis caído) no debe terminar el hilo
+                try:
+                    instantanea = self._instantaneas.get(coleccion)
+                    if instantanea is not None and self._vencida(coleccion, instantanea):
+                        self._refrescar(coleccion)
+                except Exception as e:
+                    log.exception("ciclo_refresco", coleccion=coleccion, error=str(e))
+
+    def _refrescar(self, coleccion):
+        try:
+            generacion = self.cache.generacion(coleccion)
+            r = self.cliente.recargar(self.listas[coleccion])
+            r.raise_for_status()
+        except Exception as e:
+            with self._lock:
+                self._errores[coleccion] = self._errores.get(coleccion, 0) + 1
+            log.warning("refresco_fallido", coleccion=coleccion, error=str(e))
+            return None
+        instantanea = _Instantanea(r.content, generacion)
+        self._instantaneas[coleccion] = instantanea
+        return instantanea
+
+    def leer(self, coleccion):
+        """(datos decodificados, edad en segundos) de la lista; los datos son compartidos, no modificarlos.
+
+        Lanza RuntimeError si la lista nunca se pudo cargar.
+        """
+        self._iniciar()
+        instantanea = self._instantaneas.get(coleccion)
+        if instantanea is None:
+            instantanea = self._refrescar(coleccion)
+            if instantanea is None:
+                raise RuntimeError(f"No se pudo obtener la lista de {coleccion}")
+        elif self._vencida(coleccion, instantanea):
+            self._despertar.set()
+        return instantanea.datos(), time.monotonic() - instantanea.obtenida
+
+    def estadisticas(self):
+        ahora = time.monotonic()
+        with self._lock:
+            errores = dict(self._errores)
+        return {
+            "intervalo": self.intervalo,
+            "listas": {
+                coleccion: {
+                    "edad": round(ahora - instantanea.obtenida, 1),
+                    "generacion": instantanea.generacion,
+                    "errores": errores.get(coleccion, 0),
+                }
+                for coleccion, instantanea in list(self._instantaneas.items())
+            },
+        }
+
+
+refresco_catalogo = RefrescoCatalogo()
+
+
+def agregar_edad(edad):
+    """Añade la cabecera Age (segundos desde que se obtuvo el dato) a la respuesta actual"""
+
+    @after_this_request
+    def _edad(response):
+        response.headers["Age"] = str(int(edad))
+        return response
@@ -0,0 +1,210 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import reprlib
+import sys
+import threading
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+
+from ..config import LOG_COLA_MAX, LOG_MAX_CARACTERES, LOG_MUESTREO, LOG_NIVEL
+
+
+# Elementos y niveles que se conservan de dicts y listas; el costo no depende de su tamaño
+_MAX_ELEMENTOS = 20
+_MAX_NIVELES = 3
+
+# Claves cuyo valor nunca se escribe, a cualquier profundidad (basta con que las contengan)
+_SENSIBLES = ("contrasenia", "password", "token", "secret", "authorization", "numero_tarjeta", "codigo_seguridad")
+
+# Campos de un cuerpo JSON de error que sí se escriben (ver resumen_respuesta)
+_CAMPOS_MENSAJE = ("mensaje", "msg", "message", "error", "error_description")
+
+_repr = reprlib.Repr()
+_repr.maxstring = _repr.maxother = LOG_MAX_CARACTERES
+
+
+def _sensible(clave):
+    clave = str(clave).lower()
+    return any(parte in clave for parte in _SENSIBLES)
+
+
+def recortar(valor, limite=LOG_MAX_CARACTERES, nivel=0):
+    """Valor listo para el registro: textos a `limite` caracteres, dicts y listas a 20 elementos y 3 niveles.
+
+    Los valores de claves sensibles se reemplazan por "***" y lo que pasa de 3
+    niveles se resume con su tamaño, así nada anidado se escribe sin revisar.
+    Los bytes (cuerpos de respuesta) se escriben solo como su tamaño.
+    """
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return valor
+    if isinstance(valor, (bytes, bytearray)):
+        return f"<{len(valor)} bytes>"
+    if isinstance(valor, str):
+        return valor[:limite] + f"…(+{len(valor) - limite})" if len(valor) > limite else valor
+    if isinstance(valor, dict):
+        if nivel >= _MAX_NIVELES:
+            return f"{{…{len(valor)} claves}}"
+        recortado = {
+            str(k): "***" if _sensible(k) else recortar(v, limite, nivel + 1)
+            for k, v in islice(valor.items(), _MAX_ELEMENTOS)
+        }
+        if len(valor) > _MAX_ELEMENTOS:
+            recortado["…"] = f"+{len(valor) - _MAX_ELEMENTOS}"
+        return recortado
+    if isinstance(valor, (list, tuple)):
+        if nivel >= _MAX_NIVELES:
+            return f"[…{len(valor)} elementos]"
+        recortado = [recortar(v, limite, nivel + 1) for v in valor[:_MAX_ELEMENTOS]]
+        if len(valor) > _MAX_ELEMENTOS:
+            recortado.append(f"…(+{len(valor) - _MAX_ELEMENTOS})")
+        return recortado
+    return _repr.repr(valor)
+
+
+def resumen_respuesta(respuesta):
+    """Tamaño y mensaje de error de una respuesta HTTP, para el registro; nunca el cuerpo completo"""
+    resumen = {"bytes": len(respuesta.content)}
+    try:
+        cuerpo = respuesta.json()
+    except ValueError:
+        return resumen
+    if isinstance(cuerpo, dict):
+        for campo in _CAMPOS_MENSAJE:
+            if campo in cuerpo:
+                resumen[campo] = recortar(cuerpo[campo], nivel=1)
+    return resumen
+
+
+class _FormatoJson(logging.Formatter):
+    # Se ejecuta en el hilo del listener, no en el de la petición
+    def format(self, record):
+        linea = {
+            "ts": round(record.created, 3),
+            "nivel": record.levelname.lower(),
+            "origen": record.name.split(".", 1)[-1],
+            "evento": record.msg,
+            **getattr(record, "campos", {}),
+        }
+        if record.exc_text:
+            linea["traza"] = record.exc_text
+        return json.dumps(linea, ensure_ascii=False, default=str)
+
+
+class _ColaAcotada(QueueHandler):
+    # Si la salida no da abasto, se descartan eventos en lugar de bloquear la petición
+    def __init__(self, cola, salida):
+        super().__init__(cola)
+        self.salida = salida
+
+    def prepare(self, record):
+        # El formato JSON se arma en el listener; aquí solo se congela la traza
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.salida.descartados += 1
+
+
+class SalidaAsincrona:
+    """Cola y hilo que escriben los eventos en stdout, uno por proceso.
+
+    Las vistas solo encolan el registro; el JSON se arma y se escribe en el
+    hilo del listener. Como los hilos no sobreviven a un fork de gunicorn, la
+    cola y el listener se crean de nuevo la primera vez que un worker registra.
+    """
+
+    def __init__(self, raiz="frontend", nivel=LOG_NIVEL, cola_max=LOG_COLA_MAX, flujo=None):
+        self.logger = logging.getLogger(raiz)
+        self.logger.setLevel(nivel)
+        self.logger.propagate = False
+        self.cola_max = cola_max
+        self.flujo = flujo
+        self.descartados = 0
+        self._manejador = None
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def asegurar(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            if self._manejador is not None:
+                self.logger.removeHandler(self._manejador)
+            cola = queue.Queue(self.cola_max)
+            escritura = logging.StreamHandler(self.flujo or sys.stdout)
+            escritura.setFormatter(_FormatoJson())
+            self._manejador = _ColaAcotada(cola, self)
+            self.logger.addHandler(self._manejador)
+            self._listener = QueueListener(cola, escritura)
+            self._listener.start()
+            self._pid = pid
+
+    def detener(self):
+        """Escribe lo pendiente (se llama al salir del proceso)"""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._pid = None
+
+
+salida = SalidaAsincrona()
+atexit.register(salida.detener)
+
+
+class Registro:
+    """Eventos estructurados de un módulo: registro.info("evento", campo=valor, ...)
+
+    Los campos se recortan a LOG_MAX_CARACTERES en el momento, con un costo
+    acotado aunque se pase una lista completa. frecuente() es para eventos de
+    alto volumen (una línea por llamada al backend, por ejemplo): solo se
+    escribe una fracción LOG_MUESTREO de ellos.
+    """
+
+    def __init__(self, nombre, salida=salida, muestreo=LOG_MUESTREO):
+        self.salida = salida
+        self.logger = salida.logger.getChild(nombre)
+        self.muestreo = muestreo
+
+    def _emitir(self, nivel, evento, campos, exc_info=False):
+        if not self.logger.isEnabledFor(nivel):
+            return
+        self.salida.asegurar()
+        campos = {clave: recortar(valor) for clave, valor in campos.items()}
+        self.logger.log(nivel, evento, exc_info=exc_info, extra={"campos": campos})
+
+    def debug(self, evento, **campos):
+        self._emitir(logging.DEBUG, evento, campos)
+
+    def info(self, evento, **campos):
+        self._emitir(logging.INFO, evento, campos)
+
+    def warning(self, evento, **campos):
+        self._emitir(logging.WARNING, evento, campos)
+
+    def error(self, evento, **campos):
+        self._emitir(logging.ERROR, evento, campos)
+
+    def exception(self, evento, **campos):
+        """Error con la traza de la excepción que se está manejando"""
+        self._emitir(logging.ERROR, evento, campos, exc_info=True)
+
+    def frecuente(self, evento, **campos):
+        if self.muestreo < 1 and random.random() >= self.muestreo:
+            return
+        self._emitir(logging.INFO, evento, campos)
+
+
+def obtener_registro(nombre):
+    return Registro(nombre)
@@ -0,0 +1,85 @@
+import threading
+import time
+
+
+class _Llamada:
+    __slots__ = ("terminada", "resultado", "error", "fin")
+
+    def __init__(self):
+        self.terminada = threading.Event()
+        self.resultado = None
+        self.error = None
+        self.fin = None
+
+
+class Singleflight:
+    """Agrupa llamadas idénticas concurrentes en una sola ejecución.
+
+    Mientras una llamada con la misma clave está en curso, las demás esperan
+    y reciben su mismo resultado (o su misma excepción). Con una ventana
+    mayor que cero, el resultado también se reutiliza durante esos segundos
+    después de terminar. olvidar() descarta todo, incluidas las llamadas en
+    curso, para que una escritura nunca se tape con una lectura anterior.
+    """
+
+    def __init__(self, ventana=0.0):
+        self.ventana = ventana
+        self._lock = threading.Lock()
+        self._llamadas = {}
+        self._ejecutadas = 0
+        self._compartidas = 0
+
+    def _vigente(self, llamada, ahora):
+        if not llamada.terminada.is_set():
+            return True
+        return llamada.error is None and ahora - llamada.fin <= self.ventana
+
+    def hacer(self, clave, funcion):
+        ahora = time.monotonic()
+        with self._lock:
+            llamada = self._llamadas.get(clave)
+            if llamada is not None and self._vigente(llamada, ahora):
+                self._compartidas += 1
+                lider = False
+            else:
+                if self.ventana > 0:
+                    for otra in [c for c, l in self._llamadas.items() if not self._vigente(l, ahora)]:
+                        del self._llamadas[otra]
+                llamada = _Llamada()
+                self._llamadas[clave] = llamada
+                self._ejecutadas += 1
+                lider = True
+        if not lider:
+            llamada.terminada.wait()
+            if llamada.error is not None:
+                raise llamada.error
+            return llamada.resultado
+        try:
+            llamada.resultado = funcion()
+            return llamada.resultado
+        except BaseException as e:
+            llamada.error = e
+            raise
+        finally:
+            llamada.fin = time.monotonic()
+            llamada.terminada.set()
+            if self.ventana <= 0 or llamada.error is not None:
+                with self._lock:
+                    if self._llamadas.get(clave) is llamada:
+                        del self._llamadas[clave]
+
+    def olvidar(self):
+        """Las próximas llamadas se ejecutan de nuevo aunque haya otras en curso"""
+        with self._lock:
+            self._llamadas.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            total = self._ejecutadas + self._compartidas
+            return {
+                "ventana_ms": round(self.ventana * 1000),
+                "en_curso": sum(1 for l in self._llamadas.values() if not l.terminada.is_set()),
+                "ejecutadas": self._ejecutadas,
+                "compartidas": self._compartidas,
+                "ratio_ahorro": round(self._compartidas / total, 3) if total else 0,
+            }
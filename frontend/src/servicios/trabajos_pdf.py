@@ -0,0 +1,130 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TimeoutFuturo
+from concurrent.futures.process import BrokenProcessPool
+
+from ..config import PDF_TRABAJOS_PROCESOS, PDF_TRABAJOS_TTL
+from .pdf_boleto import cache_pdf, generar_pdf, huella, renderizar
+from .registro import obtener_registro
+
+log = obtener_registro("cola_pdf")
+
+
+class ColaPdf:
+    """Genera en segundo plano los PDFs de los boletos recién comprados.
+
+    El render corre en un pool de procesos para no ocupar el GIL del worker
+    de Flask; la compra responde en cuanto los boletos quedan guardados y el
+    cliente consulta el estado del trabajo. Los trabajos viven en memoria del
+    worker durante PDF_TRABAJOS_TTL segundos y guardan el id de la persona que
+    los creó, para que solo ella pueda consultarlos.
+    """
+
+    def __init__(self, procesos=PDF_TRABAJOS_PROCESOS, ttl=PDF_TRABAJOS_TTL, formato="boleto"):
+        self.procesos = procesos
+        self.ttl = ttl
+        self.formato = formato
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._trabajos = {}
+
+    def _obtener_executor(self):
+        # "spawn" evita heredar hilos y sockets del worker; se recrea tras un fork
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            with self._lock:
+                if self._executor is None or self._pid != pid:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.procesos, mp_context=multiprocessing.get_context("spawn")
+                    )
+                    self._pid = pid
+        return self._executor
+
+    def _purgar(self):
+        limite = time.monotonic() - self.ttl
+        with self._lock:
+            for id_trabajo in [i for i, t in self._trabajos.items() if t["creado"] < limite]:
+                del self._trabajos[id_trabajo]
+
+    def encolar(self, boletos, propietario=None):
+        """Encola el PDF de cada boleto y devuelve el id del trabajo; propietario es el id_persona que compró"""
+        self._purgar()
+        id_trabajo = uuid.uuid4().hex
+        pdfs = {}
+        for boleto in boletos:
+            clave = huella(self.formato, boleto)
+            try:
+                futuro = self._obtener_executor().submit(renderizar, self.formato, boleto)
+                futuro.add_done_callback(lambda f, clave=clave: self._guardar_resultado(clave, f))
+            except Exception as e:
+                # Pool roto o no disponible: se renderiza al descargar
+                log.warning("no_encolado", id_boleto=boleto.get("id_boleto"), error=str(e))
+                futuro = None
+            pdfs[str(boleto.get("id_boleto"))] = {"boleto": boleto, "huella": clave, "futuro": futuro}
+        with self._lock:
+            self._trabajos[id_trabajo] = {
+                "creado": time.monotonic(),
+                "propietario": None if propietario is None else str(propietario),
+                "pdfs": pdfs,
+            }
+        return id_trabajo
+
+    def propietario(self, id_trabajo):
+        """id_persona (texto) que creó el trabajo, o None si no existe o no tiene dueño"""
+        with self._lock:
+            return (self._trabajos.get(id_trabajo) or {}).get("propietario")
+
+    def _guardar_resultado(self, clave, futuro):
+        if futuro.cancelled():
+            return
+        error = futuro.exception()
+        if error is None:
+            cache_pdf.guardar(clave, futuro.result())
+        elif isinstance(error, BrokenProcessPool):
+            # Un proceso murió: el siguiente encolar crea un pool nuevo
+            with self._lock:
+                self._executor = None
+
+    @staticmethod
+    def _estado_pdf(futuro):
+        if futuro is None or (futuro.done() and futuro.exception() is not None):
+            return "error"
+        return "listo" if futuro.done() else "pendiente"
+
+    def estado(self, id_trabajo):
+        """{"estado", "boletos": {id_boleto: estado}} o None si el trabajo no existe"""
+        with self._lock:
+            trabajo = self._trabajos.get(id_trabajo)
+        if trabajo is None:
+            return None
+        boletos = {id_boleto: self._estado_pdf(pdf["futuro"]) for id_boleto, pdf in trabajo["pdfs"].items()}
+        if "pendiente" in boletos.values():
+            estado = "pendiente"
+        elif "error" in boletos.values():
+            estado = "error"
+        else:
+            estado = "listo"
+        return {"estado": estado, "boletos": boletos}
+
+    def contenido(self, id_trabajo, id_boleto, espera=5):
+        """(huella, bytes) del PDF; si el proceso no terminó a tiempo se renderiza aquí"""
+        with self._lock:
+            pdf = self._trabajos.get(id_trabajo, {}).get("pdfs", {}).get(str(id_boleto))
+        if pdf is None:
+            return None
+        futuro = pdf["futuro"]
+        if futuro is not None:
+            try:
+                return pdf["huella"], futuro.result(timeout=espera)
+            except TimeoutFuturo:
+                pass
+            except Exception as e:
+                log.error("render_fallido", id_boleto=id_boleto, error=str(e))
+        return pdf["huella"], generar_pdf(self.formato, pdf["boleto"], pdf["huella"])
+
+
+cola_pdf = ColaPdf()